@@ -8,6 +8,17 @@
 import numpy as np
 from scipy.integrate import odeint
 import matplotlib.pyplot as plt
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             'Código en Python'))
+from integracion_convergente import odeint_convergente
+
+# True: odeint por tramos que se detiene cuando la epidemia se apaga (|f| < tol_equilibrio,
+# integracion_convergente.py) y completa el resto de t con el equilibrio; False: odeint
+parada_temprana = False
+# con |f| < 1e-6 quedan i ~ 1e-5, muy por debajo de lo que se distingue en la gráfica
+tol_equilibrio = 1e-6
 
 # Defining the SImodel function
 def SEDO(v, t, b, g): # v: vector de variables dependientes
@@ -35,7 +46,12 @@ t = np.linspace(0, 150, 1000) # 100 puntos entre 0 y 10
 v0 = [s0, i0]
 
 # Resolviendo el sistema de ecuaciones diferenciales
-sol = odeint(SEDO, v0, t, args=(b, g))
+if parada_temprana:
+    sol, info = odeint_convergente(SEDO, v0, t, args=(b, g), tol_f=tol_equilibrio)
+    if info['tipo'] is not None:
+        print(f"{info['tipo']} en t = {info['t_parada']:.1f} de {t[-1]:g}")
+else:
+    sol = odeint(SEDO, v0, t, args=(b, g))
 
 s = sol[:, 0]
 i = sol[:, 1]
@@ -0,0 +1,254 @@
+import numpy as np
+from scipy.linalg import expm
+from functools import lru_cache
+import time
+
+"""Propagación exacta del sistema lineal conmutado de modCampoVectorial.py.
+
+En modCampoVectorial.py la señal senoidal se construye con un bucle sobre cada paso
+dt = 0.01 y luego A1/A2 se integran con Euler explícito en otro bucle, que se desvía
+con A1 inestable. Aquí los instantes de cambio se calculan una sola vez: en ambos
+estados el cambio ocurre en el primer paso en que sin(t - ti + fase) >= h - tol (en el
+estado 2 la señal es -sin(...) + 2h <= h + tol, que es la misma condición) y después
+de cada cambio la fase vuelve a arcsin(h), así que desde el primer cambio el programa
+de conmutación es periódico. Cada segmento de matriz constante se propaga exactamente
+con expm (guardada en caché por duración) y el estado en cualquier malla de tiempos
+de salida se evalúa de forma vectorizada con potencias de la matriz de un período.
+El costo depende del número de segmentos distintos, no del número de pasos dt.
+
+Convención: el estado nuevo rige desde el instante de cambio (en el bucle de Euler
+original rige desde el paso anterior)."""
+
+
+def _ticks_hasta_cambio(fase, dt, umbral):
+    """Menor k >= 1 con sin(k*dt + fase) >= umbral; None si nunca se cumple."""
+    if umbral > 1:
+        return None
+    if umbral <= -1:
+        return 1
+    alfa = np.arcsin(umbral)
+    # sin(θ) >= umbral en [alfa, π - alfa] + 2πn
+    r = (dt + fase - alfa) % (2*np.pi)
+    if r <= np.pi - 2*alfa:
+        k = 1
+    else:
+        k = 1 + int(np.ceil((2*np.pi - r)/dt))
+    # ajuste por redondeo con la misma expresión del bucle original
+    while k > 1 and np.sin((k - 1)*dt + fase) >= umbral:
+        k -= 1
+    while np.sin(k*dt + fase) < umbral:
+        k += 1
+    return k
+
+
+def programa_conmutacion(dt=0.01, h=1.0, tol=0.01, estado=1, fase=0.0):
+    """Programa de conmutación como (transitorio, ciclo): listas de (estado, pasos dt).
+
+    El ciclo se repite indefinidamente después del transitorio; si un estado nunca
+    cambia, el último segmento del transitorio tiene duración np.inf y el ciclo es []."""
+    segmentos = []
+    visto = {}
+    while (estado, fase) not in visto:
+        visto[(estado, fase)] = len(segmentos)
+        k = _ticks_hasta_cambio(fase, dt, h - tol)
+        if k is None:
+            segmentos.append((estado, np.inf))
+            return segmentos, []
+        segmentos.append((estado, k))
+        estado = 2 if estado == 1 else 1
+        fase = np.arcsin(h)
+    inicio_ciclo = visto[(estado, fase)]
+    return segmentos[:inicio_ciclo], segmentos[inicio_ciclo:]
+
+
+def instantes_conmutacion(T_total, dt=0.01, h=1.0, tol=0.01):
+    """Instantes de cambio en [0, T_total) y el estado que empieza en cada uno (incluye t = 0)."""
+    transitorio, ciclo = programa_conmutacion(dt, h, tol)
+    tiempos, estados = [0.0], [transitorio[0][0] if transitorio else ciclo[0][0]]
+    t = 0.0
+    for estado, k in transitorio:
+        t += k*dt
+        if t >= T_total:
+            return np.array(tiempos), np.array(estados)
+        tiempos.append(t)
+        estados.append(2 if estado == 1 else 1)
+    if not ciclo:
+        return np.array(tiempos), np.array(estados)
+    # el resto es periódico: se arma de una vez con aritmética de arreglos
+    duraciones = np.array([k for _, k in ciclo])*dt
+    periodo = duraciones.sum()
+    n_periodos = int(np.ceil((T_total - t)/periodo))
+    desfases = np.cumsum(duraciones)
+    todos = (t + periodo*np.arange(n_periodos)[:, np.newaxis] + desfases).ravel()
+    siguientes = np.tile([2 if e == 1 else 1 for e, _ in ciclo], n_periodos)
+    dentro = todos < T_total
+    return np.concatenate([tiempos, todos[dentro]]), np.concatenate([estados, siguientes[dentro]])
+
+
+@lru_cache(maxsize=256)
+def _expm_cacheado(A_bytes, n, tau):
+    return expm(np.frombuffer(A_bytes).reshape(n, n)*tau)
+
+
+def propagador(A, tau):
+    """expm(A*tau) con caché por (A, tau)."""
+    A = np.ascontiguousarray(A, dtype=float)
+    return _expm_cacheado(A.tobytes(), A.shape[0], float(tau))
+
+
+def _potencias_escaladas(M, n, v):
+    # M^n[i] @ v como (direcciones, log_escala): cada fila y la base se reescalan por su
+    # máximo en cada paso, así que las potencias altas no se desbordan en el camino
+    n = np.asarray(n, dtype=np.int64).copy()
+    resultado = np.tile(np.asarray(v, dtype=float), (n.size, 1))
+    log_escala = np.zeros(n.size)
+    base = np.asarray(M, dtype=float)
+    log_base = 0.0
+    while np.any(n > 0):
+        impar = (n & 1) == 1
+        filas = resultado[impar] @ base.T
+        maximos = np.abs(filas).max(axis=1)
+        maximos[maximos == 0] = 1
+        resultado[impar] = filas/maximos[:, np.newaxis]
+        log_escala[impar] += log_base + np.log(maximos)
+        base = base @ base
+        maximo = np.abs(base).max()
+        if maximo > 0:
+            base /= maximo
+        log_base = 2*log_base + (np.log(maximo) if maximo > 0 else 0.0)
+        n >>= 1
+    return resultado, log_escala
+
+
+def _evalua_segmentos(matrices, inicios, estados_iniciales, t):
+    # estado en t dentro de segmentos de matriz constante que empiezan en inicios
+    j = np.searchsorted(inicios, t, side='right') - 1
+    salida = np.empty((t.size, estados_iniciales.shape[1]))
+    for s in np.unique(j):
+        en_s = j == s
+        tau = t[en_s] - inicios[s]
+        salida[en_s] = np.einsum('kij,j->ki', expm(matrices[s]*tau[:, np.newaxis, np.newaxis]),
+                                 estados_iniciales[s])
+    return salida
+
+
+def solucion_exacta(A1, A2, v0, t_salida, dt=0.01, h=1.0, tol=0.01, limite=1e150):
+    """Estado del sistema conmutado en los tiempos t_salida (arreglo creciente), sin pasos de integración.
+
+    A1, A2: matrices de los estados 1 y 2; dt, h, tol: los de la regla de conmutación.
+    Devuelve (sol, validas): sol de forma (len(t_salida), n), alineada con t_salida, y el
+    número de filas válidas. Si la norma supera limite (el sistema crece sin cota y se
+    desbordaría) la solución se detiene ahí: las filas desde ese tiempo quedan en nan y
+    validas las excluye, así que sol[:validas] nunca tiene inf ni nan."""
+    A = {1: np.asarray(A1, dtype=float), 2: np.asarray(A2, dtype=float)}
+    t_salida = np.asarray(t_salida, dtype=float)
+    transitorio, ciclo = programa_conmutacion(dt, h, tol)
+    v = np.asarray(v0, dtype=float)
+    sol = np.empty((t_salida.size, v.size))
+
+    # transitorio: pocos segmentos, cada uno con su estado inicial
+    inicio = 0.0
+    inicios, iniciales, matrices = [], [], []
+    for estado, k in transitorio:
+        inicios.append(inicio)
+        iniciales.append(v)
+        matrices.append(A[estado])
+        if np.isinf(k):
+            break
+        v = propagador(A[estado], k*dt) @ v
+        inicio += k*dt
+    t_ciclo = inicio if ciclo else np.inf
+    antes = t_salida < t_ciclo
+    if antes.any():
+        sol[antes] = _evalua_segmentos(matrices, np.array(inicios), np.array(iniciales), t_salida[antes])
+
+    # ciclo: M = producto de los propagadores de un período; después, M^n y el segmento parcial
+    if ciclo and (~antes).any():
+        duraciones = np.array([k for _, k in ciclo])*dt
+        desfases = np.concatenate([[0.0], np.cumsum(duraciones)[:-1]])
+        periodo = duraciones.sum()
+        prefijos = [np.eye(v.size)]
+        for estado, k in ciclo:
+            prefijos.append(propagador(A[estado], k*dt) @ prefijos[-1])
+        M = prefijos[-1]
+        s = t_salida[~antes] - t_ciclo
+        n = np.floor(s/periodo).astype(np.int64)
+        r = s - n*periodo
+        # el redondeo puede dejar r apenas fuera de [0, periodo)
+        n = np.where(r < 0, n - 1, np.where(r >= periodo, n + 1, n))
+        r = s - n*periodo
+        inicio_periodo, log_escala = _potencias_escaladas(M, n, v)
+        j = np.clip(np.searchsorted(desfases, r, side='right') - 1, 0, len(ciclo) - 1)
+        salida = np.empty((s.size, v.size))
+        for seg, (estado, _) in enumerate(ciclo):
+            en_seg = j == seg
+            if not en_seg.any():
+                continue
+            tau = r[en_seg] - desfases[seg]
+            inicio_seg = inicio_periodo[en_seg] @ prefijos[seg].T
+            salida[en_seg] = np.einsum('kij,kj->ki', expm(A[estado]*tau[:, np.newaxis, np.newaxis]), inicio_seg)
+        # la escala se aplica al final y se acota: lo que pasa del límite se descarta abajo
+        with np.errstate(over='ignore', invalid='ignore'):
+            sol[~antes] = salida*np.exp(np.minimum(log_escala, np.log(limite) + 1))[:, np.newaxis]
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        fuera = ~(np.abs(sol).max(axis=1) <= limite)
+    validas = int(np.argmax(fuera)) if fuera.any() else len(sol)
+    sol[validas:] = np.nan
+    return sol, validas
+
+
+if __name__ == "__main__":
+    from scipy.integrate import solve_ivp
+
+    A1 = np.array([[2, -1], [1, 4]])    # Inestable
+    A2 = np.array([[-1, -2], [1, -1]])  # Estable
+    h, tol, dt, T_total = 1.0, 0.01, 0.01, 10
+    v0 = [1, 1]
+
+    transitorio, ciclo = programa_conmutacion(dt, h, tol)
+    print(f"Transitorio: {[(e, k) for e, k in transitorio]}  ciclo: {[(e, k) for e, k in ciclo]} (pasos de dt)")
+    tiempos, estados = instantes_conmutacion(T_total, dt, h, tol)
+    print(f"{len(tiempos) - 1} cambios en [0, {T_total}); primeros: {np.round(tiempos[:5], 4)}")
+
+    # referencia: solve_ivp segmento por segmento con el mismo programa
+    t = np.arange(0, T_total, dt)
+    referencia = np.empty((len(t), 2))
+    fronteras = np.append(tiempos, T_total)
+    segmento = np.searchsorted(tiempos, t, side='right') - 1
+    v = np.array(v0, dtype=float)
+    for k, (t_a, t_b, estado) in enumerate(zip(fronteras[:-1], fronteras[1:], estados)):
+        A = A1 if estado == 1 else A2
+        sol = solve_ivp(lambda _, z: A @ z, [t_a, t_b], v, dense_output=True, rtol=1e-12, atol=1e-12)
+        dentro = segmento == k
+        if dentro.any():
+            referencia[dentro] = sol.sol(t[dentro]).T
+        v = sol.y[:, -1]
+
+    exacta, _ = solucion_exacta(A1, A2, v0, t, dt, h, tol)
+    euler = np.zeros((len(t), 2))
+    euler[0] = v0
+    A_paso = [A1 if e == 1 else A2 for e in estados[segmento]]
+    for i in range(1, len(t)):
+        euler[i] = euler[i-1] + dt*(A_paso[i-1] @ euler[i-1])
+    escala = np.abs(referencia).max()
+    print(f"Error relativo máximo en [0, {T_total}): exacta {np.abs(exacta - referencia).max()/escala:.2e}, "
+          f"Euler {np.abs(euler - referencia).max()/escala:.2e}")
+
+    # horizonte largo: el costo no depende del número de pasos dt
+    T_largo = 1e5
+    t_largo = np.linspace(0, T_largo, 10000)
+    inicio = time.perf_counter()
+    tiempos, _ = instantes_conmutacion(T_largo, dt, h, tol)
+    t_instantes = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    sol, validas = solucion_exacta(A1, A2, v0, t_largo, dt, h, tol)
+    t_exacta = time.perf_counter() - inicio
+    print(f"T_total = {T_largo:.0e}: {len(tiempos) - 1} cambios calculados en {t_instantes:.2f} s; "
+          f"{len(t_largo)} tiempos de salida en {t_exacta*1e3:.1f} ms")
+    # el promedio (A1 + A2)/2 es inestable: la norma crece como e^t y pasa el límite de 1e150
+    # hacia t = 350; desde ahí la solución se detiene en vez de llenarse de inf
+    print(f"  solución detenida en t = {t_largo[validas - 1]:.1f} ({validas} de {len(t_largo)} tiempos), "
+          f"|v| = {np.abs(sol[:validas]).max():.3e}")
+    for tk in [50.0, 200.0, 300.0]:
+        print(f"  |v({tk:g})| = {np.linalg.norm(solucion_exacta(A1, A2, v0, [tk], dt, h, tol)[0][0]):.6e}")
@@ -0,0 +1,304 @@
+import numpy as np
+from scipy.integrate import solve_ivp, quad
+from scipy.optimize import OptimizeResult, brentq
+import time
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             'Código en Python'))
+from solucion_lineal import forma_espectral, funciones_C_S
+
+"""Tiempos de cruce analíticos para el sistema de Filippov lineal de sistemaFilippov.py.
+
+En sistemaFilippov.py cada campo lineal se integra con solve_ivp y max_step=0.01 solo
+para encontrar cuándo y cruza w. Para un campo lineal v' = A v la solución es
+v(t) = expm(A t) v0 y, en 2x2, con s = tr(A)/2 y q² = s² - det(A) (los valores propios
+son s ± q):
+
+    expm(A t) = e^(s t) [ C(t) I + S(t) (A - s I) ]
+    C = cosh(q t), S = sinh(q t)/q     si q² > 0 (valores propios reales)
+    C = cos(ω t),  S = sin(ω t)/ω      si q² = -ω² < 0 (complejos)
+    C = 1,         S = t               si q² = 0 (valor propio doble)
+
+La última forma cubre matrices no diagonalizables como A1 = [[2, -1], [1, 4]]
+(forma_espectral y funciones_C_S de solucion_lineal.py). Como
+y'(t) tiene la misma forma con v0 -> A v0, sus ceros (donde y cambia de monotonía) también
+tienen fórmula cerrada. Entre dos de ellos y(t) es monótona, así que el primer tramo
+donde y - w cambia de signo en la dirección pedida encierra el cruce, y una bisección
+vectorizada lo resuelve hasta la precisión de máquina para muchas condiciones iniciales
+a la vez."""
+
+
+def trayectoria_lineal(A, v0, t):
+    """v(t) = expm(A t) v0 en forma cerrada; t y las componentes de v0 se combinan por broadcasting.
+
+    Devuelve (x(t), y(t))."""
+    A, s, q2 = forma_espectral(A)
+    x0, y0 = np.asarray(v0[0], dtype=float), np.asarray(v0[1], dtype=float)
+    t = np.asarray(t, dtype=float)
+    C, S = funciones_C_S(t, q2)
+    e = np.exp(s*t)
+    gx = (A[0, 0] - s)*x0 + A[0, 1]*y0
+    gy = A[1, 0]*x0 + (A[1, 1] - s)*y0
+    return e*(x0*C + gx*S), e*(y0*C + gy*S)
+
+
+def _bordes_monotonia(A, s, q2, x0, y0, tiempo_max):
+    # tiempos donde y'(t) = 0 en (0, tiempo_max], como columnas de un arreglo (N, k)
+    dx0 = A[0, 0]*x0 + A[0, 1]*y0
+    dy0 = A[1, 0]*x0 + A[1, 1]*y0
+    gp = A[1, 0]*dx0 + (A[1, 1] - s)*dy0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if q2 < 0:
+            # y'(t) ∝ dy0 cos(ω t) + (gp/ω) sin(ω t) = R cos(ω t - φ): ceros cada π/ω
+            om = np.sqrt(-q2)
+            phi = np.arctan2(gp/om, dy0)
+            primero = np.mod(phi + np.pi/2, np.pi)/om
+            n = int(np.ceil(tiempo_max*om/np.pi)) + 1
+            bordes = primero[:, np.newaxis] + np.arange(n)*np.pi/om
+        elif q2 > 0:
+            # y'(t) ∝ dy0 cosh(q t) + (gp/q) sinh(q t): a lo sumo un cero
+            q = np.sqrt(q2)
+            bordes = (np.arctanh(-dy0*q/gp)/q)[:, np.newaxis]
+        else:
+            # y'(t) ∝ dy0 + gp t
+            bordes = (-dy0/gp)[:, np.newaxis]
+    bordes = np.where(np.isfinite(bordes) & (bordes > 0), bordes, tiempo_max)
+    return np.minimum(np.sort(bordes, axis=1), tiempo_max)
+
+
+def primer_cruce(A, x0, y0, w, direccion, tiempo_max, iteraciones=200):
+    """Primer t en (0, tiempo_max] donde y(t) cruza w en la dirección dada (+1 sube, -1 baja).
+
+    x0, y0 son arreglos (una condición inicial por entrada); devuelve los tiempos de
+    cruce (nan si no hay cruce) y los puntos (x, y) del cruce."""
+    A, s, q2 = forma_espectral(A)
+    x0, y0 = np.broadcast_arrays(np.atleast_1d(np.asarray(x0, dtype=float)),
+                                 np.atleast_1d(np.asarray(y0, dtype=float)))
+    n = x0.size
+    bordes = _bordes_monotonia(A, s, q2, x0, y0, tiempo_max)
+    bordes = np.hstack([np.zeros((n, 1)), bordes, np.full((n, 1), tiempo_max)])
+    F = lambda t, idx: trayectoria_lineal(A, (x0[idx], y0[idx]), t)[1] - w
+
+    lo = np.full(n, np.nan)
+    hi = np.full(n, np.nan)
+    pendiente = np.ones(n, dtype=bool)
+    todos = np.arange(n)
+    for k in range(bordes.shape[1] - 1):
+        if not pendiente.any():
+            break
+        a, b = bordes[:, k], bordes[:, k + 1]
+        Fa, Fb = F(a, todos), F(b, todos)
+        if direccion > 0:
+            cruza = (Fa < 0) & (Fb >= 0)
+        else:
+            cruza = (Fa > 0) & (Fb <= 0)
+        nuevo = pendiente & (b > a) & cruza
+        lo[nuevo], hi[nuevo] = a[nuevo], b[nuevo]
+        pendiente &= ~nuevo
+
+    # bisección vectorizada: y - w es monótona en [lo, hi]
+    idx = np.flatnonzero(~np.isnan(lo))
+    a, b = lo[idx], hi[idx]
+    for _ in range(iteraciones):
+        m = 0.5*(a + b)
+        activos = (m > a) & (m < b)
+        if not activos.any():
+            break
+        Fm = F(m, idx)
+        antes = (Fm < 0) if direccion > 0 else (Fm > 0)
+        a = np.where(activos & antes, m, a)
+        b = np.where(activos & ~antes, m, b)
+    t_cruce = np.full(n, np.nan)
+    t_cruce[idx] = b
+    xc, yc = trayectoria_lineal(A, (x0, y0), np.nan_to_num(t_cruce))
+    xc = np.where(np.isnan(t_cruce), np.nan, xc)
+    yc = np.where(np.isnan(t_cruce), np.nan, w)
+    return t_cruce, xc, yc
+
+
+def segmento_lineal(A, v0, w, direccion, tiempo_max, puntos=500):
+    """Un segmento con el formato de solve_ivp (t, y, t_events, y_events) para los scripts.
+
+    La trayectoria se muestrea en forma cerrada en puntos tiempos hasta el cruce."""
+    t_cruce, xc, yc = primer_cruce(A, v0[0], v0[1], w, direccion, tiempo_max)
+    hay = not np.isnan(t_cruce[0])
+    t_fin = t_cruce[0] if hay else tiempo_max
+    t = np.linspace(0, t_fin, puntos)
+    x, y = trayectoria_lineal(A, v0, t)
+    if hay:
+        y[-1] = w
+    return OptimizeResult(t=t, y=np.vstack([x, y]),
+                          t_events=[np.array([t_cruce[0]]) if hay else np.array([])],
+                          y_events=[np.array([[xc[0], yc[0]]]) if hay else np.empty((0, 2))],
+                          status=1 if hay else 0, success=True)
+
+
+def _tiempo_deslizamiento(N, D, x):
+    # t(x1) = ∫_x^x1 D/N por fracciones parciales (logaritmo complejo, que cubre raíces
+    # reales y complejas); con N de grado 1 o raíz doble se integra con quad
+    n0, n1, n2 = np.pad(N.coef, (0, 3 - len(N.coef)))
+    d0, d1 = np.pad(D.coef, (0, 2 - len(D.coef)))
+    if n2 != 0 and n1*n1 - 4*n2*n0 != 0:
+        r1, r2 = np.roots([n2, n1, n0]).astype(complex)
+        c1 = (d0 + d1*r1)/(n2*(r1 - r2))
+        c2 = (d0 + d1*r2)/(n2*(r2 - r1))
+        primitiva = lambda z: (c1*np.log(z - r1) + c2*np.log(z - r2)).real
+        base = primitiva(x)
+        return lambda x1: primitiva(x1) - base
+    return lambda x1: quad(lambda z: (d0 + d1*z)/(n0 + n1*z + n2*z*z), x, x1,
+                           epsabs=1e-13, epsrel=1e-12, limit=200)[0]
+
+
+def _desliza(A1, A2, x, w, tiempo_max):
+    """Deslizamiento de Filippov sobre y = w desde x durante a lo sumo tiempo_max.
+
+    Con campos lineales x' = N(x)/D(x), N = f1_y f2_x - f2_y f1_x (cuadrático) y
+    D = f1_y - f2_y (lineal), así que el tiempo para ir de x a x1 es ∫ D/N dx. El
+    deslizamiento termina en el primer punto tangente (f1_y = 0 o f2_y = 0) en la
+    dirección del movimiento, salvo que antes haya un pseudo-equilibrio (raíz de N).
+    Devuelve (duración, x final, sistema por el que sale o None)."""
+    P = np.polynomial.Polynomial
+    f1x, f1y = P([A1[0, 1]*w, A1[0, 0]]), P([A1[1, 1]*w, A1[1, 0]])
+    f2x, f2y = P([A2[0, 1]*w, A2[0, 0]]), P([A2[1, 1]*w, A2[1, 0]])
+    N = f1y*f2x - f2y*f1x
+    D = f1y - f2y
+    sentido = np.sign(N(x)/D(x))
+    if sentido == 0:
+        return tiempo_max, x, None
+
+    # paradas posibles en la dirección del movimiento
+    paradas = []
+    for raiz, sale in [(f1y.roots(), 1), (f2y.roots(), 2), (N.roots(), None)]:
+        for r in np.atleast_1d(raiz):
+            if abs(r.imag) < 1e-12 and (r.real - x)*sentido > 0:
+                paradas.append((abs(r.real - x), r.real, sale))
+    tiempo = _tiempo_deslizamiento(N, D, x)
+    if not paradas:
+        # sin paradas x se va al infinito: se agranda el intervalo hasta cubrir tiempo_max
+        extremo = x + sentido*max(1.0, abs(x))
+        for _ in range(200):
+            if tiempo(extremo) > tiempo_max:
+                break
+            extremo = x + 2*(extremo - x)
+        else:
+            return tiempo_max, sentido*np.inf, None
+    else:
+        _, x_parada, sale = min(paradas, key=lambda p: p[0])
+        if sale is not None:
+            t_salida = tiempo(x_parada)
+            if t_salida <= tiempo_max:
+                return t_salida, x_parada, sale
+        # se queda deslizando (hacia un pseudo-equilibrio o sin llegar al punto tangente):
+        # posición al final del tiempo disponible, con t(x) creciente entre x y la parada
+        extremo = x_parada - sentido*1e-14*max(1.0, abs(x_parada))
+        if tiempo(extremo) <= tiempo_max:
+            return tiempo_max, extremo, None
+    x_final = brentq(lambda x1: tiempo(x1) - tiempo_max, x, extremo, xtol=1e-14)
+    return tiempo_max, x_final, None
+
+
+def simula_lineal(puntos_iniciales, A1, A2, w, tiempo_max=10.5, max_switches=20):
+    """Encadena segmentos lineales (y deslizamientos) para muchas condiciones iniciales.
+
+    Los cruces de todas las trayectorias que están en el mismo sistema se resuelven juntos.
+    Devuelve una lista de diccionarios con 'cruces' [(t, x, tipo)], 'final' (t, x, y) y
+    'motivo' ('sin_cruce', 'max_switches', 'deslizando')."""
+    A1 = np.asarray(A1, dtype=float)
+    A2 = np.asarray(A2, dtype=float)
+    P = np.asarray(puntos_iniciales, dtype=float).reshape(-1, 2)
+    n = len(P)
+    x, y = P[:, 0].copy(), P[:, 1].copy()
+    t = np.zeros(n)
+    modo = np.where(y > w, 2, 1)
+    resultados = [{'cruces': [], 'final': None, 'motivo': None} for _ in range(n)]
+    activos = np.ones(n, dtype=bool)
+
+    for _ in range(max_switches):
+        for m, A, direccion in ((1, A1, 1), (2, A2, -1)):
+            idx = np.flatnonzero(activos & (modo == m))
+            if idx.size == 0:
+                continue
+            # cada trayectoria tiene su propio tiempo restante: se usa el mayor y se descarta después
+            restante = tiempo_max - t[idx]
+            tc, xc, _ = primer_cruce(A, x[idx], y[idx], w, direccion, restante.max())
+            sin_cruce = np.isnan(tc) | (tc > restante)
+            for j in idx[sin_cruce]:
+                xf, yf = trayectoria_lineal(A, (x[j], y[j]), tiempo_max - t[j])
+                resultados[j]['final'] = (tiempo_max, float(xf), float(yf))
+                resultados[j]['motivo'] = 'sin_cruce'
+                activos[j] = False
+            for j, tcj, xcj in zip(idx[~sin_cruce], tc[~sin_cruce], xc[~sin_cruce]):
+                t[j] += tcj
+                x[j], y[j] = xcj, w
+                # ¿el otro campo continúa el cruce o empuja de vuelta? (ℓ en el punto de cruce)
+                otro = A2 if m == 1 else A1
+                otro_y = otro[1, 0]*xcj + otro[1, 1]*w
+                if otro_y*direccion >= 0:
+                    modo[j] = 2 if m == 1 else 1
+                    resultados[j]['cruces'].append((t[j], xcj, 'cruce'))
+                    continue
+                resultados[j]['cruces'].append((t[j], xcj, 'deslizamiento'))
+                dt, x_sal, sale = _desliza(A1, A2, xcj, w, tiempo_max - t[j])
+                t[j] += dt
+                x[j] = x_sal
+                if sale is None:
+                    resultados[j]['final'] = (t[j], x_sal, w)
+                    resultados[j]['motivo'] = 'deslizando'
+                    activos[j] = False
+                else:
+                    modo[j] = sale
+                    resultados[j]['cruces'].append((t[j], x_sal, f'sale_{sale}'))
+        if not activos.any():
+            break
+    for j in np.flatnonzero(activos):
+        resultados[j]['final'] = (t[j], x[j], y[j])
+        resultados[j]['motivo'] = 'max_switches'
+    return resultados
+
+
+if __name__ == "__main__":
+    # sistemaFilippov.py
+    w = 3
+    A1 = np.array([[2, -1], [1, 4]])
+    A2 = np.array([[1, 2], [-1, 1]])
+    campo1 = lambda t, V: A1 @ V
+    evento = lambda t, V: V[1] - w
+    evento.terminal = True
+    evento.direction = 1
+
+    # primer cruce del sistema 1: max_step=0.01 contra la forma cerrada, con una referencia fina
+    rng = np.random.default_rng(0)
+    P = np.column_stack([rng.uniform(-15, 20, 200), rng.uniform(0, 3, 200)])
+    inicio = time.perf_counter()
+    tc, xc, _ = primer_cruce(A1, P[:, 0], P[:, 1], w, 1, 10.5)
+    t_analitico = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    errores_ivp, errores_an, pasos = [], [], 0
+    for (x0, y0), t_an in zip(P, tc):
+        sol = solve_ivp(campo1, [0, 10.5], [x0, y0], events=evento, max_step=0.01)
+        pasos += sol.t.size
+        ref = solve_ivp(campo1, [0, 10.5], [x0, y0], events=evento, method='DOP853', rtol=1e-13, atol=1e-14)
+        if ref.t_events[0].size > 0:
+            errores_ivp.append(abs(sol.t_events[0][0] - ref.t_events[0][0]))
+            errores_an.append(abs(t_an - ref.t_events[0][0]))
+        else:
+            assert np.isnan(t_an)
+    t_ivp = time.perf_counter() - inicio
+    print(f"{len(P)} condiciones iniciales, {len(errores_an)} con cruce")
+    print(f"  solve_ivp max_step=0.01: {pasos} pasos, error máximo en t de cruce {max(errores_ivp):.2e}")
+    print(f"  forma cerrada:           {t_analitico*1e3:.2f} ms, diferencia máxima con DOP853(1e-13) "
+          f"{max(errores_an):.2e}")
+
+    # lote grande con conmutaciones encadenadas
+    P = np.column_stack([rng.uniform(-15, 20, 2000), rng.uniform(0, 6, 2000)])
+    inicio = time.perf_counter()
+    resultados = simula_lineal(P, A1, A2, w, tiempo_max=10.5)
+    duracion = time.perf_counter() - inicio
+    motivos = {}
+    for r in resultados:
+        motivos[r['motivo']] = motivos.get(r['motivo'], 0) + 1
+    print(f"\n{len(P)} trayectorias encadenadas en {duracion:.2f} s: {motivos}")
+    r = simula_lineal([(0.5, 0.5)], A1, A2, w)[0]
+    print(f"Desde (0.5, 0.5): {[(round(float(t), 6), round(float(x), 6), tipo) for t, x, tipo in r['cruces']]}, "
+          f"final {tuple(round(float(v), 6) for v in r['final'])} ({r['motivo']})")
@@ -16,48 +16,60 @@ T_total = 10     # Tiempo total
 dt = 0.01        # Paso de tiempo
 t = np.arange(0, T_total, dt)
 
+# Propagación:
+# True  -> instantes de cambio calculados una vez y cada segmento propagado exactamente con expm
+#          (conmutacion_lineal.py)
+# False -> señal paso a paso y Euler explícito
+propagacion_exacta = False
+if propagacion_exacta:
+    from conmutacion_lineal import solucion_exacta
+
 # Inicialización
 estado = 1       # 1: A1 activo, 2: A2 activo
 ti = 0           # Tiempo del último cambio
 fase = 0         # Fase del seno
 estado_por_tiempo = []  # Lista para almacenar el estado usado en cada paso
 
-# Generar la función senoidal que controla el cambio
-senal_control = np.zeros_like(t)
-for i in range(1, len(t)):
-    if estado == 1:
-        senal_control[i] = np.sin(t[i] - ti + fase)
-        if senal_control[i] >= h - tol:
-            estado = 2
-            ti = t[i]
-            fase = np.arcsin(h)
-    else:
-        senal_control[i] = -np.sin(t[i] - ti + fase) + 2*h
-        if senal_control[i] <= h + tol:
-            estado = 1
-            ti = t[i]
-            fase = np.arcsin(h)
-    estado_por_tiempo.append(estado)
-
-# Rellenar para tener misma longitud que t
-estado_por_tiempo = [1] + estado_por_tiempo  # mismo largo que t
-
-# Sistema dependiente de la señal senoidal
-def sistema(v, t_index):
-    x, y = v
-    idx = int(t_index / dt)
-    A = A1 if estado_por_tiempo[idx] == 1 else A2
-    return A @ np.array([x, y])
-
-# Resolver ODE con estado dinámico en el tiempo
 v0 = [1, 1]
-sol = np.zeros((len(t), 2))
-sol[0] = v0
+if propagacion_exacta:
+    sol, validas = solucion_exacta(A1, A2, v0, t, dt, h, tol)
+    sol = sol[:validas]  # solo las filas antes de pasar el límite de crecimiento
+else:
+    # Generar la función senoidal que controla el cambio
+    senal_control = np.zeros_like(t)
+    for i in range(1, len(t)):
+        if estado == 1:
+            senal_control[i] = np.sin(t[i] - ti + fase)
+            if senal_control[i] >= h - tol:
+                estado = 2
+                ti = t[i]
+                fase = np.arcsin(h)
+        else:
+            senal_control[i] = -np.sin(t[i] - ti + fase) + 2*h
+            if senal_control[i] <= h + tol:
+                estado = 1
+                ti = t[i]
+                fase = np.arcsin(h)
+        estado_por_tiempo.append(estado)
+
+    # Rellenar para tener misma longitud que t
+    estado_por_tiempo = [1] + estado_por_tiempo  # mismo largo que t
+
+    # Sistema dependiente de la señal senoidal
+    def sistema(v, t_index):
+        x, y = v
+        idx = int(t_index / dt)
+        A = A1 if estado_por_tiempo[idx] == 1 else A2
+        return A @ np.array([x, y])
+
+    # Resolver ODE con estado dinámico en el tiempo
+    sol = np.zeros((len(t), 2))
+    sol[0] = v0
 
-for i in range(1, len(t)):
-    # Usar paso de Euler con la matriz actual (más simple que odeint para control puntual)
-    A = A1 if estado_por_tiempo[i] == 1 else A2
-    sol[i] = sol[i-1] + dt * (A @ sol[i-1])
+    for i in range(1, len(t)):
+        # Usar paso de Euler con la matriz actual (más simple que odeint para control puntual)
+        A = A1 if estado_por_tiempo[i] == 1 else A2
+        sol[i] = sol[i-1] + dt * (A @ sol[i-1])
 
 x, y = sol[:, 0], sol[:, 1]
 
@@ -0,0 +1,126 @@
+import numpy as np
+from scipy.linalg import expm
+import matplotlib.pyplot as plt
+import time
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             'Código en Python'))
+from solucion_lineal import expm_2x2
+from conmutacion_lineal import programa_conmutacion, propagador
+
+"""Estabilidad del sistema conmutado periódicamente entre A1 y A2 sin simular.
+
+Si el sistema pasa τ1 en A1 y luego τ2 en A2 y repite, el estado después de cada
+período es M^n v0 con la matriz de monodromía M = expm(A2 τ2) expm(A1 τ1). El
+sistema es asintóticamente estable si y solo si el radio espectral ρ(M) < 1, y
+log(ρ)/(τ1 + τ2) es la tasa de crecimiento promedio (exponente de Floquet).
+
+Para matrices 2x2 todo tiene fórmula cerrada: expm(A τ) = e^(sτ)[C I + S (A - sI)]
+(expm_2x2 de solucion_lineal.py) y los valores propios de M salen de su traza y
+determinante, así que un mapa de estabilidad sobre una malla (τ1, τ2) son unas pocas
+operaciones de arreglos. Para n > 2 se usa expm de scipy sobre el lote."""
+
+
+def expm_lote(A, tau):
+    """expm(A τ) para un arreglo de tiempos tau: arreglo de forma tau.shape + (n, n)."""
+    A = np.asarray(A, dtype=float)
+    tau = np.asarray(tau, dtype=float)
+    if A.shape != (2, 2):
+        return expm(A*tau[..., np.newaxis, np.newaxis])
+    return expm_2x2(A, tau)
+
+
+def monodromia(A1, A2, tau1, tau2):
+    """M = expm(A2 τ2) expm(A1 τ1); tau1 y tau2 se combinan por broadcasting."""
+    tau1, tau2 = np.broadcast_arrays(np.asarray(tau1, dtype=float), np.asarray(tau2, dtype=float))
+    return expm_lote(A2, tau2) @ expm_lote(A1, tau1)
+
+
+def radio_espectral(M):
+    """Radio espectral de un lote de matrices (..., n, n); forma cerrada para 2x2."""
+    M = np.asarray(M, dtype=float)
+    if M.shape[-2:] != (2, 2):
+        return np.abs(np.linalg.eigvals(M)).max(axis=-1)
+    s = (M[..., 0, 0] + M[..., 1, 1])/2
+    det = M[..., 0, 0]*M[..., 1, 1] - M[..., 0, 1]*M[..., 1, 0]
+    disc = s*s - det
+    # reales: max |s ± √disc| = |s| + √disc; complejos conjugados: |λ|² = det
+    raiz = np.sqrt(np.abs(disc))
+    return np.where(disc >= 0, np.abs(s) + raiz, np.sqrt(np.abs(det)))
+
+
+def mapa_estabilidad(A1, A2, tau1, tau2):
+    """ρ(M) y el exponente de Floquet sobre la malla de tiempos de permanencia.
+
+    tau1, tau2: ejes 1-D; los resultados tienen forma (len(tau2), len(tau1)) como
+    np.meshgrid, listos para contourf(tau1, tau2, ...)."""
+    T1, T2 = np.meshgrid(np.asarray(tau1, dtype=float), np.asarray(tau2, dtype=float))
+    rho = radio_espectral(monodromia(A1, A2, T1, T2))
+    with np.errstate(divide='ignore'):
+        exponente = np.log(rho)/(T1 + T2)
+    return rho, exponente
+
+
+def veredicto_conmutacion(A1, A2, dt=0.01, h=1.0, tol=0.01):
+    """Estabilidad de la regla senoidal de modCampoVectorial.py a partir de su programa de conmutación.
+
+    Devuelve un diccionario con los tiempos de permanencia del 'ciclo' [(estado, τ)],
+    el 'periodo', la 'monodromia', su radio espectral 'rho', el 'exponente' de Floquet
+    y si es 'estable'; si la regla deja de conmutar, 'ciclo' es [] y el veredicto es
+    el de la última matriz activa."""
+    A = {1: np.asarray(A1, dtype=float), 2: np.asarray(A2, dtype=float)}
+    transitorio, ciclo = programa_conmutacion(dt, h, tol)
+    if not ciclo:
+        estado = transitorio[-1][0]
+        lam = np.linalg.eigvals(A[estado])
+        return {'ciclo': [], 'periodo': np.inf, 'monodromia': None, 'rho': np.nan,
+                'exponente': lam.real.max(), 'estable': lam.real.max() < 0}
+    M = np.eye(A[1].shape[0])
+    for estado, k in ciclo:
+        M = propagador(A[estado], k*dt) @ M
+    periodo = sum(k for _, k in ciclo)*dt
+    rho = radio_espectral(M)
+    return {'ciclo': [(estado, k*dt) for estado, k in ciclo], 'periodo': periodo, 'monodromia': M,
+            'rho': rho, 'exponente': np.log(rho)/periodo, 'estable': rho < 1}
+
+
+if __name__ == "__main__":
+    A1 = np.array([[2, -1], [1, 4]])    # Inestable
+    A2 = np.array([[-1, -2], [1, -1]])  # Estable
+
+    v = veredicto_conmutacion(A1, A2)
+    print(f"Regla senoidal (h = 1, tol = 0.01): ciclo {[(e, round(tau, 4)) for e, tau in v['ciclo']]}, "
+          f"ρ = {v['rho']:.4e}, exponente {v['exponente']:.4f} -> {'estable' if v['estable'] else 'inestable'}")
+
+    # comprobación contra expm de scipy en tiempos al azar
+    rng = np.random.default_rng(0)
+    t1, t2 = rng.uniform(0, 3, 200), rng.uniform(0, 3, 200)
+    M = monodromia(A1, A2, t1, t2)
+    M_ref = np.array([expm(A2*b) @ expm(A1*a) for a, b in zip(t1, t2)])
+    rho_ref = np.abs(np.linalg.eigvals(M_ref)).max(axis=1)
+    print(f"Diferencia relativa máxima con scipy: M {np.abs(M - M_ref).max()/np.abs(M_ref).max():.1e}, "
+          f"ρ {np.abs(radio_espectral(M)/rho_ref - 1).max():.1e}")
+
+    # mapa de estabilidad sobre (τ1, τ2)
+    tau1 = np.linspace(0.01, 2, 400)
+    tau2 = np.linspace(0.01, 6, 400)
+    inicio = time.perf_counter()
+    rho, exponente = mapa_estabilidad(A1, A2, tau1, tau2)
+    duracion = time.perf_counter() - inicio
+    print(f"Mapa {rho.shape}: {rho.size/duracion:,.0f} programas/s, "
+          f"{(rho < 1).mean()*100:.1f}% estables")
+
+    plt.figure(figsize=(8, 6))
+    plt.contourf(tau1, tau2, exponente, levels=40, cmap='RdBu_r', vmin=-2, vmax=2)
+    plt.colorbar(label='log(ρ)/(τ1 + τ2)')
+    plt.contour(tau1, tau2, rho, levels=[1], colors='black', linewidths=2)
+    if v['ciclo']:
+        permanencia = dict(v['ciclo'])
+        plt.plot(permanencia[1], permanencia[2], 'o', color='yellow', markersize=8, label='Regla senoidal')
+        plt.legend()
+    plt.xlabel('τ1 (tiempo en A1)')
+    plt.ylabel('τ2 (tiempo en A2)')
+    plt.title('Estabilidad de la conmutación periódica A1 -> A2 (ρ = 1 en negro)')
+    plt.tight_layout()
+    plt.show()
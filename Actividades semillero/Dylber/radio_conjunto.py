@@ -0,0 +1,147 @@
+import numpy as np
+import os
+import time
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from monodromia import expm_lote, radio_espectral
+
+"""Cotas del radio espectral conjunto (JSR) para conmutación arbitraria entre matrices.
+
+Para un conjunto {M_1, ..., M_r} el JSR es el mayor crecimiento promedio por paso que
+puede lograr un producto M_{i_k} ... M_{i_1} con una secuencia cualquiera. Si JSR < 1
+toda secuencia converge a 0; si JSR > 1 existe una que diverge. Para los sistemas
+continuos (A1 y A2 de modCampoVectorial.py o sistemaFilippov.py) se usan los
+propagadores M_i = expm(A_i τ) con un tiempo de permanencia τ, y las cotas se dan
+también como tasas log(JSR)/τ.
+
+Se usa ramificación y poda (Gripenberg): en cada longitud k los productos se extienden
+todos a la vez con matmul apilado. La cota inferior es max ρ(P)^(1/k), y cada producto
+lleva la menor norma ||prefijo||^(1/j) de sus prefijos. Los productos con esa cota por
+debajo de inferior + eps se podan, porque ya no pueden mostrar un crecimiento mayor. La
+cota superior es max(inferior + eps, mayor cota de los productos que siguen activos).
+Los productos se guardan normalizados con su log-norma aparte, de modo que longitudes de
+20 o más no se desbordan, y los productos repetidos se descartan con una tabla de
+productos ya vistos. Las ramas que empiezan con cada prefijo se reparten entre procesos;
+cada una tiene una parte del tiempo total."""
+
+
+def _normaliza(P):
+    normas = np.linalg.norm(P, ord=2, axis=(-2, -1))
+    return P/normas[:, np.newaxis, np.newaxis], np.log(normas)
+
+
+def _rama(matrices, prefijo, inferior, eps, longitud_max, max_productos, tiempo):
+    # ramificación y poda desde un prefijo; devuelve las cotas de su subárbol
+    fin = time.perf_counter() + tiempo
+    r = len(matrices)
+    P = np.eye(matrices.shape[1])
+    for i in prefijo:
+        P = matrices[i] @ P
+    P, logn = _normaliza(P[np.newaxis])
+    k = len(prefijo)
+    cota = np.exp(logn/k)
+    secuencias = np.array([prefijo])
+    mejor = tuple(prefijo)
+    rho0 = radio_espectral(P)[0]
+    if rho0 > 0 and np.exp((np.log(rho0) + logn[0])/k) > inferior:
+        inferior = np.exp((np.log(rho0) + logn[0])/k)
+    evaluados = 1
+    vistos = set()
+    while k < longitud_max and time.perf_counter() < fin:
+        # extensión apilada: (m, r, n, n) -> (m*r, n, n)
+        Q = (matrices[np.newaxis] @ P[:, np.newaxis]).reshape(-1, *P.shape[1:])
+        Q, dlog = _normaliza(Q)
+        logn = np.repeat(logn, r) + dlog
+        cota = np.minimum(np.repeat(cota, r), np.exp(logn/(k + 1)))
+        secuencias = np.column_stack([np.repeat(secuencias, r, axis=0), np.tile(np.arange(r), len(P))])
+        k += 1
+        evaluados += len(Q)
+
+        with np.errstate(divide='ignore'):
+            crecimiento = np.exp((np.log(radio_espectral(Q)) + logn)/k)
+        j = np.argmax(crecimiento)
+        if crecimiento[j] > inferior:
+            inferior, mejor = crecimiento[j], tuple(secuencias[j])
+
+        # poda: cotas dominadas por la inferior y productos repetidos
+        activos = cota > inferior + eps
+        claves = np.round(np.column_stack([Q.reshape(len(Q), -1), logn]), 10)
+        for i in np.flatnonzero(activos):
+            clave = claves[i].tobytes()
+            if clave in vistos:
+                activos[i] = False
+            else:
+                vistos.add(clave)
+        P, logn, cota, secuencias = Q[activos], logn[activos], cota[activos], secuencias[activos]
+        if len(P) == 0 or len(P) > max_productos:
+            break
+    return {'inferior': inferior, 'secuencia': mejor, 'cota_activos': cota.max() if len(cota) else 0.0,
+            'longitud': k, 'productos': evaluados}
+
+
+def radio_conjunto(matrices, eps=1e-3, longitud_max=30, tiempo_total=10.0, profundidad_ramas=2,
+                   max_productos=200000, procesos=None):
+    """Cotas inferior y superior del JSR de un conjunto de matrices (lista o arreglo (r, n, n)).
+
+    Devuelve un diccionario con 'inferior', 'superior', la 'secuencia' de índices (aplicada
+    de izquierda a derecha) que da la cota inferior, la 'longitud' máxima alcanzada y el
+    número de 'productos' evaluados."""
+    matrices = np.asarray(matrices, dtype=float)
+    r = len(matrices)
+    # cota inferior inicial con las matrices solas, para podar desde el principio
+    rho = radio_espectral(matrices)
+    inferior = rho.max()
+    prefijos = list(product(range(r), repeat=profundidad_ramas))
+    procesos = procesos or os.cpu_count() or 1
+    tiempo_rama = tiempo_total*min(procesos, len(prefijos))/len(prefijos)
+    argumentos = [(matrices, p, inferior, eps, longitud_max, max_productos, tiempo_rama) for p in prefijos]
+    if procesos == 1:
+        ramas = [_rama(*a) for a in argumentos]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            ramas = list(ejecutor.map(_rama, *zip(*argumentos)))
+    mejor = max(ramas, key=lambda res: res['inferior'])
+    if mejor['inferior'] <= inferior:
+        mejor = dict(mejor, secuencia=(int(np.argmax(rho)),))
+    inferior = max(inferior, mejor['inferior'])
+    superior = max(inferior + eps, max(res['cota_activos'] for res in ramas))
+    return {'inferior': inferior, 'superior': superior, 'secuencia': tuple(int(i) for i in mejor['secuencia']),
+            'longitud': max(res['longitud'] for res in ramas), 'productos': sum(res['productos'] for res in ramas)}
+
+
+def crecimiento_conmutado(matrices_continuas, tau, **opciones):
+    """Cotas de la tasa de crecimiento log(JSR)/τ con conmutación arbitraria cada τ entre v' = A_i v.
+
+    Agrega al resultado de radio_conjunto las tasas 'tasa_inferior', 'tasa_superior' y el
+    'veredicto': 'estable' (toda secuencia converge), 'diverge' (hay una que diverge) o
+    'indeterminado'."""
+    propagadores = np.array([expm_lote(A, tau) for A in matrices_continuas])
+    res = radio_conjunto(propagadores, **opciones)
+    res['tasa_inferior'] = np.log(res['inferior'])/tau
+    res['tasa_superior'] = np.log(res['superior'])/tau
+    res['veredicto'] = ('estable' if res['superior'] < 1 else
+                        'diverge' if res['inferior'] > 1 else 'indeterminado')
+    return res
+
+
+if __name__ == "__main__":
+    # caso con valor conocido: JSR = (1 + √5)/2
+    inicio = time.perf_counter()
+    res = radio_conjunto([[[1, 1], [0, 1]], [[1, 0], [1, 1]]], eps=1e-4, tiempo_total=5)
+    print(f"{{[[1,1],[0,1]], [[1,0],[1,1]]}}: {res['inferior']:.6f} <= JSR <= {res['superior']:.6f} "
+          f"(exacto {(1 + 5**0.5)/2:.6f}), secuencia {res['secuencia']}, longitud {res['longitud']}, "
+          f"{res['productos']} productos en {time.perf_counter() - inicio:.2f} s")
+
+    sistemas = {
+        'modCampoVectorial.py': [np.array([[2, -1], [1, 4]]), np.array([[-1, -2], [1, -1]])],
+        'sistemaFilippov.py': [np.array([[2, -1], [1, 4]]), np.array([[1, 2], [-1, 1]])],
+        # dos focos estables cuya conmutación puede diverger
+        'focos estables': [np.array([[-0.1, 1], [-10, -0.1]]), np.array([[-0.1, 10], [-1, -0.1]])],
+    }
+    for nombre, matrices in sistemas.items():
+        for tau in [0.1, 0.5]:
+            inicio = time.perf_counter()
+            res = crecimiento_conmutado(matrices, tau, eps=1e-3, tiempo_total=5)
+            print(f"{nombre}, τ = {tau}: tasa en [{res['tasa_inferior']:.4f}, {res['tasa_superior']:.4f}] "
+                  f"-> {res['veredicto']}; peor secuencia {''.join(str(i + 1) for i in res['secuencia'])} "
+                  f"(longitud {res['longitud']}, {res['productos']} productos, {time.perf_counter() - inicio:.2f} s)")
@@ -2,6 +2,22 @@ import numpy as np
 from scipy.integrate import solve_ivp
 import matplotlib.pyplot as plt
 
+# True: tiempos de cruce con la solución cerrada de cada sistema lineal (filippov_lineal.py)
+# False: solve_ivp con max_step=0.01 como antes
+eventos_analiticos = False
+if eventos_analiticos:
+    from filippov_lineal import segmento_lineal
+
+# True: las dos regiones en una sola pasada de lineas_flujo.py (Código en Python) en vez de
+# dos plt.streamplot
+lineas_propias = False
+if lineas_propias:
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                 'Código en Python'))
+    from lineas_flujo import lineas_flujo, dibuja_lineas_flujo
+
 #ventana
 ax=-15
 bx=20
@@ -28,6 +44,9 @@ b2 = -2
 c2 = 1
 d2 = -1 """
 
+A1 = np.array([[a1, b1], [c1, d1]])
+A2 = np.array([[a2, b2], [c2, d2]])
+
 def sistema1(t, V):
     x, y = V
     dxdt = a1 * x + b1 * y
@@ -53,10 +72,14 @@ evento_y3_abajo.direction = -1  # Solo cuando cruza hacia abajo
 
 
 def simula_sistema1(x0, y0, tiempo_max):
+    if eventos_analiticos:
+        return segmento_lineal(A1, [x0, y0], w, 1, tiempo_max)
     sol = solve_ivp(sistema1, [0, tiempo_max], [x0, y0], events=evento_y3_arriba, max_step=0.01)
     return sol
 
 def simula_sistema2(x0, y0, tiempo_max):
+    if eventos_analiticos:
+        return segmento_lineal(A2, [x0, y0], w, -1, tiempo_max)
     sol = solve_ivp(sistema2, [0, tiempo_max], [x0, y0], events=evento_y3_abajo, max_step=0.01)
     return sol
 
@@ -72,8 +95,19 @@ dXdt2 = a2 * X2 + b2 * Y2
 dYdt2 = c2 * X2 + d2 * Y2
 
 plt.figure(figsize=(12, 8))
-plt.streamplot(X1, Y1, dXdt1, dYdt1, color='red', linewidth=0.6, density=1.2)
-plt.streamplot(X2, Y2, dXdt2, dYdt2, color='green', linewidth=0.6, density=1.2)
+if lineas_propias:
+    # una sola malla: abajo de w el sistema 1, arriba el 2, y las líneas no cruzan y = w
+    xs, ys = np.arange(ax, bx + h, h), np.arange(ay, by + h, h)
+    X, Y = np.meshgrid(xs, ys)
+    abajo = Y < w
+    U = np.where(abajo, a1*X + b1*Y, a2*X + b2*Y)
+    V = np.where(abajo, c1*X + d1*Y, c2*X + d2*Y)
+    lineas = lineas_flujo(xs, ys, U, V, densidad=1.2, regiones=(~abajo).astype(int))
+    dibuja_lineas_flujo(plt.gca(), [l for l in lineas if l[:, 1].mean() < w], color='red')
+    dibuja_lineas_flujo(plt.gca(), [l for l in lineas if l[:, 1].mean() >= w], color='green')
+else:
+    plt.streamplot(X1, Y1, dXdt1, dYdt1, color='red', linewidth=0.6, density=1.2)
+    plt.streamplot(X2, Y2, dXdt2, dYdt2, color='green', linewidth=0.6, density=1.2)
 plt.axhline(y=w, color='black', linestyle='--', linewidth=2, label=f'Frontera y = {w}')
 
 # Puedes probar varios puntos iniciales aquí
@@ -0,0 +1,241 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+from filippov_lotes import simula_lote, puntos_tangentes, campos
+
+"""Barrido de parámetros (R0, mu, theta, u, w) del modelo SI de Filippov.
+
+En SImodel.py los parámetros son variables globales, así que explorar el espacio
+de parámetros obliga a editar y volver a correr el script. Aquí cada punto del
+barrido (una malla o un hipercubo latino) se evalúa en un proceso: se calculan
+los equilibrios xe1/ye1 y xe2_*/ye2_*, los puntos tangentes t1x/t2x y el destino
+final de un conjunto de condiciones iniciales (con el simulador por lotes de
+filippov_lotes.py). Los resultados se guardan en una tabla CSV que también sirve
+de memoria: al ampliar el barrido solo se calculan las celdas nuevas."""
+
+NOMBRES = ('R0', 'mu', 'theta', 'u', 'w')
+DESTINOS = ('eq1', 'eq2', 'pseudo', 'ciclo', 'fuera', 'otro')
+# versión de clasifica: entra en la clave, así las filas guardadas con otra versión se recalculan
+VERSION_CLASIFICACION = 3
+COLUMNAS = (['clave'] + list(NOMBRES)
+            + ['xe1', 'ye1', 'xe2_1', 'ye2_1', 'xe2_2', 'ye2_2', 't1x', 't2x']
+            + ['n_' + d for d in DESTINOS])
+
+
+def malla_parametros(rangos):
+    """Malla completa: rangos = {'R0': (min, max, n), ...}; los que falten quedan fijos.
+
+    Un valor escalar en rangos también se acepta como parámetro fijo."""
+    from filippov_lotes import PARAMETROS
+    ejes = []
+    for nombre in NOMBRES:
+        r = rangos.get(nombre, PARAMETROS[nombre])
+        ejes.append(np.linspace(*r) if isinstance(r, tuple) else [r])
+    return [dict(zip(NOMBRES, map(float, valores))) for valores in itertools.product(*ejes)]
+
+
+def hipercubo_latino(rangos, n, semilla=0):
+    """n puntos de un hipercubo latino: rangos = {'R0': (min, max), ...}."""
+    from filippov_lotes import PARAMETROS
+    rng = np.random.default_rng(semilla)
+    puntos = [dict(PARAMETROS) for _ in range(n)]
+    for nombre, (lo, hi) in rangos.items():
+        # una muestra por estrato, con los estratos permutados en cada dimensión
+        u = (rng.permutation(n) + rng.uniform(size=n))/n
+        for p, valor in zip(puntos, lo + (hi - lo)*u):
+            p[nombre] = float(valor)
+    return puntos
+
+
+def equilibrios(p):
+    """Equilibrio de f1 y raíces de f2, con las mismas fórmulas de SImodel.py (nan si no existen)."""
+    R0, mu, theta, u = p['R0'], p['mu'], p['theta'], p['u']
+    xe1 = 1/R0
+    ye1 = mu*(R0 - 1)/((mu + theta)*R0)
+    a = mu*R0
+    b = -(mu + mu*R0 - u*R0)
+    c = mu
+    discriminante = b**2 - 4*a*c
+    if discriminante >= 0:
+        xe2_1 = (-b + np.sqrt(discriminante))/(2*a)
+        xe2_2 = (-b - np.sqrt(discriminante))/(2*a)
+        ye2_1 = (mu*(1 - xe2_1) - u)/(mu + theta)
+        ye2_2 = (mu*(1 - xe2_2) - u)/(mu + theta)
+    else:
+        xe2_1 = xe2_2 = ye2_1 = ye2_2 = np.nan
+    return xe1, ye1, xe2_1, ye2_1, xe2_2, ye2_2
+
+
+def pseudo_equilibrio(p):
+    """Abscisa del pseudo-equilibrio sobre y = w (f1_x(x, w) = 0), nan si cae fuera del segmento deslizante."""
+    t1x, t2x = puntos_tangentes(p)
+    xp = p['mu']/(p['mu'] + (p['mu'] + p['theta'])*p['R0']*p['w'])
+    return xp if min(t1x, t2x) < xp < max(t1x, t2x) else np.nan
+
+
+def _jacobiano(x, y, p):
+    # el mismo para f1 y f2 (solo difieren en la constante u)
+    R0, mu, k = p['R0'], p['mu'], p['mu'] + p['theta']
+    return np.array([[-mu - k*R0*y, -k*R0*x], [k*R0*y, k*(R0*x - 1)]])
+
+
+def _se_asienta(final, objetivo, campo, p, tol, tiempo_extra):
+    # llegó al equilibrio: está a menos de tol o, si es estable, la trayectoria sigue desde
+    # el punto final con el campo de su región hasta quedar a menos de tol de él antes de
+    # tiempo_extra y sin volver a y = w (convergencia lenta que el horizonte fijo cortó,
+    # como cerca de R0 = 1)
+    final, objetivo = np.asarray(final, dtype=float), np.asarray(objetivo, dtype=float)
+    if np.hypot(*(final - objetivo)) < tol:
+        return True
+    if np.any(np.linalg.eigvals(_jacobiano(*objetivo, p)).real >= 0):
+        return False
+
+    def llegada(t, V):
+        return np.hypot(*(V - objetivo)) - tol
+
+    def frontera(t, V):
+        return V[1] - p['w']
+
+    llegada.terminal = frontera.terminal = True
+    sol = solve_ivp(lambda t, V: campo(*V), [0, tiempo_extra], final, events=[llegada, frontera],
+                    rtol=1e-8, atol=1e-10)
+    return sol.t_events[0].size > 0
+
+
+def clasifica(res, p, eq, tol=1e-2, tiempo_extra=500):
+    """Destino final de una trayectoria devuelta por simula_lote.
+
+    Un equilibrio se acepta si el punto final está a menos de tol, o si es estable y la
+    trayectoria, continuada desde el punto final sin salir de su región, llega a menos
+    de tol antes de tiempo_extra (prueba de asentamiento, así la etiqueta no depende de
+    lo largo del horizonte de simula_lote)."""
+    if res['motivo'] == 'fuera_ventana':
+        return 'fuera'
+    # el pseudo-equilibrio se revisa antes que max_switches: una trayectoria que se queda en
+    # él agota tiempo_deslizamiento, se despega con eps y vuelve, hasta gastar los cambios.
+    # Sobre y = w la dinámica es x' = f1_x(x, w), lineal y decreciente: basta la distancia.
+    # Si xp es nan no hay pseudo-equilibrio en el segmento deslizante
+    xp = pseudo_equilibrio(p)
+    deslizamientos = [s for s in res['segmentos'] if s['sistema'] == 'deslizamiento']
+    if deslizamientos and deslizamientos[-1]['evento'] is None and not np.isnan(xp) and \
+            abs(deslizamientos[-1]['x'][-1] - xp) < tol:
+        return 'pseudo'
+    if res['motivo'] == 'max_switches':
+        return 'ciclo'
+    sistema = res['segmentos'][-1]['sistema']
+    final = res['final'][1:]
+    xe1, ye1, xe2_1, ye2_1, xe2_2, ye2_2 = eq
+
+    def campo1(x, y):
+        return campos(x, y, p)[:2]
+
+    def campo2(x, y):
+        return campos(x, y, p)[2:]
+
+    if sistema == 1 and ye1 < p['w'] and _se_asienta(final, (xe1, ye1), campo1, p, tol, tiempo_extra):
+        return 'eq1'
+    if sistema == 2:
+        for objetivo in ((xe2_1, ye2_1), (xe2_2, ye2_2)):
+            if objetivo[1] > p['w'] and _se_asienta(final, objetivo, campo2, p, tol, tiempo_extra):
+                return 'eq2'
+    return 'otro'
+
+
+def evalua_punto(p, puntos_iniciales, opciones):
+    """Fila de la tabla para un punto del espacio de parámetros."""
+    eq = equilibrios(p)
+    t1x, t2x = puntos_tangentes(p)
+    resultados = simula_lote(puntos_iniciales, p, guardar=False, **opciones)
+    conteo = dict.fromkeys(DESTINOS, 0)
+    for res in resultados:
+        conteo[clasifica(res, p, eq)] += 1
+    fila = dict(p)
+    fila.update(zip(['xe1', 'ye1', 'xe2_1', 'ye2_1', 'xe2_2', 'ye2_2'], eq))
+    fila['t1x'], fila['t2x'] = t1x, t2x
+    fila.update({'n_' + d: conteo[d] for d in DESTINOS})
+    return fila
+
+
+def clave_punto(p, puntos_iniciales, opciones):
+    """Clave de la memoria: parámetros (redondeados), condiciones iniciales y opciones."""
+    contenido = json.dumps({'p': [round(p[n], 12) for n in NOMBRES],
+                            'ci': np.round(np.asarray(puntos_iniciales, dtype=float), 12).tolist(),
+                            'opciones': opciones, 'clasificacion': VERSION_CLASIFICACION}, sort_keys=True)
+    return hashlib.sha1(contenido.encode()).hexdigest()[:16]
+
+
+def _normaliza(fila):
+    # las filas leídas del CSV vienen como texto
+    return {c: (fila[c] if c == 'clave' else int(fila[c]) if c.startswith('n_') else float(fila[c]))
+            for c in COLUMNAS}
+
+
+def _evalua(args):
+    clave, p, puntos_iniciales, opciones = args
+    fila = evalua_punto(p, puntos_iniciales, opciones)
+    fila['clave'] = clave
+    return fila
+
+
+def barrido(puntos_parametros, puntos_iniciales, archivo='barrido_SI.csv', procesos=None,
+            **opciones):
+    """Evalúa todos los puntos de parámetros que no estén ya en archivo y devuelve la tabla completa.
+
+    opciones se pasan a simula_lote (ventana, tiempo_max, max_switches, dt, ...).
+    Las filas nuevas se agregan al CSV a medida que terminan, así que un barrido
+    interrumpido se retoma donde quedó."""
+    hechas = {}
+    if os.path.exists(archivo):
+        with open(archivo, newline='') as f:
+            for fila in csv.DictReader(f):
+                hechas[fila['clave']] = _normaliza(fila)
+
+    tareas = []
+    for p in puntos_parametros:
+        clave = clave_punto(p, puntos_iniciales, opciones)
+        if clave not in hechas:
+            tareas.append((clave, p, puntos_iniciales, opciones))
+    print(f"Barrido: {len(puntos_parametros)} puntos, {len(puntos_parametros) - len(tareas)} en memoria, "
+          f"{len(tareas)} por calcular")
+
+    nuevo = not os.path.exists(archivo)
+    with open(archivo, 'a', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS)
+        if nuevo:
+            escritor.writeheader()
+        if tareas:
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                for fila in ejecutor.map(_evalua, tareas):
+                    escritor.writerow(fila)
+                    f.flush()
+                    hechas[fila['clave']] = fila
+
+    claves = [clave_punto(p, puntos_iniciales, opciones) for p in puntos_parametros]
+    return [hechas[c] for c in claves]
+
+
+if __name__ == "__main__":
+    puntos_iniciales = [(0.55, 0.4), (0.3, 0.4), (0.1, 0.5), (0.95, 0.28), (0.8, 0.1), (0.2, 0.05)]
+
+    # malla en (R0, u) con el resto de parámetros de SImodel.py
+    malla = malla_parametros({'R0': (1.1, 3.0, 4), 'u': (0.02, 0.2, 3)})
+    inicio = time.perf_counter()
+    tabla = barrido(malla, puntos_iniciales)
+    print(f"  {time.perf_counter() - inicio:.1f} s")
+
+    # la misma malla ampliada: solo se calculan las celdas nuevas
+    malla = malla_parametros({'R0': (1.1, 3.0, 4), 'u': (0.02, 0.2, 3), 'w': (0.2, 0.3, 2)})
+    inicio = time.perf_counter()
+    tabla = barrido(malla, puntos_iniciales)
+    print(f"  {time.perf_counter() - inicio:.1f} s")
+
+    print(f"\n{'R0':>6s} {'u':>6s} {'w':>5s} {'t1x':>7s} {'t2x':>7s} " + " ".join(f"{d:>6s}" for d in DESTINOS))
+    for fila in tabla:
+        print(f"{fila['R0']:6.3f} {fila['u']:6.3f} {fila['w']:5.2f} {fila['t1x']:7.4f} {fila['t2x']:7.4f} "
+              + " ".join(f"{fila['n_' + d]:6d}" for d in DESTINOS))
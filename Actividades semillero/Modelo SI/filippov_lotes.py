@@ -0,0 +1,393 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+import time
+
+"""Simulador por lotes del modelo SI de Filippov.
+
+En SImodel.py cada condición inicial recorre su propio bucle de conmutación
+(una cadena de llamadas a solve_ivp). Aquí todas las condiciones iniciales
+avanzan juntas: en cada paso se aplica un RK4 vectorizado sobre el arreglo
+de trayectorias activas, cada una con su propio modo (sistema 1, sistema 2 o
+deslizamiento), y los cruces de y = w y las llegadas a T1/T2 se detectan con
+máscaras por trayectoria. El resultado conserva la estructura de segmentos
+que imprime el bucle original."""
+
+# parametros por defecto (los mismos de SImodel.py)
+PARAMETROS = {'R0': 1.5, 'mu': 0.2, 'theta': 0.15, 'u': 0.1, 'w': 0.3}
+
+#ventana
+VENTANA = (0, 1, 0, 1) # (ax, bx, ay, by)
+
+# modos de cada trayectoria
+SISTEMA1 = 1
+SISTEMA2 = 2
+DESLIZAMIENTO = 3
+
+
+# CAMPOS VECTORIZADOS (x, y pueden ser arreglos de cualquier forma)
+def campos(x, y, p):
+    """Devuelve f1_x, f1_y, f2_x, f2_y evaluados en (x, y)."""
+    R0, mu, theta, u = p['R0'], p['mu'], p['theta'], p['u']
+    f1x = mu*(1-x) - (mu+theta)*R0*x*y
+    f1y = (mu+theta)*y*(R0*x - 1)
+    f2x = f1x # f1_x == f2_x en este modelo
+    f2y = f1y - u
+    return f1x, f1y, f2x, f2y
+
+
+def calcular_L(x, p):
+    """ℓ = ⟨∇H, f⁽¹⁾⟩ * ⟨∇H, f⁽²⁾⟩ con H = y - w, vectorizado en x."""
+    _, f1y, _, f2y = campos(x, p['w'], p)
+    return f1y*f2y, f1y, f2y
+
+
+def puntos_tangentes(p):
+    """Abscisas de T1 (f1_y = 0) y T2 (f2_y = 0) sobre y = w."""
+    t1x = 1/p['R0']
+    t2x = (1/p['R0'])*(1 + p['u']/((p['mu'] + p['theta'])*p['w']))
+    return t1x, t2x
+
+
+def campo_por_modo(x, y, modo, p):
+    """Campo activo de cada trayectoria según su modo.
+
+    En deslizamiento se usa la combinación convexa de Filippov sobre y = w
+    (aquí coincide con f1_x porque f1_x == f2_x) y dy/dt = 0."""
+    f1x, f1y, f2x, f2y = campos(x, y, p)
+    denom = f1y - f2y
+    denom = np.where(denom == 0, 1, denom) # Evitar división por cero
+    alfa = f1y/denom
+    fsx = (1 - alfa)*f1x + alfa*f2x
+    dx = np.where(modo == SISTEMA1, f1x, np.where(modo == SISTEMA2, f2x, fsx))
+    dy = np.where(modo == SISTEMA1, f1y, np.where(modo == SISTEMA2, f2y, 0.0))
+    return dx, dy
+
+
+def _hermite(c0, d0, c1, d1, h, s):
+    """Interpolante cúbico de Hermite en s ∈ [0, 1] sobre un paso de tamaño h."""
+    s2 = s*s
+    s3 = s2*s
+    return ((2*s3 - 3*s2 + 1)*c0 + (s3 - 2*s2 + s)*h*d0
+            + (-2*s3 + 3*s2)*c1 + (s3 - s2)*h*d1)
+
+
+def _localiza(c0, d0, c1, d1, h, objetivo, iteraciones=50):
+    """Bisección vectorizada de Hermite(s) = objetivo dentro del paso.
+
+    Devuelve s ∈ [0, 1] para cada trayectoria con evento."""
+    izq = np.zeros_like(c0)
+    der = np.ones_like(c0)
+    signo0 = np.sign(c0 - objetivo)
+    for _ in range(iteraciones):
+        medio = 0.5*(izq + der)
+        g = _hermite(c0, d0, c1, d1, h, medio) - objetivo
+        mismo = np.sign(g) == signo0
+        izq = np.where(mismo, medio, izq)
+        der = np.where(mismo, der, medio)
+    return der
+
+
+def simula_lote(puntos_iniciales, p=None, ventana=VENTANA, tiempo_max=50,
+                tiempo_deslizamiento=50, max_switches=8, dt=0.01, eps=1e-6,
+                guardar=True):
+    """Simula todas las condiciones iniciales a la vez con la lógica de SImodel.py.
+
+    puntos_iniciales: arreglo (N, 2) o lista de tuplas (x0, y0).
+    guardar: si es True cada segmento trae los puntos intermedios ('t', 'x', 'y');
+             si es False solo se guardan los extremos (útil para barridos grandes).
+
+    Devuelve una lista con un diccionario por trayectoria:
+      'segmentos': lista de {'sistema': 1 | 2 | 'deslizamiento', 't0', 't', 'x', 'y', 'evento'}
+      'cruces':    lista de {'t', 'x', 'y', 'l', 'f1y', 'f2y', 'tipo'} con tipo
+                   'cruce' (ℓ > 0), 'deslizamiento' (ℓ < 0) o 'tangente' (ℓ == 0)
+      'tangentes': lista de ('T1' | 'T2', x) alcanzados al final de un deslizamiento
+      'motivo':    'sin_cruce', 'max_switches' o 'fuera_ventana'
+      'final':     (t, x, y) último punto de la trayectoria
+    """
+    p = dict(PARAMETROS if p is None else p)
+    w = p['w']
+    ax, bx, ay, by = ventana
+    t1x, t2x = puntos_tangentes(p)
+
+    P = np.asarray(puntos_iniciales, dtype=float).reshape(-1, 2)
+    N = len(P)
+    x = P[:, 0].copy()
+    y = P[:, 1].copy()
+    t_loc = np.zeros(N)   # tiempo dentro del segmento actual
+    t_abs = np.zeros(N)   # tiempo acumulado al inicio del segmento actual
+    modo = np.where(y < w, SISTEMA1, SISTEMA2)
+    n_switch = np.ones(N, dtype=int)  # segmentos de región iniciados
+    activo = np.ones(N, dtype=bool)
+
+    resultados = [{'segmentos': [], 'cruces': [], 'tangentes': [],
+                   'motivo': None, 'final': None} for _ in range(N)]
+    abiertos = [None]*N  # segmento en curso de cada trayectoria
+
+    # historial de puntos (paso, trayectoria, t, x, y) de las trayectorias activas
+    hist = []
+    paso = 0
+
+    def abre_segmento(j, sistema):
+        abiertos[j] = {'sistema': sistema, 't0': t_abs[j], 'paso0': paso,
+                       'inicio': (x[j], y[j])}
+
+    def cierra_segmento(j, t_fin, x_fin, y_fin, evento):
+        seg = abiertos[j]
+        seg['fin'] = (t_fin, x_fin, y_fin)
+        seg['paso1'] = paso
+        seg['evento'] = evento
+        resultados[j]['segmentos'].append(seg)
+        abiertos[j] = None
+
+    def termina(j, motivo):
+        activo[j] = False
+        resultados[j]['motivo'] = motivo
+        resultados[j]['final'] = (t_abs[j], x[j], y[j])
+
+    def nueva_region(j):
+        # equivalente al inicio de una nueva iteración del bucle de conmutación
+        if x[j] < ax or x[j] > bx or y[j] < ay or y[j] > by:
+            termina(j, 'fuera_ventana')
+        elif n_switch[j] >= max_switches:
+            termina(j, 'max_switches')
+        else:
+            n_switch[j] += 1
+            modo[j] = SISTEMA1 if y[j] < w else SISTEMA2
+            t_loc[j] = 0.0
+            abre_segmento(j, int(modo[j]))
+
+    for j in range(N):
+        abre_segmento(j, int(modo[j]))
+    hist.append((np.full(N, paso), np.arange(N), t_loc.copy(), x.copy(), y.copy()))
+
+    while activo.any():
+        paso += 1
+        idx = np.flatnonzero(activo)
+        xx, yy, mm = x[idx], y[idx], modo[idx]
+        limite = np.where(mm == DESLIZAMIENTO, tiempo_deslizamiento, tiempo_max)
+        h = np.minimum(dt, limite - t_loc[idx])
+
+        # RK4 vectorizado con el campo de cada modo
+        k1x, k1y = campo_por_modo(xx, yy, mm, p)
+        k2x, k2y = campo_por_modo(xx + 0.5*h*k1x, yy + 0.5*h*k1y, mm, p)
+        k3x, k3y = campo_por_modo(xx + 0.5*h*k2x, yy + 0.5*h*k2y, mm, p)
+        k4x, k4y = campo_por_modo(xx + h*k3x, yy + h*k3y, mm, p)
+        xn = xx + h/6*(k1x + 2*k2x + 2*k3x + k4x)
+        yn = yy + h/6*(k1y + 2*k2y + 2*k3y + k4y)
+        tn = t_loc[idx] + h
+
+        # máscaras de eventos por trayectoria
+        ev_arriba = (mm == SISTEMA1) & (yy < w) & (yn >= w)
+        ev_abajo = (mm == SISTEMA2) & (yy > w) & (yn <= w)
+        g1p, g1n = xx - t1x, xn - t1x
+        g2p, g2n = xx - t2x, xn - t2x
+        ev_T1 = (mm == DESLIZAMIENTO) & (g1p != 0) & (g1p*g1n <= 0)
+        ev_T2 = (mm == DESLIZAMIENTO) & (g2p != 0) & (g2p*g2n <= 0) & ~ev_T1
+        ev = ev_arriba | ev_abajo | ev_T1 | ev_T2
+
+        # localización del evento sobre el interpolante de Hermite del paso
+        xe, ye, te = xn.copy(), yn.copy(), tn.copy()
+        if ev.any():
+            e = np.flatnonzero(ev)
+            dxn, dyn = campo_por_modo(xn[e], yn[e], mm[e], p)
+            en_y = ev_arriba[e] | ev_abajo[e]
+            c0 = np.where(en_y, yy[e], xx[e])
+            d0 = np.where(en_y, k1y[e], k1x[e])
+            c1 = np.where(en_y, yn[e], xn[e])
+            d1 = np.where(en_y, dyn, dxn)
+            objetivo = np.where(en_y, w, np.where(ev_T1[e], t1x, t2x))
+            s = _localiza(c0, d0, c1, d1, h[e], objetivo)
+            xe[e] = _hermite(xx[e], k1x[e], xn[e], dxn, h[e], s)
+            ye[e] = np.where(en_y, w, yy[e])
+            te[e] = t_loc[idx[e]] + s*h[e]
+
+        # avanzar las trayectorias sin evento
+        x[idx] = np.where(ev, xe, xn)
+        y[idx] = np.where(ev, ye, yn)
+        t_loc[idx] = te
+        fin_tiempo = ~ev & (tn >= limite - 1e-12)
+
+        # contabilidad por trayectoria (solo las que tuvieron evento o agotaron el tiempo)
+        for k in np.flatnonzero(ev | fin_tiempo):
+            j = idx[k]
+            m = mm[k]
+            t_fin = t_abs[j] + t_loc[j]
+            if m != DESLIZAMIENTO:
+                if fin_tiempo[k]:
+                    # no hay cruce: terminar
+                    cierra_segmento(j, t_fin, x[j], y[j], None)
+                    t_abs[j] = t_fin
+                    termina(j, 'sin_cruce')
+                    continue
+                cierra_segmento(j, t_fin, x[j], y[j], 'cruce')
+                t_abs[j] = t_fin
+                l, f1y, f2y = calcular_L(x[j], p)
+                registro = {'t': t_fin, 'x': x[j], 'y': y[j], 'l': l, 'f1y': f1y, 'f2y': f2y}
+                resultados[j]['cruces'].append(registro)
+                if l > 0:
+                    # Caso 1: cruce, continuar en la otra región
+                    registro['tipo'] = 'cruce'
+                    y[j] = w + eps if m == SISTEMA1 else w - eps
+                    nueva_region(j)
+                elif l < 0:
+                    # Caso 2: deslizamiento sobre y = w
+                    registro['tipo'] = 'deslizamiento'
+                    y[j] = w
+                    modo[j] = DESLIZAMIENTO
+                    t_loc[j] = 0.0
+                    abre_segmento(j, 'deslizamiento')
+                else:
+                    # Caso 3: tangencia, empujar según el signo de la otra proyección
+                    registro['tipo'] = 'tangente'
+                    otra = f2y if abs(f1y) < abs(f2y) else f1y
+                    y[j] = w + eps if otra > 0 else w - eps
+                    nueva_region(j)
+            else:
+                evento = 'T1' if ev_T1[k] else ('T2' if ev_T2[k] else None)
+                cierra_segmento(j, t_fin, x[j], w, evento)
+                t_abs[j] = t_fin
+                l_fin, f1y_fin, f2y_fin = calcular_L(x[j], p)
+                tol = 1e-8
+                if evento == 'T1' or abs(f1y_fin) < tol:
+                    resultados[j]['tangentes'].append(('T1', x[j]))
+                if evento == 'T2' or abs(f2y_fin) < tol:
+                    resultados[j]['tangentes'].append(('T2', x[j]))
+                # empujón fuera de la frontera según el signo de f1_2(x_fin)
+                y[j] = w + eps if f1y_fin > 0 else w - eps
+                nueva_region(j)
+
+        if guardar:
+            vivos = np.flatnonzero(activo)
+            hist.append((np.full(len(vivos), paso), vivos, t_loc[vivos].copy(),
+                         x[vivos].copy(), y[vivos].copy()))
+
+    _arma_segmentos(resultados, hist, guardar)
+    return resultados
+
+
+def _arma_segmentos(resultados, hist, guardar):
+    """Reparte el historial por trayectoria y segmento (puntos del paso0 al paso1 - 1
+    más el punto final exacto del segmento)."""
+    if guardar:
+        pasos = np.concatenate([h[0] for h in hist])
+        trays = np.concatenate([h[1] for h in hist])
+        ts = np.concatenate([h[2] for h in hist])
+        xs = np.concatenate([h[3] for h in hist])
+        ys = np.concatenate([h[4] for h in hist])
+        orden = np.lexsort((pasos, trays))
+        pasos, trays, ts, xs, ys = pasos[orden], trays[orden], ts[orden], xs[orden], ys[orden]
+        inicio = np.searchsorted(trays, np.arange(len(resultados)))
+        final = np.searchsorted(trays, np.arange(len(resultados)), side='right')
+
+    for j, res in enumerate(resultados):
+        for seg in res['segmentos']:
+            t_fin, x_fin, y_fin = seg.pop('fin')
+            paso0, paso1 = seg.pop('paso0'), seg.pop('paso1')
+            x_ini, y_ini = seg.pop('inicio')
+            if guardar:
+                pj = pasos[inicio[j]:final[j]]
+                a, b = inicio[j] + np.searchsorted(pj, [paso0, paso1])
+                seg['t'] = np.append(ts[a:b], t_fin - seg['t0'])
+                seg['x'] = np.append(xs[a:b], x_fin)
+                seg['y'] = np.append(ys[a:b], y_fin)
+            else:
+                seg['t'] = np.array([0.0, t_fin - seg['t0']])
+                seg['x'] = np.array([x_ini, x_fin])
+                seg['y'] = np.array([y_ini, y_fin])
+    return resultados
+
+
+def imprime_resumen(resultados, puntos_iniciales, w=PARAMETROS['w']):
+    """Imprime los segmentos con el mismo formato que el bucle de SImodel.py."""
+    for idx, (res, (x0, y0)) in enumerate(zip(resultados, puntos_iniciales)):
+        print(f"\n--- Trayectoria {idx+1} desde ({x0:.2f}, {y0:.2f}) ---")
+        cruces = iter(res['cruces'])
+        for seg in res['segmentos']:
+            if seg['sistema'] == 'deslizamiento':
+                print(f"    Deslizamiento integrado con {len(seg['x'])} puntos, tiempo final {seg['t'][-1]:.3f}")
+                if seg['evento'] is not None:
+                    print(f"    Se alcanzó {seg['evento']} en x = {seg['x'][-1]:.6f}")
+                continue
+            print(f"  Switch: Posición ({seg['x'][0]:.4f}, {seg['y'][0]:.4f})")
+            print(f"    -> Usando Sistema {seg['sistema']} (y {'<' if seg['sistema'] == 1 else '>'} {w})")
+            print(f"    -> Segmento con {len(seg['x'])} puntos")
+            if seg['evento'] == 'cruce':
+                c = next(cruces)
+                print(f"  Cruce detectado en ({c['x']:.6f}, {c['y']:.6f})")
+                print(f"    f1_2(y=w) = {c['f1y']:.6e}, f2_2(y=w) = {c['f2y']:.6e}, l = {c['l']:.6e} ({c['tipo']})")
+        print(f"  Fin: {res['motivo']}, punto final ({res['final'][1]:.6f}, {res['final'][2]:.6f})")
+
+
+if __name__ == "__main__":
+    # Comparación contra el bucle punto por punto (mismas reglas de SImodel.py)
+    p = PARAMETROS
+    w = p['w']
+    t1x, t2x = puntos_tangentes(p)
+
+    def sistema(t, V, k):
+        f1x, f1y, f2x, f2y = campos(V[0], V[1], p)
+        return [f1x, f1y] if k == 1 else [f2x, f2y]
+
+    def evento_arriba(t, V, k):
+        return V[1] - w
+    evento_arriba.terminal = True
+    evento_arriba.direction = 1
+
+    def evento_abajo(t, V, k):
+        return V[1] - w
+    evento_abajo.terminal = True
+    evento_abajo.direction = -1
+
+    def llegada_T1(t, V):
+        return V[0] - t1x
+    llegada_T1.terminal = True
+
+    def llegada_T2(t, V):
+        return V[0] - t2x
+    llegada_T2.terminal = True
+
+    def por_punto(x0, y0, tiempo_max=50, max_switches=8, eps=1e-6):
+        x_actual, y_actual = x0, y0
+        for switch_count in range(max_switches):
+            k = 1 if y_actual < w else 2
+            sol = solve_ivp(sistema, [0, tiempo_max], [x_actual, y_actual], args=(k,),
+                            events=evento_arriba if k == 1 else evento_abajo, max_step=0.01)
+            x_actual, y_actual = sol.y[0][-1], sol.y[1][-1]
+            if sol.t_events[0].size == 0:
+                break
+            l, f1y, f2y = calcular_L(x_actual, p)
+            if l > 0:
+                y_actual = w + eps if k == 1 else w - eps
+            elif l < 0:
+                sl = solve_ivp(lambda t, X: [campos(X[0], w, p)[0]], [0, 50], [x_actual],
+                               events=[llegada_T1, llegada_T2], max_step=0.01)
+                x_actual = sl.y[0][-1]
+                y_actual = w + eps if calcular_L(x_actual, p)[1] > 0 else w - eps
+            else:
+                y_actual = w + eps if (f2y if abs(f1y) < abs(f2y) else f1y) > 0 else w - eps
+            if not (0 <= x_actual <= 1 and 0 <= y_actual <= 1):
+                break
+        return x_actual, y_actual
+
+    puntos_iniciales = [(0.55, 0.4), (0.3, 0.4), (0.1, 0.5), (0.95, 0.28)]
+    res = simula_lote(puntos_iniciales, p)
+    imprime_resumen(res, puntos_iniciales)
+
+    rng = np.random.default_rng(0)
+    n_ref = 10
+    n_lote = 2000
+    ci = rng.uniform([0.05, 0.05], [0.95, 0.95], size=(n_lote, 2))
+
+    inicio = time.perf_counter()
+    finales = [por_punto(x0, y0) for x0, y0 in ci[:n_ref]]
+    t_ref = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    res = simula_lote(ci, p, guardar=False)
+    t_lote = time.perf_counter() - inicio
+
+    dif = max(np.hypot(res[j]['final'][1] - finales[j][0], res[j]['final'][2] - finales[j][1])
+              for j in range(n_ref))
+    print(f"\nPunto por punto: {n_ref/t_ref:10.1f} trayectorias/s")
+    print(f"Por lotes:       {n_lote/t_lote:10.1f} trayectorias/s")
+    print(f"Aceleración: {(n_lote/t_lote)/(n_ref/t_ref):.1f}x, diferencia máxima en el punto final: {dif:.2e}")
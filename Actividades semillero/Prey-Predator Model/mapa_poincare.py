@@ -0,0 +1,188 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+from functools import lru_cache
+import time
+from simulacion_paralela import (PARAMETROS, sistema1, sistema2, dxdt_1d, puntos_tangentes,
+                                 evento_yw_arriba, evento_yw_abajo, evento_llegada_T1, evento_llegada_T2)
+
+"""Mapa de retorno de Poincaré sobre la frontera y = w del modelo presa-depredador.
+
+La sección es Σ = {(x, w) : x > T1}: los puntos donde una órbita de f1 llega a y = w
+desde abajo (f1_y > 0). Si el punto está en el segmento deslizante T1 < x < T2 la
+órbita se desliza sobre la frontera hasta salir por T1 (vuelve a bajar con f1) o por
+T2 (sube con f2); si x > T2 cruza hacia arriba, sigue f2 y vuelve a y = w, donde cae
+en el segmento deslizante o cruza hacia abajo (x < T1). El mapa P(x) es el siguiente
+punto donde la órbita vuelve a llegar a y = w desde abajo. Un ciclo deslizante que
+sale por T1 da el mismo P(x) para todo un intervalo de x, así que su multiplicador
+es 0 (ciclo superestable).
+
+Cada evaluación de P son unas pocas integraciones cortas (con eventos localizados por
+solve_ivp) y se guarda en caché, de modo que el método de la secante sobre P(x) - x
+encuentra órbitas periódicas y sus multiplicadores sin simular transitorios largos.
+Se supone la estructura de los parámetros por defecto: 0 < T1 < T2 (d > 0, E > 0)."""
+
+# tolerancias de las integraciones del mapa
+RTOL = 1e-10
+ATOL = 1e-12
+
+
+def _segmento(sistema, x, p, evento, tiempo_max):
+    # sigue un campo desde (x, w) hasta el evento; None si no vuelve a y = w
+    sol = solve_ivp(sistema, [0, tiempo_max], [x, p['w']], method='DOP853', events=evento,
+                    args=(p,), rtol=RTOL, atol=ATOL)
+    if sol.t_events[0].size == 0:
+        return None, sol.t[-1]
+    return sol.y_events[0][0][0], sol.t_events[0][0]
+
+
+def _desliza(x, p, tiempo_max):
+    # sobre el segmento deslizante x' = f1_x(x, w) hasta T1 o T2; None si se queda en un pseudo-equilibrio
+    sol = solve_ivp(dxdt_1d, [0, tiempo_max], [x], method='DOP853',
+                    events=[evento_llegada_T1, evento_llegada_T2], args=(p,), rtol=RTOL, atol=ATOL)
+    if sol.t_events[0].size > 0:
+        return 'T1', sol.t_events[0][0]
+    if sol.t_events[1].size > 0:
+        return 'T2', sol.t_events[1][0]
+    return None, sol.t[-1]
+
+
+def recorrido(x, p=None, tiempo_max=50, max_segmentos=20):
+    """Sigue la órbita desde (x, w) en Σ hasta que vuelve a llegar a y = w desde abajo.
+
+    Devuelve un diccionario con el punto de retorno 'x' (None si no vuelve), el tiempo
+    de vuelo 'tiempo', la lista de 'fases' recorridas ('arriba', 'abajo', 'desliza')
+    y el 'motivo' ('retorno', 'sin_retorno', 'pseudo_equilibrio', 'ciclo_deslizante')."""
+    p = PARAMETROS if p is None else p
+    t1x, t2x = puntos_tangentes(p)
+    fase = 'arriba' if x > t2x else 'desliza'
+    x_actual, tiempo = x, 0.0
+    fases = []
+    salidas_T2 = 0
+    for _ in range(max_segmentos):
+        fases.append(fase)
+        if fase == 'arriba':
+            x_actual, dt = _segmento(sistema2, x_actual, p, evento_yw_abajo, tiempo_max)
+            tiempo += dt
+            if x_actual is None:
+                return {'x': None, 'tiempo': tiempo, 'fases': fases, 'motivo': 'sin_retorno'}
+            fase = 'abajo' if x_actual < t1x else 'desliza'
+        elif fase == 'abajo':
+            x_actual, dt = _segmento(sistema1, x_actual, p, evento_yw_arriba, tiempo_max)
+            tiempo += dt
+            if x_actual is None:
+                return {'x': None, 'tiempo': tiempo, 'fases': fases, 'motivo': 'sin_retorno'}
+            return {'x': x_actual, 'tiempo': tiempo, 'fases': fases, 'motivo': 'retorno'}
+        else:
+            salida, dt = _desliza(x_actual, p, tiempo_max)
+            tiempo += dt
+            if salida is None:
+                return {'x': None, 'tiempo': tiempo, 'fases': fases, 'motivo': 'pseudo_equilibrio'}
+            if salida == 'T1':
+                fase, x_actual = 'abajo', t1x
+            else:
+                # T2 -> arriba -> desliza -> T2 otra vez sin bajar: ciclo deslizante por encima
+                salidas_T2 += 1
+                if salidas_T2 > 1:
+                    return {'x': None, 'tiempo': tiempo, 'fases': fases, 'motivo': 'ciclo_deslizante'}
+                fase, x_actual = 'arriba', t2x
+    return {'x': None, 'tiempo': tiempo, 'fases': fases, 'motivo': 'sin_retorno'}
+
+
+@lru_cache(maxsize=4096)
+def _recorrido_cacheado(x, parametros, tiempo_max):
+    return recorrido(x, dict(parametros), tiempo_max)
+
+
+def mapa_retorno(x, p=None, tiempo_max=50):
+    """P(x): siguiente punto de Σ después de (x, w), con caché; nan si la órbita no vuelve."""
+    p = PARAMETROS if p is None else p
+    res = _recorrido_cacheado(float(x), tuple(sorted(p.items())), tiempo_max)
+    return np.nan if res['x'] is None else res['x']
+
+
+def tiempo_retorno(x, p=None, tiempo_max=50):
+    """Tiempo de vuelo de (x, w) hasta P(x) (usa la misma caché que mapa_retorno)."""
+    p = PARAMETROS if p is None else p
+    return _recorrido_cacheado(float(x), tuple(sorted(p.items())), tiempo_max)['tiempo']
+
+
+def derivada_mapa(x, p=None, h=1e-6, tiempo_max=50):
+    """P'(x) por diferencias centradas (hacia adelante si x - h sale de Σ)."""
+    p = PARAMETROS if p is None else p
+    t1x = puntos_tangentes(p)[0]
+    if x - h <= t1x:
+        return (mapa_retorno(x + h, p, tiempo_max) - mapa_retorno(x, p, tiempo_max))/h
+    return (mapa_retorno(x + h, p, tiempo_max) - mapa_retorno(x - h, p, tiempo_max))/(2*h)
+
+
+def busca_orbita_periodica(x0, p=None, tol=1e-10, max_iter=50, h=1e-6, tiempo_max=50):
+    """Punto fijo de P por el método de la secante sobre F(x) = P(x) - x.
+
+    Devuelve un diccionario con el punto 'x' en Σ, el 'periodo', el 'multiplicador' P'(x),
+    si es 'estable' (|P'| < 1), el 'tipo' ('cruce' o 'deslizante') y las 'iteraciones';
+    None si la secante no converge o la órbita deja de volver a Σ."""
+    p = PARAMETROS if p is None else p
+    t1x = puntos_tangentes(p)[0]
+    F = lambda x: mapa_retorno(x, p, tiempo_max) - x
+    x_prev, x_act = x0, x0 + 1e-3
+    F_prev, F_act = F(x_prev), F(x_act)
+    for k in range(1, max_iter + 1):
+        if np.isnan(F_prev) or np.isnan(F_act):
+            return None
+        if abs(F_act) < tol:
+            break
+        if F_act == F_prev:
+            return None
+        x_sig = max(x_act - F_act*(x_act - x_prev)/(F_act - F_prev), t1x + h)
+        x_prev, F_prev = x_act, F_act
+        x_act, F_act = x_sig, F(x_sig)
+    else:
+        return None
+    res = _recorrido_cacheado(float(x_act), tuple(sorted(p.items())), tiempo_max)
+    multiplicador = derivada_mapa(x_act, p, h, tiempo_max)
+    return {'x': x_act, 'periodo': res['tiempo'], 'multiplicador': multiplicador,
+            'estable': abs(multiplicador) < 1, 'tipo': 'deslizante' if 'desliza' in res['fases'] else 'cruce',
+            'iteraciones': k}
+
+
+def busca_orbitas(p=None, x_max=1.2, n_semillas=40, tiempo_max=50):
+    """Muestrea P sobre Σ = (T1, x_max] y lanza la secante desde cada cambio de signo de P(x) - x."""
+    p = PARAMETROS if p is None else p
+    t1x = puntos_tangentes(p)[0]
+    xs = np.linspace(t1x, x_max, n_semillas + 1)[1:]
+    F = np.array([mapa_retorno(x, p, tiempo_max) for x in xs]) - xs
+    orbitas = []
+    for i in range(len(xs) - 1):
+        if np.isnan(F[i]) or np.isnan(F[i + 1]) or np.sign(F[i]) == np.sign(F[i + 1]) and F[i] != 0:
+            continue
+        orbita = busca_orbita_periodica(xs[i], p, tiempo_max=tiempo_max)
+        if orbita is not None and not any(abs(orbita['x'] - o['x']) < 1e-7 for o in orbitas):
+            orbitas.append(orbita)
+    return orbitas
+
+
+if __name__ == "__main__":
+    p = dict(PARAMETROS)
+    t1x, t2x = puntos_tangentes(p)
+    print(f"T1 = {t1x:.6f}, T2 = {t2x:.6f}")
+
+    for x in [0.2, 0.5, t2x + 0.01, 1.0, 1.1]:
+        res = recorrido(x, p)
+        print(f"P({x:.4f}) = {mapa_retorno(x, p):.8f}  tiempo {res['tiempo']:.3f}  "
+              f"fases {'-'.join(res['fases'])}  ({res['motivo']})")
+
+    # parámetros por defecto (ciclo deslizante) y un caso con E y w menores (ciclo de cruce)
+    for p in [dict(PARAMETROS), dict(PARAMETROS, E=0.05, w=0.8)]:
+        _recorrido_cacheado.cache_clear()
+        inicio = time.perf_counter()
+        orbitas = busca_orbitas(p)
+        print(f"\nE = {p['E']}, w = {p['w']}: {time.perf_counter() - inicio:.2f} s, "
+              f"{_recorrido_cacheado.cache_info().currsize} evaluaciones de P")
+        for o in orbitas:
+            print(f"  x* = {o['x']:.10f}  periodo = {o['periodo']:.6f}  multiplicador = {o['multiplicador']:.3e}  "
+                  f"{'estable' if o['estable'] else 'inestable'}  ({o['tipo']}, {o['iteraciones']} iteraciones)")
+        # comprobación: iterar P desde otro punto converge al mismo ciclo
+        x = 1.0
+        for _ in range(8):
+            x = mapa_retorno(x, p)
+        print(f"  P^8(1.0) = {x:.10f}")
@@ -1,6 +1,8 @@
 import numpy as np
-from scipy.integrate import solve_ivp
+from scipy.integrate import solve_ivp, DOP853
 import matplotlib.pyplot as plt
+import os
+import sys
 
 #ventana
 ax=-1.5
@@ -17,6 +19,45 @@ b = 0.33
 d = 0.0444
 E = 0.2067  
 
+# modo de integración de los segmentos:
+# False -> solve_ivp con max_step=0.01
+# True  -> pasos adaptativos completos; el cruce con y = w y la llegada a T1/T2 se
+#          localizan sobre la salida densa con tolerancia tol_evento (eventos_densos.py)
+integracion_densa = False
+tol_evento = 1e-10
+# tolerancias del modo denso: hace falta DOP853 con rtol = 1e-13 para igualar la
+# precisión del camino con max_step=0.01 (comparacion_eventos.py)
+metodo_densa = DOP853
+rtol_densa = 1e-13
+atol_densa = 1e-16
+
+# integrador_jit = True -> cada segmento lo integra el bucle RK4 compilado de
+# filippov_jit.py (paso dt_jit; sin numba cae en solve_ivp con max_step=dt_jit)
+integrador_jit = False
+dt_jit = 0.01
+
+# True: las líneas de flujo de las dos regiones salen de una sola pasada de lineas_flujo.py
+# (Código en Python) sobre una malla común; False: dos plt.streamplot, uno por región
+lineas_propias = False
+
+# True: n_rapidas cruces seguidos que casi no avanzan en el tiempo (chattering) se
+# resuelven con una sola integración del modelo regularizado (deslizamiento.py)
+detecta_chattering = False
+
+# los módulos de apoyo solo se cargan con su opción activa
+if integracion_densa or integrador_jit or detecta_chattering:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if integracion_densa:
+        from eventos_densos import integra_eventos_densos
+    if integrador_jit:
+        import filippov_jit
+    if detecta_chattering:
+        from deslizamiento import nuevo_detector, es_chattering, registra_chattering, integra_regularizado
+if lineas_propias:
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                 'Código en Python'))
+    from lineas_flujo import lineas_flujo, dibuja_lineas_flujo
+
 # sistema 1 
 def sistema1(t, V): #V es el vector de variables dependientes
     x, y = V
@@ -101,11 +142,25 @@ evento_llegada_T2.direction = 0
 
 # Simulación del sistema 1
 def simula_sistema1(x0, y0, tiempo_max):
+    if integrador_jit:
+        return filippov_jit.simula_segmento('PP', filippov_jit.SISTEMA1, x0, y0, tiempo_max,
+                                            p=(a, b, d, E), w=w, dt=dt_jit)
+    if integracion_densa:
+        return integra_eventos_densos(sistema1, [0, tiempo_max], [x0, y0], events=evento_yw_arriba,
+                                      tol_evento=tol_evento, puntos_por_paso=4,
+                                      rtol=rtol_densa, atol=atol_densa, metodo=metodo_densa)
     sol = solve_ivp(sistema1, [0, tiempo_max], [x0, y0], events=evento_yw_arriba, max_step=0.01)
     return sol
 
 # Simulación del sistema 2
 def simula_sistema2(x0, y0, tiempo_max):
+    if integrador_jit:
+        return filippov_jit.simula_segmento('PP', filippov_jit.SISTEMA2, x0, y0, tiempo_max,
+                                            p=(a, b, d, E), w=w, dt=dt_jit)
+    if integracion_densa:
+        return integra_eventos_densos(sistema2, [0, tiempo_max], [x0, y0], events=evento_yw_abajo,
+                                      tol_evento=tol_evento, puntos_por_paso=4,
+                                      rtol=rtol_densa, atol=atol_densa, metodo=metodo_densa)
     sol = solve_ivp(sistema2, [0, tiempo_max], [x0, y0], events=evento_yw_abajo, max_step=0.01)
     return sol
 
@@ -121,6 +176,14 @@ def integra_deslizamiento(x0, tiempo_max, w_local=None):
     w_arg = w_local if w_local is not None else w  # Elige el valor de w que se usará dentro de la integración
     """dxdt_1d: función que calcula dx/dt. Debe tener firma (t, x, w) para recibir el arg adicional.
     args=(w_arg,): argumentos extra que se pasan a dxdt_1d y a las funciones evento; aquí fija y = w_arg."""
+    if integrador_jit:
+        return filippov_jit.simula_segmento('PP', filippov_jit.DESLIZAMIENTO, x0, w_arg, tiempo_max,
+                                            p=(a, b, d, E), w=w_arg, dt=dt_jit)
+    if integracion_densa:
+        return integra_eventos_densos(dxdt_1d, [0, tiempo_max], [x0], args=(w_arg,),
+                                      events=[evento_llegada_T1, evento_llegada_T2],
+                                      tol_evento=tol_evento, puntos_por_paso=4,
+                                      rtol=rtol_densa, atol=atol_densa, metodo=metodo_densa)
     sol = solve_ivp(dxdt_1d, [0, tiempo_max], [x0],
                     args=(w_arg,),
                     events=[evento_llegada_T1, evento_llegada_T2],
@@ -149,6 +212,22 @@ N2 = np.sqrt(U2**2 + V2**2)
 N2 = np.where(N2 == 0, 1, N2)  # Evitar división por cero
 U2, V2 = U2/N2, V2/N2  # Normalizar 
 
+if lineas_propias:
+    # malla común: abajo de w el sistema 1, arriba el 2, y las líneas no cruzan y = w
+    XL, YL = np.meshgrid(np.linspace(ax, bx, 20), np.linspace(ay, by, 40))
+    abajo = YL < w
+    lineas = lineas_flujo(XL[0], YL[:, 0], np.where(abajo, f1_x(XL, YL), f2_x(XL, YL)),
+                          np.where(abajo, f1_y(XL, YL), f2_y(XL, YL)), densidad=1.2, regiones=(~abajo).astype(int))
+
+
+def dibuja_campo():
+    if lineas_propias:
+        dibuja_lineas_flujo(plt.gca(), [l for l in lineas if l[:, 1].mean() < w], color='red')
+        dibuja_lineas_flujo(plt.gca(), [l for l in lineas if l[:, 1].mean() >= w], color='blue')
+    else:
+        plt.streamplot(X1, Y1, U1, V1, color='red', linewidth=0.6, density=1.2)
+        plt.streamplot(X2, Y2, U2, V2, color='blue', linewidth=0.6, density=1.2)
+
 # Parámetro de simulación
 tiempo_max = 100
 
@@ -162,13 +241,19 @@ puntos_iniciales = [
     
 ]
 plt.figure(figsize=(10, 8))
-plt.streamplot(X1, Y1, U1, V1, color='red', linewidth=0.6, density=1.2)
-plt.streamplot(X2, Y2, U2, V2, color='blue', linewidth=0.6, density=1.2)
+dibuja_campo()
 
 
 n_cruces = 0  # Contador de cruces de frontera para esta trayectoria
+# Detector de chattering: n_rapidas cruces seguidos que avanzan menos de umbral_progreso
+# en el tiempo se resuelven con una sola integración del modelo regularizado
+if detecta_chattering:
+    detector = nuevo_detector(umbral_progreso=1e-3, n_rapidas=3)
+
 for idx, (x0, y0) in enumerate(puntos_iniciales):
     print(f"\n--- Trayectoria {idx+1} desde ({x0:.2f}, {y0:.2f}) ---")
+    if detecta_chattering:
+        detector['avances'] = []
     
     x_actual, y_actual = x0, y0
     tiempo_max = 50
@@ -253,7 +338,19 @@ for idx, (x0, y0) in enumerate(puntos_iniciales):
                 else:
                     y_actual = y_actual + eps"""
                     
-            if l > 0:
+            # Caso 0: chattering -> varios cruces seguidos casi sin avanzar en el tiempo.
+            # En vez de reiniciar solve_ivp en cada cruce se integra una sola vez el modelo
+            # regularizado hasta que la trayectoria se aleja de y = w.
+            if detecta_chattering and es_chattering(detector, sol.t[-1]):
+                print("    Chattering detectado -> Integro el modelo regularizado cerca de y = w.")
+                sol_reg = integra_regularizado(sistema1, sistema2, lambda t, V: V[1] - w,
+                                               [x_actual, y_actual], [0, tiempo_max])
+                plt.plot(sol_reg.y[0], sol_reg.y[1], color='orange', linewidth=4, alpha=0.9)
+                evitados = registra_chattering(detector, sol_reg.t[-1])
+                print(f"    Regularizado hasta t = {sol_reg.t[-1]:.3f}, reinicios evitados ≈ {evitados}")
+                x_actual, y_actual = sol_reg.y[0][-1], sol_reg.y[1][-1]
+
+            elif l > 0:
                 print("    l > 0  -> Cruce. Continuamos en la otra región.")
                 eps = 1e-6
                 if sistema_actual == 1:
@@ -357,11 +454,12 @@ for idx, (x0, y0) in enumerate(puntos_iniciales):
         
 
 print(f"\n=== SIMULACIÓN COMPLETADA ===")
+if detecta_chattering:
+    print(f"Chattering: {detector['detecciones']} detecciones, ≈ {detector['reinicios_evitados']} reinicios evitados")
 
 # Graficar
 #plt.figure(figsize=(10, 8)) 
-plt.streamplot(X1, Y1, U1, V1, color='red', linewidth=0.6, density=1.2)
-plt.streamplot(X2, Y2, U2, V2, color='blue', linewidth=0.6, density=1.2)
+dibuja_campo()
 plt.plot([ax, t1x], [w, w], color='black', linestyle='--', linewidth=2)
 plt.plot([t1x, t2x], [w, w], color='black', linestyle='-', linewidth=2)
 plt.plot([t2x, bx], [w, w], color='black', linestyle='--', linewidth=2, label=f'Frontera y = {w}')
@@ -0,0 +1,253 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
+import time
+
+"""Simulación del modelo presa-depredador de Filippov sin gráficas.
+
+El bucle de conmutación de modelP_P.py se reescribe como una función de solo
+cálculo: recibe una condición inicial y los parámetros (a, b, d, E, w) y
+devuelve los segmentos de trayectoria y los registros de cruce. Como cada
+condición inicial es independiente, simula_trayectorias reparte la lista de
+puntos iniciales en bloques entre procesos con ProcessPoolExecutor; las
+gráficas se hacen después en el proceso principal con grafica_resultados."""
+
+# parametros por defecto (los mismos de modelP_P.py)
+PARAMETROS = {'a': 0.3556, 'b': 0.33, 'd': 0.0444, 'E': 0.2067, 'w': 1.625}
+
+#ventana
+VENTANA = (-1.5, 1.2, 0, 2) # (ax, bx, ay, by)
+
+
+def f1_x(x, y, p):
+    return x*(1-x) - (p['a']*x*y)/(p['b']+x)
+
+def f1_y(x, y, p):
+    return (p['a']*x*y)/(p['b']+x) - p['d']*y
+
+def f2_x(x, y, p):
+    return x*(1-x) - (p['a']*x*y)/(p['b']+x)
+
+def f2_y(x, y, p):
+    return (p['a']*x*y)/(p['b']+x) - p['d']*y - p['E']*y
+
+
+def sistema1(t, V, p):
+    x, y = V
+    return [f1_x(x, y, p), f1_y(x, y, p)]
+
+def sistema2(t, V, p):
+    x, y = V
+    return [f2_x(x, y, p), f2_y(x, y, p)]
+
+
+def calcular_L(x, p):
+    """ℓ = ⟨∇H, f⁽¹⁾⟩ * ⟨∇H, f⁽²⁾⟩ con H = y - w, entonces ℓ = f1_y(x,w) * f2_y(x,w)."""
+    f1y = f1_y(x, p['w'], p)
+    f2y = f2_y(x, p['w'], p)
+    return f1y*f2y, f1y, f2y
+
+
+def puntos_tangentes(p):
+    """Abscisas de T1 (f1_y = 0) y T2 (f2_y = 0) sobre y = w."""
+    a, b, d, E = p['a'], p['b'], p['d'], p['E']
+    return b*d/(a - d), b*(d + E)/(a - d - E)
+
+
+# funciones de eventos (los parámetros llegan por args, igual que w en integra_deslizamiento)
+def evento_yw_arriba(t, V, p):
+    return V[1] - p['w']
+evento_yw_arriba.terminal = True
+evento_yw_arriba.direction = 1  # Solo cuando cruza hacia arriba
+
+def evento_yw_abajo(t, V, p):
+    return V[1] - p['w']
+evento_yw_abajo.terminal = True
+evento_yw_abajo.direction = -1  # Solo cuando cruza hacia abajo
+
+def evento_llegada_T1(t, x, p):
+    return x[0] - puntos_tangentes(p)[0]
+evento_llegada_T1.terminal = True
+
+def evento_llegada_T2(t, x, p):
+    return x[0] - puntos_tangentes(p)[1]
+evento_llegada_T2.terminal = True
+
+def dxdt_1d(t, x, p):
+    return [f1_x(x[0], p['w'], p)] # f1_x == f2_x, usar y = w en la frontera
+
+
+def simula_trayectoria(punto_inicial, p=None, ventana=VENTANA, tiempo_max=50,
+                       max_switches=8, eps=1e-6):
+    """Bucle de conmutación de modelP_P.py para una condición inicial, sin gráficas.
+
+    Devuelve un diccionario con:
+      'inicio':    (x0, y0)
+      'segmentos': lista de {'sistema': 1 | 2 | 'deslizamiento', 't', 'x', 'y', 'evento'}
+      'cruces':    lista de {'x', 'y', 'l', 'f1y', 'f2y', 'tipo'} con tipo
+                   'cruce' (ℓ > 0), 'deslizamiento' (ℓ < 0) o 'tangente' (ℓ == 0)
+      'tangentes': lista de ('T1' | 'T2', x) alcanzados al final de un deslizamiento
+      'motivo':    'sin_cruce', 'max_switches', 'fuera_ventana' o 'sin_puntos'
+    """
+    p = PARAMETROS if p is None else p
+    w = p['w']
+    ax, bx, ay, by = ventana
+    x_actual, y_actual = punto_inicial
+    res = {'inicio': (x_actual, y_actual), 'segmentos': [], 'cruces': [],
+           'tangentes': [], 'motivo': 'max_switches'}
+
+    for switch_count in range(max_switches):
+        if y_actual < w:
+            sistema_actual = 1
+            sol = solve_ivp(sistema1, [0, tiempo_max], [x_actual, y_actual], args=(p,),
+                            events=evento_yw_arriba, max_step=0.01)
+        else:
+            sistema_actual = 2
+            sol = solve_ivp(sistema2, [0, tiempo_max], [x_actual, y_actual], args=(p,),
+                            events=evento_yw_abajo, max_step=0.01)
+
+        # Verificar que la simulación produjo resultados
+        if len(sol.y[0]) <= 1:
+            res['motivo'] = 'sin_puntos'
+            break
+
+        hubo_cruce = sol.t_events[0].size > 0
+        res['segmentos'].append({'sistema': sistema_actual, 't': sol.t, 'x': sol.y[0],
+                                 'y': sol.y[1], 'evento': 'cruce' if hubo_cruce else None})
+        if not hubo_cruce:
+            res['motivo'] = 'sin_cruce'
+            break
+
+        x_actual, y_actual = sol.y[0][-1], sol.y[1][-1]
+        l, f1y, f2y = calcular_L(x_actual, p)
+        registro = {'x': x_actual, 'y': y_actual, 'l': l, 'f1y': f1y, 'f2y': f2y}
+        res['cruces'].append(registro)
+
+        if l > 0:
+            # Caso 1: cruce, continuar en la otra región
+            registro['tipo'] = 'cruce'
+            y_actual = w + eps if sistema_actual == 1 else w - eps
+        elif l < 0:
+            # Caso 2: deslizamiento sobre y = w
+            registro['tipo'] = 'deslizamiento'
+            sol_slide = solve_ivp(dxdt_1d, [0, 50], [x_actual], args=(p,),
+                                  events=[evento_llegada_T1, evento_llegada_T2], max_step=0.01)
+            if sol_slide.t_events[0].size > 0:
+                x_fin, evento = sol_slide.y_events[0][0][0], 'T1'
+            elif sol_slide.t_events[1].size > 0:
+                x_fin, evento = sol_slide.y_events[1][0][0], 'T2'
+            else:
+                x_fin, evento = sol_slide.y[0][-1], None
+            res['segmentos'].append({'sistema': 'deslizamiento', 't': sol_slide.t,
+                                     'x': sol_slide.y[0], 'y': np.full(len(sol_slide.t), w),
+                                     'evento': evento})
+            x_actual = x_fin
+            l_fin, f1y_fin, f2y_fin = calcular_L(x_fin, p)
+            tol = 1e-8
+            if abs(f1y_fin) < tol:
+                res['tangentes'].append(('T1', x_fin))
+            if abs(f2y_fin) < tol:
+                res['tangentes'].append(('T2', x_fin))
+            # empujón fuera de la frontera según el signo de f1_2(x_fin)
+            y_actual = w + eps if f1y_fin > 0 else w - eps
+        else:
+            # Caso 3: tangencia, empujar según el signo de la otra proyección
+            registro['tipo'] = 'tangente'
+            otra = f2y if abs(f1y) < abs(f2y) else f1y
+            y_actual = w + eps if otra > 0 else w - eps
+
+        # si salimos de ventana, terminamos
+        if x_actual < ax or x_actual > bx or y_actual < ay or y_actual > by:
+            res['motivo'] = 'fuera_ventana'
+            break
+
+    if res['motivo'] == 'sin_cruce':
+        x_actual, y_actual = res['segmentos'][-1]['x'][-1], res['segmentos'][-1]['y'][-1]
+    res['final'] = (x_actual, y_actual)
+    return res
+
+
+def simula_trayectorias(puntos_iniciales, p=None, procesos=None, tam_bloque=None, **opciones):
+    """Simula cada condición inicial en un proceso distinto y devuelve los resultados en orden.
+
+    procesos:   número de procesos (por defecto os.cpu_count()); con 1 se simula en serie.
+    tam_bloque: cuántos puntos recibe cada tarea; por defecto se reparten ~4 bloques por proceso
+                para equilibrar la carga sin pagar la comunicación punto por punto.
+    opciones:   se pasan a simula_trayectoria (ventana, tiempo_max, max_switches, eps).
+    """
+    p = dict(PARAMETROS if p is None else p)
+    puntos = [tuple(pt) for pt in puntos_iniciales]
+    procesos = procesos or os.cpu_count() or 1
+    tarea = partial(simula_trayectoria, p=p, **opciones)
+    if procesos == 1 or len(puntos) <= 1:
+        return [tarea(pt) for pt in puntos]
+    if tam_bloque is None:
+        tam_bloque = max(1, len(puntos) // (4*procesos))
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        return list(ejecutor.map(tarea, puntos, chunksize=tam_bloque))
+
+
+def grafica_resultados(resultados, p=None, ventana=VENTANA):
+    """Dibuja en el proceso principal los segmentos calculados por simula_trayectorias."""
+    import matplotlib.pyplot as plt
+    p = PARAMETROS if p is None else p
+    w = p['w']
+    ax, bx, ay, by = ventana
+    t1x, t2x = puntos_tangentes(p)
+    colores = {1: 'darkred', 2: 'darkblue', 'deslizamiento': 'orange'}
+    nombres = {1: 'Sistema 1', 2: 'Sistema 2', 'deslizamiento': 'Deslizamiento'}
+    usados = set()
+
+    plt.figure(figsize=(10, 8))
+    for idx, res in enumerate(resultados):
+        x0, y0 = res['inicio']
+        plt.scatter(x0, y0, color='black', s=30, zorder=5)
+        for seg in res['segmentos']:
+            s = seg['sistema']
+            plt.plot(seg['x'], seg['y'], color=colores[s], linewidth=4 if s == 'deslizamiento' else 1.5,
+                     alpha=0.8, label=nombres[s] if s not in usados else "")
+            usados.add(s)
+        for c in res['cruces']:
+            plt.scatter(c['x'], c['y'], color='purple', s=30, zorder=7)
+    plt.plot([ax, t1x], [w, w], color='black', linestyle='--', linewidth=2)
+    plt.plot([t1x, t2x], [w, w], color='black', linestyle='-', linewidth=2)
+    plt.plot([t2x, bx], [w, w], color='black', linestyle='--', linewidth=2, label=f'Frontera y = {w}')
+    plt.scatter([t1x, t2x], [w, w], color='green', s=140, zorder=3)
+    plt.text(t1x, w, 'T1', color='green', fontsize=10, ha='center', va='bottom')
+    plt.text(t2x, w, 'T2', color='green', fontsize=10, ha='center', va='bottom')
+    plt.xlim(ax, bx)
+    plt.ylim(ay, by)
+    plt.xlabel('Prey Population')
+    plt.ylabel('Predator Population')
+    plt.title('Prey-Predator Model with Filippov Dynamics')
+    plt.legend(loc='upper right')
+    plt.grid()
+
+
+if __name__ == "__main__":
+    # Atlas de retrato de fase: malla de condiciones iniciales en la ventana
+    ax, bx, ay, by = VENTANA
+    X, Y = np.meshgrid(np.linspace(0.05, bx - 0.05, 6), np.linspace(ay + 0.1, by - 0.1, 6))
+    puntos_iniciales = np.column_stack([X.ravel(), Y.ravel()])
+
+    inicio = time.perf_counter()
+    serie = simula_trayectorias(puntos_iniciales[:8], procesos=1)
+    t_serie = (time.perf_counter() - inicio)/8
+
+    inicio = time.perf_counter()
+    resultados = simula_trayectorias(puntos_iniciales)
+    t_paralelo = (time.perf_counter() - inicio)/len(puntos_iniciales)
+
+    print(f"Procesos: {os.cpu_count()}")
+    print(f"En serie:   {t_serie*1e3:8.1f} ms por trayectoria")
+    print(f"En paralelo: {t_paralelo*1e3:7.1f} ms por trayectoria ({t_serie/t_paralelo:.1f}x)")
+    cuenta = {}
+    for res in resultados:
+        cuenta[res['motivo']] = cuenta.get(res['motivo'], 0) + 1
+    print("Motivos de término:", cuenta)
+
+    import matplotlib.pyplot as plt
+    grafica_resultados(resultados)
+    plt.show()
@@ -0,0 +1,205 @@
+import numpy as np
+import time
+
+"""Atlas de la frontera y = w para mallas de parámetros, sin integrar trayectorias.
+
+En los dos modelos de Filippov (Modelo SI/SImodel.py y Prey-Predator Model/modelP_P.py)
+el signo de f1_y y f2_y sobre y = w depende de x solo a través de una función creciente
+g(x), y cada componente se anula en un nivel de g:
+
+    SI:   f1_y = (mu+theta)*w*(g - 1),            f2_y = (mu+theta)*w*(g - c2),   g = R0*x,
+          c2 = 1 + u/((mu+theta)*w)
+    P-P:  f1_y = w*(g - d),                        f2_y = w*(g - d - E),           g = a*x/(b+x)
+
+así que T1 = g⁻¹(nivel de f1), T2 = g⁻¹(nivel de f2), y entre ambos ℓ = f1_y*f2_y < 0
+(deslizamiento atractivo si f1_y > 0 > f2_y, repulsivo o de escape si f1_y < 0 < f2_y);
+fuera del segmento hay cruce. Como f1_x = f2_x en ambos modelos, el campo deslizante
+de Filippov sobre y = w es x' = f1_x(x, w) y los pseudo-equilibrios son sus raíces.
+
+Todas las funciones reciben arreglos de NumPy (o escalares) con broadcasting, de modo
+que un plano de parámetros de millones de puntos se evalúa en segundos."""
+
+# códigos de visibilidad de los puntos tangentes
+NO_EXISTE = 0
+VISIBLE = 1
+INVISIBLE = -1
+
+
+def _particion(inv_1, inv_2, atractivo, xmin, xmax):
+    """Fracciones de la ventana [xmin, xmax] sobre y = w en cruce, deslizamiento y escape."""
+    izq = np.clip(np.fmin(inv_1, inv_2), xmin, xmax)
+    der = np.clip(np.maximum(inv_1, inv_2), xmin, xmax)
+    # si solo existe un punto tangente, el segmento llega hasta el borde derecho
+    der = np.where(np.isnan(der), xmax, der)
+    izq = np.where(np.isnan(izq), xmax, izq)
+    fraccion = (der - izq)/(xmax - xmin)
+    deslizante = np.where(atractivo, fraccion, 0.0)
+    escape = np.where(atractivo, 0.0, fraccion)
+    return izq, der, 1.0 - deslizante - escape, deslizante, escape
+
+
+def _visibilidad(tx, signo_L2, region):
+    """Pliegue visible o invisible según el signo de L²_f H = (∂f_y/∂x)*f_x en T.
+
+    region = -1 para el campo de abajo (H < 0) y +1 para el de arriba (H > 0):
+    el pliegue es visible si la órbita tangente se queda en su propia región."""
+    codigo = np.where(signo_L2*region > 0, VISIBLE, INVISIBLE)
+    return np.where(np.isfinite(tx) & (signo_L2 != 0), codigo, NO_EXISTE)
+
+
+def atlas_si(R0, mu, theta, u, w, ventana=(0, 1)):
+    """Atlas del modelo SI para arreglos de (R0, mu, theta, u, w).
+
+    Devuelve un diccionario de arreglos con la forma del broadcasting de los parámetros:
+    t1x, t2x, inicio/fin del segmento deslizante dentro de la ventana, fracciones de la
+    ventana en cruce/deslizamiento/escape, visibilidad de T1/T2, pseudo-equilibrio (nan
+    si no cae en el segmento) y su estabilidad sobre la frontera; estos dos últimos con
+    una capa en el eje 0, como en atlas_pp."""
+    R0, mu, theta, u, w = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (R0, mu, theta, u, w)])
+    k = mu + theta
+    with np.errstate(divide='ignore', invalid='ignore'):
+        c2 = 1 + u/(k*w)
+        t1x = 1/R0
+        t2x = c2/R0
+        # f1_y > 0 entre T1 y T2 si el nivel de f2 está por encima del de f1
+        atractivo = c2 > 1
+        izq, der, cruce, deslizante, escape = _particion(t1x, t2x, atractivo, *ventana)
+
+        # L²H en T = (∂f_y/∂x)*f_x con ∂f_y/∂x = k*w*R0 > 0
+        f_x = lambda x: mu*(1 - x) - k*R0*x*w
+        vis_t1 = _visibilidad(t1x, np.sign(f_x(t1x)), -1)
+        vis_t2 = _visibilidad(t2x, np.sign(f_x(t2x)), 1)
+
+        # campo deslizante x' = mu*(1 - x) - k*R0*w*x: un solo cero, con derivada
+        # -(mu + k*R0*w) < 0, así que siempre es estable sobre la frontera
+        xp = mu/(mu + k*R0*w)
+        en_segmento = (deslizante > 0) & (xp > izq) & (xp < der)
+        pseudo_x = np.where(en_segmento, xp, np.nan)
+        pseudo_estable = en_segmento
+
+    return {'t1x': t1x, 't2x': t2x, 'inicio': izq, 'fin': der,
+            'cruce': cruce, 'deslizante': deslizante, 'escape': escape,
+            'visibilidad_T1': vis_t1, 'visibilidad_T2': vis_t2,
+            'pseudo_x': pseudo_x[np.newaxis], 'pseudo_estable': pseudo_estable[np.newaxis]}
+
+
+def atlas_pp(a, b, d, E, w, ventana=(-1.5, 1.2)):
+    """Atlas del modelo presa-depredador para arreglos de (a, b, d, E, w).
+
+    Mismas salidas que atlas_si, pero pseudo_x y pseudo_estable tienen siempre tres capas
+    en el eje 0: x = 0 y las dos raíces de la cuadrática (nan donde no hay pseudo-equilibrio).
+    Solo se considera x > -b, donde el término de Holling a*x/(b+x) es creciente."""
+    a, b, d, E, w = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (a, b, d, E, w)])
+    xmin = np.maximum(ventana[0], -b)
+    xmax = ventana[1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # g⁻¹(c) = b*c/(a - c); si c >= a el nivel no se alcanza (g < a)
+        inversa = lambda c: np.where(c < a, b*c/(a - c), np.nan)
+        t1x = inversa(d)
+        t2x = inversa(d + E)
+        atractivo = E > 0
+        izq, der, cruce, deslizante, escape = _particion(t1x, t2x, atractivo, xmin, xmax)
+        # si ninguno de los niveles se alcanza no hay segmento
+        ninguno = np.isnan(t1x) & np.isnan(t2x)
+        izq = np.where(ninguno, np.nan, izq)
+        der = np.where(ninguno, np.nan, der)
+        cruce = np.where(ninguno, 1.0, cruce)
+        deslizante = np.where(ninguno, 0.0, deslizante)
+        escape = np.where(ninguno, 0.0, escape)
+
+        # ∂f_y/∂x = a*b*w/(b+x)² > 0
+        f_x = lambda x: x*(1 - x) - a*x*w/(b + x)
+        vis_t1 = _visibilidad(t1x, np.sign(f_x(t1x)), -1)
+        vis_t2 = _visibilidad(t2x, np.sign(f_x(t2x)), 1)
+
+        # ceros de x' = x*(1 - x) - a*w*x/(b + x): x = 0 y las raíces de
+        # x² - (1 - b)*x - (b - a*w) = 0
+        disc = (1 - b)**2 + 4*(b - a*w)
+        raiz = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        candidatos = np.stack([np.zeros_like(a), ((1 - b) + raiz)/2, ((1 - b) - raiz)/2])
+        en_segmento = (deslizante > 0) & (candidatos > izq) & (candidatos < der)
+        pseudo_x = np.where(en_segmento, candidatos, np.nan)
+        derivada = 1 - 2*candidatos - a*w*b/(b + candidatos)**2
+        # x = 0 solo está en el segmento si T1 < 0 (no pasa con d > 0), pero la capa se
+        # conserva para que la forma de la salida no dependa de los datos
+        pseudo_estable = en_segmento & (derivada < 0)
+
+    return {'t1x': t1x, 't2x': t2x, 'inicio': izq, 'fin': der,
+            'cruce': cruce, 'deslizante': deslizante, 'escape': escape,
+            'visibilidad_T1': vis_t1, 'visibilidad_T2': vis_t2,
+            'pseudo_x': pseudo_x, 'pseudo_estable': pseudo_estable}
+
+
+def atlas_plano(atlas, fijos, nombre_x, valores_x, nombre_y, valores_y, claves=None, filas_por_bloque=256,
+                **opciones):
+    """Evalúa atlas sobre el plano (valores_x, valores_y) por bloques de filas.
+
+    fijos:  diccionario con el resto de parámetros (escalares).
+    claves: salidas que se guardan (por defecto todas); las que tienen capas (pseudo_x,
+            pseudo_estable) quedan de forma (capas, len(valores_y), len(valores_x)).
+    Evaluar por bloques mantiene la memoria acotada en resoluciones como 3840x2160."""
+    valores_x = np.asarray(valores_x, dtype=float)
+    valores_y = np.asarray(valores_y, dtype=float)
+    salida = {}
+    for inicio in range(0, len(valores_y), filas_por_bloque):
+        filas = valores_y[inicio:inicio + filas_por_bloque]
+        p = dict(fijos)
+        p[nombre_x] = valores_x[np.newaxis, :]
+        p[nombre_y] = filas[:, np.newaxis]
+        bloque = atlas(**p, **opciones)
+        if not salida:
+            claves = claves or list(bloque)
+            for c in claves:
+                salida[c] = np.empty((*bloque[c].shape[:-2], len(valores_y), len(valores_x)), dtype=bloque[c].dtype)
+        for c in claves:
+            salida[c][..., inicio:inicio + len(filas), :] = bloque[c]
+    return salida
+
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    # un punto: los mismos T1/T2 que imprimen los scripts
+    uno = atlas_pp(0.3556, 0.33, 0.0444, 0.2067, 1.625)
+    print(f"P-P: T1 = {float(uno['t1x']):.6f}, T2 = {float(uno['t2x']):.6f}, "
+          f"pseudo-equilibrios = {uno['pseudo_x'][~np.isnan(uno['pseudo_x'])]}")
+    uno = atlas_si(1.5, 0.2, 0.15, 0.1, 0.3)
+    print(f"SI:  T1 = {float(uno['t1x']):.6f}, T2 = {float(uno['t2x']):.6f}, "
+          f"pseudo-equilibrio = {uno['pseudo_x'][~np.isnan(uno['pseudo_x'])]}")
+
+    # plano (a, E) del modelo presa-depredador a resolución 4K
+    ancho, alto = 3840, 2160
+    fijos = {'b': 0.33, 'd': 0.0444, 'w': 1.625}
+    valores_a = np.linspace(0.05, 1.0, ancho)
+    valores_E = np.linspace(0.0, 0.6, alto)
+    inicio = time.perf_counter()
+    plano = atlas_plano(atlas_pp, fijos, 'a', valores_a, 'E', valores_E,
+                        claves=['deslizante', 'visibilidad_T1', 'visibilidad_T2'])
+    print(f"\nPlano (a, E) de {ancho}x{alto} = {ancho*alto} puntos: {time.perf_counter() - inicio:.2f} s")
+
+    # plano (R0, u) del modelo SI
+    fijos = {'mu': 0.2, 'theta': 0.15, 'w': 0.3}
+    valores_R0 = np.linspace(0.5, 4.0, ancho)
+    valores_u = np.linspace(0.0, 0.3, alto)
+    inicio = time.perf_counter()
+    plano_si = atlas_plano(atlas_si, fijos, 'R0', valores_R0, 'u', valores_u, claves=['deslizante'])
+    print(f"Plano (R0, u) de {ancho}x{alto} = {ancho*alto} puntos: {time.perf_counter() - inicio:.2f} s")
+
+    fig, ejes = plt.subplots(1, 2, figsize=(14, 5))
+    extension = [valores_a[0], valores_a[-1], valores_E[0], valores_E[-1]]
+    im = ejes[0].imshow(plano['deslizante'], origin='lower', extent=extension, aspect='auto', cmap='viridis')
+    ejes[0].contour(valores_a, valores_E, plano['visibilidad_T2'], levels=[0], colors='white', linewidths=0.8)
+    ejes[0].plot(0.3556, 0.2067, 'r*', markersize=12)
+    ejes[0].set_xlabel('a')
+    ejes[0].set_ylabel('E')
+    ejes[0].set_title('P-P: fracción deslizante de y = w')
+    fig.colorbar(im, ax=ejes[0])
+    extension = [valores_R0[0], valores_R0[-1], valores_u[0], valores_u[-1]]
+    im = ejes[1].imshow(plano_si['deslizante'], origin='lower', extent=extension, aspect='auto', cmap='viridis')
+    ejes[1].plot(1.5, 0.1, 'r*', markersize=12)
+    ejes[1].set_xlabel('R0')
+    ejes[1].set_ylabel('u')
+    ejes[1].set_title('SI: fracción deslizante de y = w')
+    fig.colorbar(im, ax=ejes[1])
+    plt.tight_layout()
+    plt.show()
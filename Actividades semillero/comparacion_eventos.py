@@ -0,0 +1,99 @@
+import numpy as np
+from scipy.integrate import solve_ivp, RK45, DOP853
+import time
+from eventos_densos import integra_eventos_densos
+
+"""Comparación: max_step=0.01 contra pasos adaptativos con eventos sobre la salida densa.
+
+Para varias condiciones iniciales de los modelos SI y presa-depredador se integra
+hasta el primer cruce con y = w (tiempo máximo 50, como en los scripts) y se mide
+el número de evaluaciones del campo (nfev), el tiempo y el error del punto de cruce
+contra una solución de referencia (DOP853 con rtol=1e-13). Para el modo denso se
+elige el rtol más holgado cuyo error no supera al de max_step=0.01, de modo que
+ambos se comparan con la misma precisión en el cruce."""
+
+# modelo SI (Modelo SI/SImodel.py)
+R0, mu, theta, u = 1.5, 0.2, 0.15, 0.1
+def si_1(t, V):
+    x, y = V
+    return [mu*(1-x) - (mu+theta)*R0*x*y, (mu+theta)*y*(R0*x - 1)]
+
+def si_2(t, V):
+    x, y = V
+    return [mu*(1-x) - (mu+theta)*R0*x*y, (mu+theta)*y*(R0*x - 1) - u]
+
+# modelo presa-depredador (Prey-Predator Model/modelP_P.py)
+a, b, d, E = 0.3556, 0.33, 0.0444, 0.2067
+def pp_1(t, V):
+    x, y = V
+    return [x*(1-x) - (a*x*y)/(b+x), (a*x*y)/(b+x) - d*y]
+
+def pp_2(t, V):
+    x, y = V
+    return [x*(1-x) - (a*x*y)/(b+x), (a*x*y)/(b+x) - d*y - E*y]
+
+
+def crea_evento(w, direccion):
+    def evento(t, V):
+        return V[1] - w
+    evento.terminal = True
+    evento.direction = direccion
+    return evento
+
+# (nombre, campo, w, condición inicial, dirección del cruce)
+casos = [
+    ('SI  sistema 2', si_2, 0.3, (0.55, 0.4), -1),
+    ('SI  sistema 2', si_2, 0.3, (0.1, 0.5), -1),
+    ('SI  sistema 1', si_1, 0.3, (0.95, 0.28), 1),
+    ('P-P sistema 1', pp_1, 1.625, (0.5, 0.3), 1),
+    ('P-P sistema 2', pp_2, 1.625, (1.15, 1.9), -1),
+]
+
+
+def cronometra(funcion, repeticiones=3):
+    mejor = np.inf
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        sol = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return sol, mejor
+
+
+print(f"{'caso':15s} {'modo':22s} {'nfev':>7s} {'tiempo [ms]':>12s} {'error cruce':>12s}")
+total = {'max_step': [0, 0.0], 'denso': [0, 0.0]}
+for nombre, campo, w, v0, direccion in casos:
+    evento = crea_evento(w, direccion)
+    ref = solve_ivp(campo, [0, 50], v0, method='DOP853', events=evento, rtol=1e-13, atol=1e-15)
+    if ref.t_events[0].size == 0:
+        continue
+    punto_ref = ref.y_events[0][0]
+
+    sol, t_fijo = cronometra(lambda: solve_ivp(campo, [0, 50], v0, events=evento, max_step=0.01))
+    err_fijo = np.max(np.abs(sol.y_events[0][0] - punto_ref))
+    print(f"{nombre:15s} {'max_step=0.01':22s} {sol.nfev:7d} {t_fijo*1e3:12.2f} {err_fijo:12.2e}")
+    total['max_step'][0] += sol.nfev
+    total['max_step'][1] += t_fijo
+
+    # el más barato (en nfev) de los que alcanzan la precisión de max_step=0.01
+    elegido = None
+    for metodo in [RK45, DOP853]:
+        for rtol in [1e-6, 1e-8, 1e-10, 1e-12, 1e-13]:
+            sol = integra_eventos_densos(campo, [0, 50], v0, events=evento, rtol=rtol,
+                                         atol=rtol*1e-3, metodo=metodo, tol_evento=1e-14)
+            err = np.max(np.abs(sol.y_events[0][0] - punto_ref))
+            if err <= max(err_fijo, 1e-14):
+                if elegido is None or sol.nfev < elegido[2]:
+                    elegido = (metodo, rtol, sol.nfev, err)
+                break
+    metodo, rtol, _, err = elegido
+    sol, t_denso = cronometra(lambda: integra_eventos_densos(campo, [0, 50], v0, events=evento, rtol=rtol,
+                                                             atol=rtol*1e-3, metodo=metodo, tol_evento=1e-14))
+    modo = f'denso {metodo.__name__} {rtol:.0e}'
+    print(f"{'':15s} {modo:22s} {sol.nfev:7d} {t_denso*1e3:12.2f} {err:12.2e}")
+    total['denso'][0] += sol.nfev
+    total['denso'][1] += t_denso
+
+print(f"\nTotal max_step=0.01: {total['max_step'][0]:7d} evaluaciones, {total['max_step'][1]*1e3:8.2f} ms")
+print(f"Total denso:         {total['denso'][0]:7d} evaluaciones, {total['denso'][1]*1e3:8.2f} ms")
+print(f"Reducción: {total['max_step'][0]/total['denso'][0]:.1f}x en evaluaciones, "
+      f"{total['max_step'][1]/total['denso'][1]:.1f}x en tiempo")
@@ -0,0 +1,239 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
+import time
+from atlas_deslizamiento import atlas_si, atlas_pp
+
+"""Mapa de cuencas de atracción de los sistemas de Filippov sobre una malla de condiciones iniciales.
+
+SImodel.py y modelP_P.py siguen de 1 a 4 condiciones iniciales escogidas a mano. Aquí
+toda una malla de la ventana [ax, bx] x [ay, by] se integra a la vez con RK4 de paso
+fijo vectorizado en NumPy, con la misma lógica de conmutación de los scripts: cada punto
+está en sistema 1 (y < w), sistema 2 (y > w) o deslizando sobre y = w, y al cruzar la
+frontera se decide con ℓ si cruza o empieza a deslizar. Cada punto se saca del lote en
+cuanto su destino queda decidido:
+
+    EQ1:    llega a un equilibrio de f1 que está por debajo de y = w
+    EQ2:    llega a un equilibrio de f2 que está por encima de y = w
+    PSEUDO: llega a un pseudo-equilibrio del segmento deslizante
+    CICLO:  dos llegadas consecutivas a y = w desde abajo caen en el mismo punto
+            (ciclo de cruce o ciclo deslizante)
+    FUERA:  sale de la ventana
+    OTRO:   nada de lo anterior antes de tiempo_max
+
+La malla se reparte por bloques de filas entre procesos con ProcessPoolExecutor."""
+
+# destinos
+OTRO = 0
+EQ1 = 1
+EQ2 = 2
+PSEUDO = 3
+CICLO = 4
+FUERA = 5
+NOMBRES_DESTINOS = ['otro', 'eq1', 'eq2', 'pseudo', 'ciclo', 'fuera']
+
+# modos, como en los scripts
+SISTEMA1 = 1
+SISTEMA2 = 2
+DESLIZAMIENTO = 3
+
+
+def campos_si(x, y, p):
+    f1x = p['mu']*(1-x) - (p['mu']+p['theta'])*p['R0']*x*y
+    f1y = (p['mu']+p['theta'])*y*(p['R0']*x - 1)
+    return f1x, f1y, f1x, f1y - p['u']
+
+
+def campos_pp(x, y, p):
+    f1x = x*(1-x) - (p['a']*x*y)/(p['b']+x)
+    f1y = (p['a']*x*y)/(p['b']+x) - p['d']*y
+    return f1x, f1y, f1x, f1y - p['E']*y
+
+
+def equilibrios_si(p):
+    """Equilibrios de f1 y de f2 (fórmulas de SImodel.py)."""
+    R0, mu, theta, u = p['R0'], p['mu'], p['theta'], p['u']
+    eq1 = [(1.0, 0.0), (1/R0, mu*(R0 - 1)/((mu + theta)*R0))]
+    a = mu*R0
+    b = -(mu + mu*R0 - u*R0)
+    discriminante = b**2 - 4*a*mu
+    eq2 = []
+    if discriminante >= 0:
+        for xe in ((-b + np.sqrt(discriminante))/(2*a), (-b - np.sqrt(discriminante))/(2*a)):
+            eq2.append((xe, (mu*(1 - xe) - u)/(mu + theta)))
+    return eq1, eq2
+
+
+def equilibrios_pp(p):
+    """Equilibrios de f1 y de f2: (0, 0), (1, 0) y el de coexistencia de cada campo."""
+    a, b = p['a'], p['b']
+    eq = []
+    for muerte in (p['d'], p['d'] + p['E']):
+        lista = [(0.0, 0.0), (1.0, 0.0)]
+        if muerte < a:
+            xe = b*muerte/(a - muerte)
+            lista.append((xe, (1 - xe)*(b + xe)/a))
+        eq.append(lista)
+    return eq[0], eq[1]
+
+
+MODELOS = {
+    'SI': {'campos': campos_si, 'equilibrios': equilibrios_si, 'atlas': atlas_si,
+           'p': {'R0': 1.5, 'mu': 0.2, 'theta': 0.15, 'u': 0.1, 'w': 0.3},
+           'ventana': (0, 1, 0, 1)},
+    'PP': {'campos': campos_pp, 'equilibrios': equilibrios_pp, 'atlas': atlas_pp,
+           'p': {'a': 0.3556, 'b': 0.33, 'd': 0.0444, 'E': 0.2067, 'w': 1.625},
+           'ventana': (-1.5, 1.2, 0, 2)},
+}
+
+
+def _campo(campos, x, y, modo, p):
+    # campo de cada punto según su modo; en deslizamiento, combinación de Filippov con dy/dt = 0
+    f1x, f1y, f2x, f2y = campos(x, y, p)
+    den = f1y - f2y
+    alfa = np.divide(f1y, den, out=np.zeros_like(den), where=den != 0)
+    fx = np.where(modo == SISTEMA1, f1x, np.where(modo == SISTEMA2, f2x, (1 - alfa)*f1x + alfa*f2x))
+    fy = np.where(modo == SISTEMA1, f1y, np.where(modo == SISTEMA2, f2y, 0.0))
+    return fx, fy
+
+
+def destinos_lote(x0, y0, modelo='SI', p=None, ventana=None, tiempo_max=200, dt=0.02,
+                  tol_equilibrio=1e-3, tol_ciclo=1e-4):
+    """Destino de cada condición inicial (x0[i], y0[i]); devuelve un arreglo de enteros (EQ1, ..., OTRO)."""
+    m = MODELOS[modelo]
+    p = m['p'] if p is None else p
+    ax, bx, ay, by = m['ventana'] if ventana is None else ventana
+    campos, w = m['campos'], p['w']
+    eq1, eq2 = m['equilibrios'](p)
+    eq1 = np.array([e for e in eq1 if e[1] < w]).reshape(-1, 2)
+    eq2 = np.array([e for e in eq2 if e[1] > w]).reshape(-1, 2)
+    atlas = m['atlas'](**p)
+    pseudo = atlas['pseudo_x'][~np.isnan(atlas['pseudo_x'])]
+
+    x = np.asarray(x0, dtype=float).ravel().copy()
+    y = np.asarray(y0, dtype=float).ravel().copy()
+    destino = np.full(x.size, OTRO, dtype=np.int8)
+    # índices de los puntos que siguen activos; los arreglos de estado solo guardan esos
+    indices = np.arange(x.size)
+    modo = np.where(y > w, SISTEMA2, SISTEMA1)
+    llegada = np.full(x.size, np.nan)
+
+    with np.errstate(all='ignore'):
+        for _ in range(int(round(tiempo_max/dt))):
+            if indices.size == 0:
+                break
+            # RK4 con el campo del modo actual
+            k1x, k1y = _campo(campos, x, y, modo, p)
+            k2x, k2y = _campo(campos, x + 0.5*dt*k1x, y + 0.5*dt*k1y, modo, p)
+            k3x, k3y = _campo(campos, x + 0.5*dt*k2x, y + 0.5*dt*k2y, modo, p)
+            k4x, k4y = _campo(campos, x + dt*k3x, y + dt*k3y, modo, p)
+            x1 = x + dt/6*(k1x + 2*k2x + 2*k3x + k4x)
+            y1 = y + dt/6*(k1y + 2*k2y + 2*k3y + k4y)
+
+            # cruces de y = w: punto de cruce por interpolación lineal dentro del paso
+            cruza = ((modo == SISTEMA1) & (y1 > w)) | ((modo == SISTEMA2) & (y1 < w))
+            s = np.where(cruza, (w - y)/(y1 - y), 0.0)
+            x1 = np.where(cruza, x + s*(x1 - x), x1)
+            y1 = np.where(cruza, w, y1)
+            _, f1y, _, f2y = campos(x1, np.full_like(x1, w), p)
+            deslizante = f1y*f2y < 0
+            nueva_llegada = cruza & (modo == SISTEMA1)
+            nuevo_modo = np.where(cruza & deslizante, DESLIZAMIENTO,
+                                  np.where(cruza, np.where(modo == SISTEMA1, SISTEMA2, SISTEMA1), modo))
+            # fin del deslizamiento: baja si f1_y < 0, sube si f2_y > 0
+            sale = (modo == DESLIZAMIENTO) & ~deslizante
+            nuevo_modo = np.where(sale, np.where(f1y <= 0, SISTEMA1, SISTEMA2), nuevo_modo)
+            x, y, modo = x1, y1, nuevo_modo
+
+            # destinos decididos en este paso
+            decidido = np.full(x.size, OTRO, dtype=np.int8)
+            repite = nueva_llegada & (np.abs(x - llegada) < tol_ciclo)
+            decidido[repite] = CICLO
+            llegada = np.where(nueva_llegada, x, llegada)
+            for xe, ye in eq1:
+                decidido[(modo == SISTEMA1) & (np.hypot(x - xe, y - ye) < tol_equilibrio)] = EQ1
+            for xe, ye in eq2:
+                decidido[(modo == SISTEMA2) & (np.hypot(x - xe, y - ye) < tol_equilibrio)] = EQ2
+            for xe in pseudo:
+                decidido[(modo == DESLIZAMIENTO) & (np.abs(x - xe) < tol_equilibrio)] = PSEUDO
+            fuera = ~((x >= ax) & (x <= bx) & (y >= ay) & (y <= by))  # también atrapa nan
+            decidido[fuera] = FUERA
+
+            terminados = decidido != OTRO
+            if terminados.any():
+                destino[indices[terminados]] = decidido[terminados]
+                sigue = ~terminados
+                indices, x, y, modo, llegada = indices[sigue], x[sigue], y[sigue], modo[sigue], llegada[sigue]
+    return destino
+
+
+def _bloque(filas, xs, modelo, opciones):
+    X, Y = np.meshgrid(xs, filas)
+    return destinos_lote(X, Y, modelo, **opciones).reshape(X.shape)
+
+
+def mapa_cuencas(modelo='SI', resolucion=(400, 400), p=None, ventana=None, procesos=None,
+                 filas_por_bloque=None, **opciones):
+    """Etiqueta de destino de cada celda de una malla resolucion = (nx, ny) sobre la ventana.
+
+    Devuelve (xs, ys, etiquetas) con etiquetas[j, i] el destino de (xs[i], ys[j]).
+    opciones se pasan a destinos_lote (tiempo_max, dt, tol_equilibrio, tol_ciclo)."""
+    m = MODELOS[modelo]
+    ax, bx, ay, by = m['ventana'] if ventana is None else ventana
+    nx, ny = resolucion
+    xs = np.linspace(ax, bx, nx)
+    ys = np.linspace(ay, by, ny)
+    procesos = procesos or os.cpu_count() or 1
+    if filas_por_bloque is None:
+        # unos 4 bloques por proceso para repartir bien filas rápidas y lentas
+        filas_por_bloque = max(1, ny//(4*procesos))
+    bloques = [ys[i:i + filas_por_bloque] for i in range(0, ny, filas_por_bloque)]
+    opciones = dict(opciones, p=p, ventana=(ax, bx, ay, by))
+    trabajo = partial(_bloque, xs=xs, modelo=modelo, opciones=opciones)
+    if procesos == 1:
+        etiquetas = [trabajo(b) for b in bloques]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            etiquetas = list(ejecutor.map(trabajo, bloques))
+    return xs, ys, np.vstack(etiquetas)
+
+
+def grafica_cuencas(xs, ys, etiquetas, modelo='SI', p=None, ax_plot=None):
+    """Dibuja el mapa de cuencas con la frontera y = w y los puntos T1, T2."""
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+    m = MODELOS[modelo]
+    p = m['p'] if p is None else p
+    colores = ListedColormap(['lightgray', 'tab:red', 'tab:blue', 'tab:green', 'gold', 'white'])
+    if ax_plot is None:
+        ax_plot = plt.gca()
+    ax_plot.imshow(etiquetas, origin='lower', extent=[xs[0], xs[-1], ys[0], ys[-1]], aspect='auto',
+                   cmap=colores, vmin=-0.5, vmax=5.5, interpolation='nearest')
+    atlas = m['atlas'](**p)
+    ax_plot.axhline(p['w'], color='black', linestyle='--', linewidth=1)
+    ax_plot.scatter([float(atlas['t1x']), float(atlas['t2x'])], [p['w'], p['w']], color='black', zorder=3)
+    for destino, nombre in enumerate(NOMBRES_DESTINOS):
+        ax_plot.scatter([], [], color=colores(destino), marker='s', label=nombre)
+    ax_plot.legend(loc='upper right', fontsize=8)
+    ax_plot.set_xlabel('x')
+    ax_plot.set_ylabel('y')
+
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    resolucion = (200, 200)
+    fig, ejes = plt.subplots(1, 2, figsize=(14, 6))
+    for eje, modelo in zip(ejes, ['SI', 'PP']):
+        inicio = time.perf_counter()
+        xs, ys, etiquetas = mapa_cuencas(modelo, resolucion)
+        duracion = time.perf_counter() - inicio
+        conteo = np.bincount(etiquetas.ravel(), minlength=len(NOMBRES_DESTINOS))
+        print(f"{modelo}: {etiquetas.size} condiciones iniciales en {duracion:.1f} s "
+              f"({etiquetas.size/duracion:.0f} por segundo, {os.cpu_count()} núcleos)")
+        print("   " + ", ".join(f"{n}: {c}" for n, c in zip(NOMBRES_DESTINOS, conteo)))
+        grafica_cuencas(xs, ys, etiquetas, modelo, ax_plot=eje)
+        eje.set_title(f'Cuencas de atracción, modelo {modelo}')
+    plt.tight_layout()
+    plt.show()
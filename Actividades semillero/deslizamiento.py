@@ -0,0 +1,233 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+
+"""Motor general de deslizamiento de Filippov (método de Utkin) para cualquier superficie H(x) = 0.
+
+integra_deslizamiento de SImodel.py y modelP_P.py solo funciona porque f1_x == f2_x
+y la frontera es la recta H = y - w (calcular_L supone ∇H = (0, 1)); al terminar
+cada deslizamiento se reinicia la integración en 2D con un empujón eps = 1e-6.
+Aquí se recibe f1, f2, H y ∇H, y sobre la superficie se integra el campo de Filippov
+
+    f_s = (1 - α) f1 + α f2,   α = ⟨∇H, f1⟩ / (⟨∇H, f1⟩ - ⟨∇H, f2⟩),
+
+de forma continua hasta que ℓ = ⟨∇H, f1⟩⟨∇H, f2⟩ llega a 0 (punto tangente), sin
+reinicios ni empujones. Los campos usan la firma de solve_ivp, f(t, V), y pueden
+recibir V con forma (n,) o (n, k) (varios puntos a la vez)."""
+
+
+def proyecciones(f1, f2, grad_H, t, V):
+    """⟨∇H, f1⟩ y ⟨∇H, f2⟩ en V (vectorizado sobre las columnas de V)."""
+    g = np.asarray(grad_H(t, V), dtype=float)
+    F1 = np.asarray(f1(t, V), dtype=float)
+    F2 = np.asarray(f2(t, V), dtype=float)
+    return np.sum(g*F1, axis=0), np.sum(g*F2, axis=0), g, F1, F2
+
+
+def calcular_L(f1, f2, grad_H, V, t=0.0):
+    """ℓ = ⟨∇H, f⁽¹⁾⟩ * ⟨∇H, f⁽²⁾⟩ para cualquier superficie (generaliza calcular_L de los scripts)."""
+    a, b, _, _, _ = proyecciones(f1, f2, grad_H, t, V)
+    return a*b, a, b
+
+
+def campo_deslizante(f1, f2, grad_H, H=None, estabilizacion=1.0):
+    """Devuelve f_s(t, V), el campo de Filippov sobre H = 0, vectorizado.
+
+    estabilizacion: si se da H, se añade -k H ∇H/|∇H|² para que los errores de
+    redondeo no alejen la solución de la superficie (no cambia nada sobre H = 0)."""
+    def f_s(t, V):
+        a, b, g, F1, F2 = proyecciones(f1, f2, grad_H, t, V)
+        den = a - b
+        den = np.where(den == 0, 1, den) # Evitar división por cero
+        alfa = a/den
+        F = (1 - alfa)*F1 + alfa*F2
+        if H is not None and estabilizacion:
+            F = F - estabilizacion*np.asarray(H(t, V))*g/np.sum(g*g, axis=0)
+        return F
+    return f_s
+
+
+def integra_deslizamiento_general(f1, f2, H, grad_H, V0, t_span, rtol=1e-8, atol=1e-10,
+                                  estabilizacion=1.0, **opciones):
+    """Integra el deslizamiento desde V0 (sobre H = 0) hasta una tangencia o hasta t_span[1].
+
+    Devuelve (sol, salida) donde sol es el resultado de solve_ivp y salida es:
+      1 -> f1 se volvió tangente (⟨∇H, f1⟩ = 0): la trayectoria sigue con f1 en H < 0
+      2 -> f2 se volvió tangente (⟨∇H, f2⟩ = 0): la trayectoria sigue con f2 en H > 0
+      None -> se acabó el tiempo sobre la superficie (p. ej. pseudo-equilibrio)
+    """
+    f_s = campo_deslizante(f1, f2, grad_H, H, estabilizacion)
+
+    def fin_deslizamiento(t, V):
+        # ℓ < 0 mientras hay deslizamiento; el segmento termina cuando ℓ llega a 0
+        l, _, _ = calcular_L(f1, f2, grad_H, V, t)
+        return l
+    fin_deslizamiento.terminal = True
+    fin_deslizamiento.direction = 1
+
+    sol = solve_ivp(f_s, t_span, V0, events=fin_deslizamiento, vectorized=True,
+                    rtol=rtol, atol=atol, **opciones)
+    salida = None
+    if sol.t_events[0].size > 0:
+        _, a, b = calcular_L(f1, f2, grad_H, sol.y[:, -1], sol.t[-1])
+        salida = 1 if abs(a) < abs(b) else 2
+    return sol, salida
+
+
+def nuevo_detector(umbral_progreso=1e-3, n_rapidas=3):
+    """Estado del detector de chattering (conmutaciones casi instantáneas seguidas).
+
+    Una conmutación es rápida si el segmento que la produjo avanzó menos de
+    umbral_progreso en el tiempo; con n_rapidas seguidas se declara chattering."""
+    return {'umbral_progreso': umbral_progreso, 'n_rapidas': n_rapidas, 'avances': [],
+            'detecciones': 0, 'reinicios_evitados': 0}
+
+
+def es_chattering(detector, avance):
+    """Registra el avance en el tiempo del último segmento y dice si hay chattering."""
+    if avance >= detector['umbral_progreso']:
+        detector['avances'] = []
+        return False
+    detector['avances'].append(avance)
+    return len(detector['avances']) >= detector['n_rapidas']
+
+
+def registra_chattering(detector, duracion):
+    """Cuenta los reinicios que se habrían hecho durante duracion al ritmo de los cruces rápidos."""
+    avance_medio = max(np.mean(detector['avances']), 1e-12)
+    evitados = int(duracion/avance_medio)
+    detector['detecciones'] += 1
+    detector['reinicios_evitados'] += evitados
+    detector['avances'] = []
+    return evitados
+
+
+def integra_regularizado(f1, f2, H, V0, t_span, delta=1e-5, banda=10, **opciones):
+    """Integra el modelo suavizado f = (1 - σ) f1 + σ f2, σ = (1 + tanh(H/δ))/2.
+
+    Sustituye a la cadena de cruces rápidos cerca de la frontera: se integra una sola
+    vez hasta que |H| = banda*δ (la trayectoria se alejó de H = 0) o hasta t_span[1].
+    Dentro de la banda reproduce el deslizamiento de Filippov cuando δ → 0. Como el
+    problema es rígido dentro de la banda se usa LSODA por defecto."""
+    def campo(t, V):
+        sigma = 0.5*(1 + np.tanh(H(t, V)/delta))
+        return (1 - sigma)*np.asarray(f1(t, V)) + sigma*np.asarray(f2(t, V))
+
+    def sale_banda(t, V):
+        return abs(H(t, V)) - banda*delta
+    sale_banda.terminal = True
+    sale_banda.direction = 1
+
+    opciones.setdefault('method', 'LSODA')
+    opciones.setdefault('rtol', 1e-8)
+    opciones.setdefault('atol', 1e-10)
+    return solve_ivp(campo, t_span, V0, events=sale_banda, **opciones)
+
+
+def simula_filippov(f1, f2, H, grad_H, V0, tiempo_max, max_segmentos=100, rtol=1e-8,
+                    atol=1e-10, detector=None, **opciones):
+    """Encadena segmentos en H < 0 (f1), H > 0 (f2) y sobre H = 0 (deslizamiento).
+
+    El tiempo es continuo entre segmentos (t va de 0 a tiempo_max en total). Cada cruce
+    se continúa desde el punto exacto sobre H = 0: como el evento de cada región solo
+    se activa en la dirección de salida, no hace falta desplazar el punto con eps.
+
+    Si hay varios cruces seguidos que casi no avanzan en el tiempo (chattering cerca de
+    una tangencia, ver nuevo_detector), el tramo se integra una sola vez con el modelo
+    regularizado; el detector acumula cuántos reinicios se evitaron.
+
+    Devuelve una lista de segmentos {'tipo': 1 | 2 | 'deslizamiento' | 'regularizado', 't', 'y', 'nfev'}
+    y una lista de eventos {'t', 'V', 'tipo'} con tipo 'cruce', 'deslizamiento', 'tangente'
+    o 'chattering'.
+    """
+    detector = nuevo_detector() if detector is None else detector
+    V = np.asarray(V0, dtype=float)
+    t = 0.0
+    segmentos = []
+    eventos = []
+
+    def evento_H(t, V):
+        return H(t, V)
+    evento_H.terminal = True
+
+    h0 = H(t, V)
+    if h0 < 0:
+        region = 1
+    elif h0 > 0:
+        region = 2
+    else:
+        l, a, b = calcular_L(f1, f2, grad_H, V, t)
+        region = 'deslizamiento' if l < 0 else (2 if max(a, b) > 0 else 1)
+
+    while t < tiempo_max and len(segmentos) < max_segmentos:
+        if region == 'deslizamiento':
+            sol, salida = integra_deslizamiento_general(f1, f2, H, grad_H, V, [t, tiempo_max],
+                                                        rtol=rtol, atol=atol, **opciones)
+            segmentos.append({'tipo': 'deslizamiento', 't': sol.t, 'y': sol.y, 'nfev': sol.nfev})
+            t, V = sol.t[-1], sol.y[:, -1]
+            if salida is None:
+                break
+            eventos.append({'t': t, 'V': V, 'tipo': 'tangente'})
+            region = salida
+            continue
+
+        campo = f1 if region == 1 else f2
+        evento_H.direction = 1 if region == 1 else -1
+        sol = solve_ivp(campo, [t, tiempo_max], V, events=evento_H, rtol=rtol, atol=atol, **opciones)
+        segmentos.append({'tipo': region, 't': sol.t, 'y': sol.y, 'nfev': sol.nfev})
+        if sol.t_events[0].size == 0:
+            break
+        t_inicio = t
+        t, V = sol.t_events[0][0], sol.y_events[0][0]
+        l, a, b = calcular_L(f1, f2, grad_H, V, t)
+        if l > 0 and es_chattering(detector, t - t_inicio):
+            eventos.append({'t': t, 'V': V, 'tipo': 'chattering'})
+            sol = integra_regularizado(f1, f2, H, V, [t, tiempo_max])
+            segmentos.append({'tipo': 'regularizado', 't': sol.t, 'y': sol.y, 'nfev': sol.nfev})
+            registra_chattering(detector, sol.t[-1] - t)
+            t, V = sol.t[-1], sol.y[:, -1]
+            region = 1 if H(t, V) < 0 else 2
+        elif l > 0:
+            eventos.append({'t': t, 'V': V, 'tipo': 'cruce'})
+            region = 2 if region == 1 else 1
+        elif l < 0:
+            eventos.append({'t': t, 'V': V, 'tipo': 'deslizamiento'})
+            region = 'deslizamiento'
+        else:
+            # tangencia: se sigue hacia donde apunta la proyección no nula
+            eventos.append({'t': t, 'V': V, 'tipo': 'tangente'})
+            otra = b if abs(a) < abs(b) else a
+            region = 2 if otra > 0 else 1
+    return segmentos, eventos
+
+
+if __name__ == "__main__":
+    # Modelo presa-depredador de modelP_P.py con H = y - w (∇H = (0, 1))
+    a, b, d, E = 0.3556, 0.33, 0.0444, 0.2067
+    w = 1.625
+
+    def f1(t, V):
+        x, y = V
+        return np.array([x*(1-x) - (a*x*y)/(b+x), (a*x*y)/(b+x) - d*y])
+
+    def f2(t, V):
+        x, y = V
+        return np.array([x*(1-x) - (a*x*y)/(b+x), (a*x*y)/(b+x) - d*y - E*y])
+
+    H = lambda t, V: V[1] - w
+    grad_H = lambda t, V: np.array([np.zeros_like(V[0]), np.ones_like(V[1])])
+
+    segmentos, eventos = simula_filippov(f1, f2, H, grad_H, [0.5, 0.3], 400)
+    print("Presa-depredador, H = y - w:")
+    for seg in segmentos:
+        print(f"  {str(seg['tipo']):14s} t = [{seg['t'][0]:8.3f}, {seg['t'][-1]:8.3f}]  "
+              f"nfev = {seg['nfev']:5d}  fin = ({seg['y'][0, -1]:.6f}, {seg['y'][1, -1]:.6f})")
+    print(f"  {len(segmentos)} segmentos, {sum(s['nfev'] for s in segmentos)} evaluaciones en total")
+
+    # La misma maquinaria con una superficie curva: la circunferencia (x - 0.5)² + (y - 1)² = 0.6²
+    H = lambda t, V: (V[0] - 0.5)**2 + (V[1] - 1.0)**2 - 0.36
+    grad_H = lambda t, V: np.array([2*(V[0] - 0.5), 2*(V[1] - 1.0)])
+    segmentos, eventos = simula_filippov(f1, f2, H, grad_H, [0.5, 0.3], 400)
+    print("\nPresa-depredador, H = circunferencia:")
+    for seg in segmentos:
+        print(f"  {str(seg['tipo']):14s} t = [{seg['t'][0]:8.3f}, {seg['t'][-1]:8.3f}]  "
+              f"nfev = {seg['nfev']:5d}  |H| final = {abs(H(0, seg['y'][:, -1])):.1e}")
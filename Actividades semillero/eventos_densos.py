@@ -0,0 +1,126 @@
+import numpy as np
+from scipy.integrate import RK45
+from scipy.optimize import brentq, OptimizeResult
+
+"""Integración con pasos adaptativos completos y eventos localizados sobre la salida densa.
+
+En los simuladores de Filippov (SImodel.py y modelP_P.py) se usa max_step=0.01
+solo para no pasarse del cruce con y = w. Aquí el integrador da los pasos que su
+control de error permita y, cuando una función de evento cambia de signo dentro
+de un paso, el instante del evento se busca con brentq sobre el interpolante denso
+de ese paso hasta la tolerancia pedida (tol_evento). El resultado tiene los mismos
+campos que devuelve solve_ivp (t, y, t_events, y_events, nfev, status, ...), así
+que puede usarse en lugar de sol = solve_ivp(...) sin cambiar el resto del código."""
+
+
+def _eventos_activos(g_prev, g_new, direcciones):
+    # mismo criterio que solve_ivp: cambio de signo en la dirección pedida
+    sube = (g_prev <= 0) & (g_new >= 0)
+    baja = (g_prev >= 0) & (g_new <= 0)
+    cualquiera = sube | baja
+    return np.flatnonzero((sube & (direcciones > 0)) | (baja & (direcciones < 0))
+                          | (cualquiera & (direcciones == 0)))
+
+
+def integra_eventos_densos(fun, t_span, y0, events=None, args=(), tol_evento=1e-10,
+                           rtol=1e-6, atol=1e-9, metodo=RK45, muestras_evento=4,
+                           puntos_por_paso=0):
+    """Integra fun(t, y, *args) sin límite de paso y localiza los eventos con brentq.
+
+    events:          función o lista de funciones evento con atributos terminal/direction,
+                     con la misma firma que en solve_ivp (reciben también args).
+    tol_evento:      tolerancia absoluta en t para la raíz de cada evento.
+    rtol, atol:      tolerancias del control de error del integrador.
+    muestras_evento: puntos interiores de cada paso, tomados del interpolante, donde también
+                     se revisa el signo de los eventos.
+    puntos_por_paso: puntos extra por paso tomados del interpolante (solo para graficar,
+                     no cuestan evaluaciones del campo).
+    """
+    if events is None:
+        events = []
+    elif callable(events):
+        events = [events]
+    if args:
+        f = lambda t, y: fun(t, y, *args)
+        eventos = [lambda t, y, e=e: e(t, y, *args) for e in events]
+    else:
+        f = fun
+        eventos = list(events)
+    terminales = np.array([getattr(e, 'terminal', False) for e in events], dtype=bool)
+    direcciones = np.array([getattr(e, 'direction', 0) for e in events], dtype=float)
+
+    t0, tf = t_span
+    solver = metodo(f, t0, np.asarray(y0, dtype=float), tf, rtol=rtol, atol=atol)
+    ts = [t0]
+    ys = [solver.y.copy()]
+    t_events = [[] for _ in eventos]
+    y_events = [[] for _ in eventos]
+    g_prev = np.array([e(t0, solver.y) for e in eventos])
+    status = 0
+    mensaje = 'Se alcanzó el tiempo final.'
+
+    while solver.status == 'running':
+        solver.step()
+        if solver.status == 'failed':
+            status = -1
+            mensaje = 'Falló el integrador.'
+            break
+        t_old, t_new, y_new = solver.t_old, solver.t, solver.y
+        g_new = np.array([e(t_new, y_new) for e in eventos])
+        densa = None
+        t_corte = t_new
+
+        if eventos:
+            # el signo de los eventos también se revisa en puntos interiores del paso
+            # para no perder cruces de ida y vuelta (rozamientos cerca de T1/T2)
+            t_malla = np.linspace(t_old, t_new, muestras_evento + 2)
+            g_malla = [g_prev]
+            if muestras_evento > 0:
+                densa = solver.dense_output()
+                for tk in t_malla[1:-1]:
+                    yk = densa(tk)
+                    g_malla.append(np.array([e(tk, yk) for e in eventos]))
+            g_malla.append(g_new)
+            for k in range(len(t_malla) - 1):
+                activos = _eventos_activos(g_malla[k], g_malla[k + 1], direcciones)
+                if len(activos) == 0:
+                    continue
+                densa = densa if densa is not None else solver.dense_output()
+                raices = []
+                for i in activos:
+                    g = lambda t, i=i: eventos[i](t, densa(t))
+                    raices.append(brentq(g, t_malla[k], t_malla[k + 1], xtol=tol_evento))
+                raices = np.array(raices)
+                orden = np.argsort(raices)
+                activos, raices = activos[orden], raices[orden]
+                # los eventos posteriores al primer evento terminal no ocurren
+                term = np.flatnonzero(terminales[activos])
+                if len(term) > 0:
+                    activos, raices = activos[:term[0] + 1], raices[:term[0] + 1]
+                    t_corte = raices[-1]
+                    status = 1
+                    mensaje = 'Un evento terminal ocurrió.'
+                for i, tr in zip(activos, raices):
+                    t_events[i].append(tr)
+                    y_events[i].append(densa(tr))
+                if status == 1:
+                    break
+
+        if puntos_por_paso > 0:
+            densa = densa if densa is not None else solver.dense_output()
+            t_int = np.linspace(t_old, t_corte, puntos_por_paso + 2)[1:-1]
+            ts.extend(t_int)
+            ys.extend(densa(t_int).T)
+        if status == 1:
+            ts.append(t_corte)
+            ys.append(densa(t_corte))
+            break
+        ts.append(t_new)
+        ys.append(y_new.copy())
+        g_prev = g_new
+
+    return OptimizeResult(t=np.array(ts), y=np.array(ys).T,
+                          t_events=[np.array(te) for te in t_events],
+                          y_events=[np.array(ye).reshape(len(ye), solver.n) for ye in y_events],
+                          nfev=solver.nfev, njev=solver.njev, nlu=solver.nlu,
+                          status=status, message=mensaje, success=status >= 0)
@@ -0,0 +1,307 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.optimize import OptimizeResult
+import time
+
+"""Campos, eventos e integrador compilados (Numba) para los sistemas de Filippov.
+
+sistema1, sistema2, dxdt_1d y las funciones de eventos de SImodel.py y modelP_P.py
+son funciones de Python que devuelven listas y que solve_ivp llama cientos de
+miles de veces por trayectoria. Aquí los campos de ambos modelos se escriben una
+sola vez como funciones escalares compiladas con numba.njit y un bucle RK (RK4 de
+paso fijo o Dormand-Prince adaptativo) compilado integra cada segmento y detecta
+el cruce con y = w o la llegada a T1/T2 sin volver a Python en cada paso.
+
+Si numba no está instalado se usa el camino de Python: las mismas funciones de
+campo (sin compilar) integradas con solve_ivp y max_step=dt, como en los scripts."""
+
+try:
+    from numba import njit
+    HAY_NUMBA = True
+except ImportError:
+    HAY_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # sin numba el decorador no hace nada
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+# modos del segmento: como en los scripts, sistema 1 (y < w), sistema 2 (y > w)
+# y deslizamiento sobre y = w
+SISTEMA1 = 1
+SISTEMA2 = 2
+DESLIZAMIENTO = 3
+
+# eventos que pueden terminar un segmento
+SIN_EVENTO = 0
+CRUCE_W = 1
+LLEGADA_T1 = 2
+LLEGADA_T2 = 3
+
+
+@njit(cache=True)
+def _selecciona(f1x, f1y, f2x, f2y, modo):
+    # campo del modo; en deslizamiento, combinación convexa de Filippov con dy/dt = 0
+    if modo == SISTEMA1:
+        return f1x, f1y
+    if modo == SISTEMA2:
+        return f2x, f2y
+    den = f1y - f2y
+    alfa = f1y/den if den != 0.0 else 0.0
+    return (1 - alfa)*f1x + alfa*f2x, 0.0
+
+
+# MODELO SI: p = [R0, mu, theta, u]
+@njit(cache=True)
+def campo_si(x, y, modo, p):
+    R0, mu, theta, u = p[0], p[1], p[2], p[3]
+    f1x = mu*(1-x) - (mu+theta)*R0*x*y
+    f1y = (mu+theta)*y*(R0*x - 1)
+    f2x = f1x
+    f2y = f1y - u
+    return _selecciona(f1x, f1y, f2x, f2y, modo)
+
+
+# MODELO PRESA-DEPREDADOR: p = [a, b, d, E]
+@njit(cache=True)
+def campo_pp(x, y, modo, p):
+    a, b, d, E = p[0], p[1], p[2], p[3]
+    f1x = x*(1-x) - (a*x*y)/(b+x)
+    f1y = (a*x*y)/(b+x) - d*y
+    f2x = f1x
+    f2y = f1y - E*y
+    return _selecciona(f1x, f1y, f2x, f2y, modo)
+
+
+def tangentes_si(p, w):
+    R0, mu, theta, u = p
+    return 1/R0, (1/R0)*(1 + u/((mu + theta)*w))
+
+def tangentes_pp(p, w):
+    a, b, d, E = p
+    return b*d/(a - d), b*(d + E)/(a - d - E)
+
+
+@njit(cache=True)
+def evento_segmento(x0, y0, x1, y1, modo, w, t1x, t2x):
+    """Evento entre dos puntos consecutivos, con las direcciones de los scripts:
+    sistema 1 cruza y = w hacia arriba, sistema 2 hacia abajo y el deslizamiento
+    termina al pasar por T1 o T2 (en cualquier dirección)."""
+    if modo == SISTEMA1:
+        if y0 < w and y1 >= w:
+            return CRUCE_W
+    elif modo == SISTEMA2:
+        if y0 > w and y1 <= w:
+            return CRUCE_W
+    else:
+        if x0 != t1x and (x0 - t1x)*(x1 - t1x) <= 0:
+            return LLEGADA_T1
+        if x0 != t2x and (x0 - t2x)*(x1 - t2x) <= 0:
+            return LLEGADA_T2
+    return SIN_EVENTO
+
+
+@njit(cache=True)
+def _hermite(c0, d0, c1, d1, h, s):
+    s2 = s*s
+    s3 = s2*s
+    return ((2*s3 - 3*s2 + 1)*c0 + (s3 - 2*s2 + s)*h*d0
+            + (-2*s3 + 3*s2)*c1 + (s3 - s2)*h*d1)
+
+
+@njit(cache=True)
+def _localiza(c0, d0, c1, d1, h, objetivo):
+    # bisección de Hermite(s) = objetivo en [0, 1]
+    izq, der = 0.0, 1.0
+    signo0 = c0 < objetivo
+    for _ in range(60):
+        medio = 0.5*(izq + der)
+        if (_hermite(c0, d0, c1, d1, h, medio) < objetivo) == signo0:
+            izq = medio
+        else:
+            der = medio
+    return der
+
+
+def crea_integrador(campo):
+    """Compila el bucle de integración de un segmento para el campo dado."""
+
+    @njit
+    def integra(x0, y0, modo, p, w, t1x, t2x, tiempo_max, dt, adaptativo, rtol, atol):
+        cap = 1024
+        T = np.empty(cap)
+        X = np.empty(cap)
+        Y = np.empty(cap)
+        T[0], X[0], Y[0] = 0.0, x0, y0
+        n = 1
+        t, x, y = 0.0, x0, y0
+        h = dt
+        pasos = 0
+        nfev = 1
+        evento = SIN_EVENTO
+        k1x, k1y = campo(x, y, modo, p)
+        while t < tiempo_max:
+            h = min(h, tiempo_max - t)
+            if adaptativo:
+                # Dormand-Prince 5(4) con control de error
+                while True:
+                    k2x, k2y = campo(x + h*(1/5*k1x), y + h*(1/5*k1y), modo, p)
+                    k3x, k3y = campo(x + h*(3/40*k1x + 9/40*k2x), y + h*(3/40*k1y + 9/40*k2y), modo, p)
+                    k4x, k4y = campo(x + h*(44/45*k1x - 56/15*k2x + 32/9*k3x),
+                                     y + h*(44/45*k1y - 56/15*k2y + 32/9*k3y), modo, p)
+                    k5x, k5y = campo(x + h*(19372/6561*k1x - 25360/2187*k2x + 64448/6561*k3x - 212/729*k4x),
+                                     y + h*(19372/6561*k1y - 25360/2187*k2y + 64448/6561*k3y - 212/729*k4y),
+                                     modo, p)
+                    k6x, k6y = campo(x + h*(9017/3168*k1x - 355/33*k2x + 46732/5247*k3x + 49/176*k4x
+                                            - 5103/18656*k5x),
+                                     y + h*(9017/3168*k1y - 355/33*k2y + 46732/5247*k3y + 49/176*k4y
+                                            - 5103/18656*k5y), modo, p)
+                    xn = x + h*(35/384*k1x + 500/1113*k3x + 125/192*k4x - 2187/6784*k5x + 11/84*k6x)
+                    yn = y + h*(35/384*k1y + 500/1113*k3y + 125/192*k4y - 2187/6784*k5y + 11/84*k6y)
+                    k7x, k7y = campo(xn, yn, modo, p)
+                    nfev += 6
+                    ex = h*(71/57600*k1x - 71/16695*k3x + 71/1920*k4x - 17253/339200*k5x
+                            + 22/525*k6x - 1/40*k7x)
+                    ey = h*(71/57600*k1y - 71/16695*k3y + 71/1920*k4y - 17253/339200*k5y
+                            + 22/525*k6y - 1/40*k7y)
+                    sx = atol + rtol*max(abs(x), abs(xn))
+                    sy = atol + rtol*max(abs(y), abs(yn))
+                    err = np.sqrt(0.5*((ex/sx)**2 + (ey/sy)**2))
+                    factor = 5.0 if err == 0 else min(5.0, max(0.2, 0.9*err**-0.2))
+                    if err <= 1:
+                        h_sig = h*factor
+                        break
+                    h = h*factor
+            else:
+                # RK4 de paso fijo
+                k2x, k2y = campo(x + 0.5*h*k1x, y + 0.5*h*k1y, modo, p)
+                k3x, k3y = campo(x + 0.5*h*k2x, y + 0.5*h*k2y, modo, p)
+                k4x, k4y = campo(x + h*k3x, y + h*k3y, modo, p)
+                xn = x + h/6*(k1x + 2*k2x + 2*k3x + k4x)
+                yn = y + h/6*(k1y + 2*k2y + 2*k3y + k4y)
+                k7x, k7y = campo(xn, yn, modo, p)
+                nfev += 4
+                h_sig = dt
+            pasos += 1
+
+            evento = evento_segmento(x, y, xn, yn, modo, w, t1x, t2x)
+            if evento != SIN_EVENTO:
+                # localizar el evento sobre el interpolante de Hermite del paso
+                if evento == CRUCE_W:
+                    s = _localiza(y, k1y, yn, k7y, h, w)
+                elif evento == LLEGADA_T1:
+                    s = _localiza(x, k1x, xn, k7x, h, t1x)
+                else:
+                    s = _localiza(x, k1x, xn, k7x, h, t2x)
+                xe = _hermite(x, k1x, xn, k7x, h, s)
+                ye = w if evento == CRUCE_W else _hermite(y, k1y, yn, k7y, h, s)
+                t, x, y = t + s*h, xe, ye
+            else:
+                t, x, y = t + h, xn, yn
+                k1x, k1y = k7x, k7y
+
+            if n == cap:
+                cap *= 2
+                T2 = np.empty(cap)
+                X2 = np.empty(cap)
+                Y2 = np.empty(cap)
+                T2[:n], X2[:n], Y2[:n] = T[:n], X[:n], Y[:n]
+                T, X, Y = T2, X2, Y2
+            T[n], X[n], Y[n] = t, x, y
+            n += 1
+            if evento != SIN_EVENTO:
+                break
+            h = h_sig
+        return T[:n], X[:n], Y[:n], evento, pasos, nfev
+
+    return integra
+
+
+MODELOS = {
+    'SI': {'campo': campo_si, 'tangentes': tangentes_si,
+           'p': (1.5, 0.2, 0.15, 0.1), 'w': 0.3},      # (R0, mu, theta, u), SImodel.py
+    'PP': {'campo': campo_pp, 'tangentes': tangentes_pp,
+           'p': (0.3556, 0.33, 0.0444, 0.2067), 'w': 1.625},  # (a, b, d, E), modelP_P.py
+}
+_integradores = {}
+
+
+def _integrador(modelo):
+    if modelo not in _integradores:
+        _integradores[modelo] = crea_integrador(MODELOS[modelo]['campo'])
+    return _integradores[modelo]
+
+
+def simula_segmento(modelo, modo, x0, y0, tiempo_max, p=None, w=None, dt=0.01,
+                    adaptativo=False, rtol=1e-6, atol=1e-9, usar_jit=HAY_NUMBA):
+    """Equivalente a simula_sistema1 (modo 1), simula_sistema2 (modo 2) o
+    integra_deslizamiento (modo 3) de los scripts, para modelo 'SI' o 'PP'.
+
+    Devuelve un resultado con los campos de solve_ivp (t, y, t_events, y_events, nfev)
+    más 'pasos' (pasos aceptados) y 'evento' (SIN_EVENTO, CRUCE_W, LLEGADA_T1, LLEGADA_T2).
+    En deslizamiento y queda fija en w y t_events trae [T1, T2] como en integra_deslizamiento.
+    """
+    m = MODELOS[modelo]
+    p = np.asarray(m['p'] if p is None else p, dtype=float)
+    w = m['w'] if w is None else w
+    t1x, t2x = m['tangentes'](p, w)
+    if modo == DESLIZAMIENTO:
+        y0 = w
+
+    if usar_jit and HAY_NUMBA:
+        T, X, Y, evento, pasos, nfev = _integrador(modelo)(
+            float(x0), float(y0), modo, p, w, t1x, t2x, float(tiempo_max), dt, adaptativo, rtol, atol)
+    else:
+        # camino de Python: las mismas funciones de campo con solve_ivp
+        campo = getattr(m['campo'], 'py_func', m['campo'])
+        fun = lambda t, V: list(campo(V[0], V[1], modo, p))
+        if modo == DESLIZAMIENTO:
+            eventos = [lambda t, V: V[0] - t1x, lambda t, V: V[0] - t2x]
+        else:
+            eventos = [lambda t, V: V[1] - w]
+            eventos[0].direction = 1 if modo == SISTEMA1 else -1
+        for e in eventos:
+            e.terminal = True
+        kwargs = {'rtol': rtol, 'atol': atol} if adaptativo else {'max_step': dt}
+        sol = solve_ivp(fun, [0, tiempo_max], [x0, y0], events=eventos, **kwargs)
+        T, X, Y = sol.t, sol.y[0], sol.y[1]
+        pasos, nfev = len(T) - 1, sol.nfev
+        evento = SIN_EVENTO
+        for i, te in enumerate(sol.t_events):
+            if te.size > 0:
+                evento = CRUCE_W if modo != DESLIZAMIENTO else (LLEGADA_T1 if i == 0 else LLEGADA_T2)
+
+    n_eventos = 2 if modo == DESLIZAMIENTO else 1
+    t_events = [np.empty(0) for _ in range(n_eventos)]
+    y_events = [np.empty((0, 2)) for _ in range(n_eventos)]
+    if evento != SIN_EVENTO:
+        i = 0 if evento in (CRUCE_W, LLEGADA_T1) else 1
+        t_events[i] = T[-1:]
+        y_events[i] = np.array([[X[-1], Y[-1]]])
+    return OptimizeResult(t=T, y=np.vstack([X, Y]), t_events=t_events, y_events=y_events,
+                          nfev=nfev, pasos=pasos, evento=evento, status=1 if evento else 0)
+
+
+if __name__ == "__main__":
+    # Pasos por segundo: bucle compilado contra solve_ivp (camino de Python)
+    casos = [('SI', SISTEMA1, 0.55, 0.2), ('SI', SISTEMA2, 0.1, 0.5),
+             ('PP', SISTEMA1, 0.5, 0.3), ('PP', DESLIZAMIENTO, 0.3, None)]
+    if not HAY_NUMBA:
+        print("numba no está disponible: solo se mide el camino de Python")
+
+    for adaptativo in (False, True):
+        print(f"\n{'RK adaptativo (rtol=1e-8)' if adaptativo else 'Paso fijo dt = 0.01'}")
+        print(f"{'modelo':6s} {'modo':5s} {'camino':8s} {'pasos':>7s} {'nfev':>7s} {'pasos/s':>12s} {'evento':>7s} {'x final':>10s}")
+        for modelo, modo, x0, y0 in casos:
+            caminos = [('python', False)] + ([('numba', True)] if HAY_NUMBA else [])
+            for nombre, usar_jit in caminos:
+                opciones = dict(adaptativo=adaptativo, rtol=1e-8, atol=1e-11, usar_jit=usar_jit)
+                simula_segmento(modelo, modo, x0, y0, 50, **opciones) # compila la primera vez
+                repeticiones = 1 if nombre == 'python' else 20
+                inicio = time.perf_counter()
+                for _ in range(repeticiones):
+                    sol = simula_segmento(modelo, modo, x0, y0, 50, **opciones)
+                tiempo = (time.perf_counter() - inicio)/repeticiones
+                print(f"{modelo:6s} {modo:<5d} {nombre:8s} {sol.pasos:7d} {sol.nfev:7d} "
+                      f"{sol.pasos/tiempo:12.0f} {sol.evento:7d} {sol.y[0][-1]:10.6f}")
@@ -2,6 +2,11 @@ import numpy as np
 from scipy.integrate import odeint
 import matplotlib.pyplot as plt
 
+# True: solución exacta X(t) = expm(A t) V0 (solucion_lineal.py); False: odeint
+solucion_exacta = False
+if solucion_exacta:
+    from solucion_lineal import lineal_exacta
+
 # Definir la función del SEDO como una función en Python
 def lineal(V, t, a, b, c, d): #V es el vector de variables dependientes
     x, y = V
@@ -29,9 +34,28 @@ d = 4
 
 # Campo vectorial
 h=1 #cantidad de vectores (horizontal como vertical)
-X, Y = np.meshgrid(np.arange(ax, bx + h, h), np.arange(ay, by + h, h))
-dXdt = a*X + b*Y
-dYdt = c*X + d*Y
+
+# True: campo evaluado por bloques de filas en float32 sin meshgrid (malla_por_bloques.py),
+# con memoria acotada por presupuesto_mb; reduccion > 1 promedia celdas de reduccion x
+# reduccion puntos para que streamplot reciba una malla manejable cuando h es muy pequeño
+malla_por_bloques = False
+presupuesto_mb = 256
+reduccion = 1
+if malla_por_bloques:
+    from malla_por_bloques import campo_por_bloques
+
+# True: líneas de flujo vectorizadas de lineas_flujo.py (una LineCollection) en vez de plt.streamplot
+lineas_propias = False
+if lineas_propias:
+    from lineas_flujo import lineas_flujo, dibuja_lineas_flujo
+
+if malla_por_bloques:
+    X, Y, dXdt, dYdt = campo_por_bloques(lambda X, Y: (a*X + b*Y, c*X + d*Y), (ax, bx, ay, by), h,
+                                         reduccion=reduccion, presupuesto_mb=presupuesto_mb)
+else:
+    X, Y = np.meshgrid(np.arange(ax, bx + h, h), np.arange(ay, by + h, h))
+    dXdt = a*X + b*Y
+    dYdt = c*X + d*Y
 
 #plt.streamplot(X, Y, dXdt, dYdt, color=(0/255, 180/255, 250/255),linewidth=0.6)
 plt.grid(True)
@@ -47,8 +71,11 @@ t = np.linspace(0, tf, 200)
 # Condiciones iniciales como vector
 V0 = [x0, y0]
 
-# Resolver el SEDO con odeint
-solution = odeint(lineal, V0, t, args=(a,b,c,d))
+# Resolver el SEDO (exacta u odeint)
+if solucion_exacta:
+    solution = lineal_exacta(V0, t, a, b, c, d)
+else:
+    solution = odeint(lineal, V0, t, args=(a,b,c,d))
 
 # Extraer las soluciones de solution
 Xt, Yt = solution.T
@@ -64,7 +91,12 @@ plt.legend()
 plt.grid()
 
 plt.subplot(1,2,2)
-plt.streamplot(X, Y, dXdt, dYdt, color=(0/255, 180/255, 250/255),linewidth=0.6)
+if lineas_propias:
+    # lineas_flujo pide los ejes 1-D (campo_por_bloques ya los devuelve así)
+    ejes_x, ejes_y = (X, Y) if X.ndim == 1 else (X[0], Y[:, 0])
+    dibuja_lineas_flujo(plt.gca(), lineas_flujo(ejes_x, ejes_y, dXdt, dYdt))
+else:
+    plt.streamplot(X, Y, dXdt, dYdt, color=(0/255, 180/255, 250/255),linewidth=0.6)
 plt.plot(Xt,Yt,color='red',linewidth=2) #solucion particular
 plt.scatter(x0,y0)
 plt.xlim([ax,bx])
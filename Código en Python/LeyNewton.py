@@ -1,6 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import odeint
+from integracion_convergente import odeint_convergente
+
+# True: con el forzamiento de período 2π/w se deja de integrar cuando la temperatura se
+# repite de un período al siguiente (integracion_convergente.py); False: odeint
+parada_temprana = False
 
 #Ley de Enfriamiento-Calentamiento de Newton
 #t: tiempo en minutos
@@ -22,7 +27,10 @@ T1=15
 w=np.pi/12
 #Solución
 time=np.linspace(t0,tf,200)
-Sol = odeint(f,x0,time,args=(k,T0,T1,w)) 
+if parada_temprana:
+    Sol, info = odeint_convergente(f, x0, time, args=(k,T0,T1,w), periodo_forzado=2*np.pi/w)
+else:
+    Sol = odeint(f,x0,time,args=(k,T0,T1,w)) 
 Temp=Sol[:,0]
 
 #gráfica de la solución
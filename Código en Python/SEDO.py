@@ -1,6 +1,14 @@
 import numpy as np
 from scipy.integrate import odeint
 import matplotlib.pyplot as plt
+from integracion_convergente import odeint_convergente
+
+# True: odeint por tramos que se detiene al llegar a un equilibrio o a un ciclo
+# (integracion_convergente.py) y completa el resto de t con el atractor; False: odeint
+parada_temprana = False
+# con a < 0 el radio decae solo como 1/sqrt(2|a|t) y |f| ≈ r cerca del origen, así que
+# tol_equilibrio es prácticamente el radio al que se da por llegado al origen
+tol_equilibrio = 0.05
 
 # Definir la función del SEDO como una función en Python
 def SEDO(V, t, a): #V es el vector de variables dependientes
@@ -24,7 +32,11 @@ t = np.linspace(0, 200, 5000)
 V0 = [x0, y0]
 
 # Resolver el SEDO con odeint
-solution = odeint(SEDO, V0, t, args=(a,))
+if parada_temprana:
+    solution, info = odeint_convergente(SEDO, V0, t, args=(a,), tol_f=tol_equilibrio)
+    print(f"{info['tipo']} en t = {info['t_parada']:.1f}, período {info['periodo']}")
+else:
+    solution = odeint(SEDO, V0, t, args=(a,))
 
 # Extraer las soluciones de solution
 X, Y = solution.T
@@ -1,6 +1,10 @@
 import numpy as np
 from scipy.integrate import odeint
 import matplotlib.pyplot as plt
+from solucion_lineal import lineal_exacta
+
+# True: solución exacta X(t) = expm(A t) V0 (solucion_lineal.py); False: odeint
+solucion_exacta = False
 
 # Definir la función del SEDO como una función en Python
 def lineal(V, t, a, b, c, d): #V es el vector de variables dependientes
@@ -27,8 +31,11 @@ t = np.linspace(0, tf, 2000)
 # Condiciones iniciales como vector
 V0 = [x0, y0]
 
-# Resolver el SEDO con odeint
-solution = odeint(lineal, V0, t, args=(a,b,c,d))
+# Resolver el SEDO (exacta u odeint)
+if solucion_exacta:
+    solution = lineal_exacta(V0, t, a, b, c, d)
+else:
+    solution = odeint(lineal, V0, t, args=(a,b,c,d))
 
 # Extraer las soluciones de solution
 X, Y = solution.T
@@ -0,0 +1,97 @@
+import numpy as np
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+from clasificacion_lineal import clasifica_lote, describe
+
+"""Animación del plano de fase de Ejemplo1libropp411.py al variar un parámetro.
+
+En Ejemplo1libropp411.py el parámetro c (= -9, "parametro que varia") se cambia a
+mano y se vuelve a correr el script, pagando cada vez el arranque de matplotlib y un
+plt.show() bloqueante. Aquí la malla se arma una sola vez y los campos de todos los
+valores de c se calculan juntos (dXdt = a X + b Y no depende de c; dYdt = c X + d Y
+es una operación de arreglos sobre todos los c). Los cuadros se dibujan sin ventana
+(Agg, sin pyplot) repartidos entre procesos; cada proceso reutiliza su figura y solo
+limpia los ejes entre cuadros. Al final los PNG se pueden unir en un GIF."""
+
+# ventana y parámetros fijos de Ejemplo1libropp411.py
+VENTANA = (-1, 1, -1, 1)
+PARAMETROS = {'a': -1, 'b': 1, 'c': -9, 'd': -1}
+
+# figura reutilizada por cada proceso
+_FIGURA = None
+
+
+def campos_barrido(nombre, valores, p=None, ventana=VENTANA, h=0.05):
+    """Malla común y campos (dXdt, dYdt) de forma (len(valores), ny, nx) para cada valor del parámetro."""
+    p = PARAMETROS if p is None else p
+    ax, bx, ay, by = ventana
+    X, Y = np.meshgrid(np.arange(ax, bx + h, h), np.arange(ay, by + h, h))
+    # cada coeficiente es un escalar o, el que varía, un arreglo (n, 1, 1)
+    q = {k: (np.asarray(valores, dtype=float)[:, np.newaxis, np.newaxis] if k == nombre else v)
+         for k, v in p.items()}
+    forma = (len(valores),) + X.shape
+    dXdt = np.broadcast_to(q['a']*X + q['b']*Y, forma)
+    dYdt = np.broadcast_to(q['c']*X + q['d']*Y, forma)
+    return X, Y, dXdt, dYdt
+
+
+def _dibuja_cuadro(ruta, X, Y, U, V, titulo, ventana, dpi):
+    global _FIGURA
+    if _FIGURA is None:
+        _FIGURA = Figure(figsize=(5, 5))
+        FigureCanvasAgg(_FIGURA)
+    _FIGURA.clear()
+    eje = _FIGURA.add_subplot()
+    eje.streamplot(X, Y, U, V, color=(0/255, 180/255, 250/255), linewidth=0.6)
+    eje.set_xlim(ventana[0], ventana[1])
+    eje.set_ylim(ventana[2], ventana[3])
+    eje.set_xlabel('x(t)')
+    eje.set_ylabel('y(t)')
+    eje.set_title(titulo)
+    eje.grid()
+    # PNG directo desde el búfer del lienzo, con compresión rápida
+    _FIGURA.set_dpi(dpi)
+    _FIGURA.canvas.draw()
+    Image.fromarray(np.asarray(_FIGURA.canvas.buffer_rgba())).convert('RGB').save(ruta, compress_level=1)
+    return ruta
+
+
+def renderiza_barrido(nombre, valores, carpeta, p=None, ventana=VENTANA, h=0.05, dpi=80,
+                      procesos=None, gif=True, duracion_cuadro=80):
+    """Dibuja un cuadro PNG por valor del parámetro en carpeta y, si gif, los une en barrido.gif.
+
+    Devuelve la lista de rutas de los cuadros (y del GIF al final, si se pidió)."""
+    p = PARAMETROS if p is None else p
+    os.makedirs(carpeta, exist_ok=True)
+    X, Y, dXdt, dYdt = campos_barrido(nombre, valores, p, ventana, h)
+    # clasificación de todos los sistemas del barrido a la vez, para el título
+    coef = {k: np.asarray(valores, dtype=float) if k == nombre else v for k, v in p.items()}
+    tipo, estabilidad = clasifica_lote(a=coef['a'], b=coef['b'], c=coef['c'], d=coef['d'])
+    rutas = [os.path.join(carpeta, f"cuadro_{i:04d}.png") for i in range(len(valores))]
+    titulos = [f"{nombre} = {v:.3f}: {describe(k, e)}" for v, k, e in zip(valores, tipo, estabilidad)]
+    argumentos = [(ruta, X, Y, dXdt[i], dYdt[i], titulos[i], ventana, dpi) for i, ruta in enumerate(rutas)]
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        list(map(lambda a: _dibuja_cuadro(*a), argumentos))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            list(ejecutor.map(_dibuja_cuadro, *zip(*argumentos), chunksize=max(1, len(rutas)//(4*procesos))))
+    if gif:
+        cuadros = [Image.open(ruta) for ruta in rutas]
+        ruta_gif = os.path.join(carpeta, 'barrido.gif')
+        cuadros[0].save(ruta_gif, save_all=True, append_images=cuadros[1:], duration=duracion_cuadro, loop=0)
+        rutas.append(ruta_gif)
+    return rutas
+
+
+if __name__ == "__main__":
+    # c de -9 a 3: espiral estable -> nodo estable (c > 0) -> silla (c > 1)
+    valores = np.linspace(-9, 3, 200)
+    carpeta = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'barrido_c')
+    inicio = time.perf_counter()
+    rutas = renderiza_barrido('c', valores, carpeta)
+    print(f"{len(valores)} cuadros en {time.perf_counter() - inicio:.1f} s con {os.cpu_count()} procesos -> {rutas[-1]}")
@@ -0,0 +1,162 @@
+import numpy as np
+import time
+
+"""Valores propios y clasificación del plano de fase para lotes de sistemas lineales.
+
+vaps.vaps(M) llama a np.linalg.eigvals con una sola matriz, y en SYSLINEAL2X2.py,
+Ejemplo1libropp411.py y CampoVectoria2D.py cada (a, b, c, d) se clasifica a ojo. Para
+x' = a x + b y, y' = c x + d y los valores propios son s ± √(s² - det) con s = tr/2,
+así que millones de sistemas se resuelven con unas pocas operaciones de arreglos sobre
+los coeficientes. El cálculo va por bloques en búferes preasignados, sin objetos por
+matriz. La clasificación sigue el diagrama traza-determinante:
+
+    det < 0                    silla
+    det > 0, tr² - 4det > 0    nodo
+    det > 0, tr² - 4det < 0    espiral (centro si tr = 0)
+    det = 0 o tr² = 4det       degenerado (valor propio cero o doble)
+    tr = det = 0, A ≠ 0        nilpotente (cero doble defectivo)
+
+y la estabilidad es ESTABLE (asintóticamente), INESTABLE o NEUTRO (centro o valor
+propio cero sin parte positiva). El caso nilpotente, como [[0, 1], [0, 0]], es
+inestable: x(t) = x0 + b y0 t crece linealmente aunque los valores propios sean 0. Para pilas n x n con n > 2 se usa np.linalg.eigvals."""
+
+# tipos del diagrama traza-determinante
+SILLA = 1
+NODO = 2
+ESPIRAL = 3
+CENTRO = 4
+DEGENERADO = 5
+NILPOTENTE = 6
+NOMBRES = {SILLA: 'silla', NODO: 'nodo', ESPIRAL: 'espiral', CENTRO: 'centro', DEGENERADO: 'degenerado',
+           NILPOTENTE: 'nilpotente'}
+
+# estabilidad
+ESTABLE = -1
+NEUTRO = 0
+INESTABLE = 1
+NOMBRES_ESTABILIDAD = {ESTABLE: 'estable', NEUTRO: 'neutro', INESTABLE: 'inestable'}
+
+
+def _coeficientes(M=None, a=None, b=None, c=None, d=None):
+    if M is not None:
+        M = np.asarray(M, dtype=float)
+        return M[..., 0, 0], M[..., 0, 1], M[..., 1, 0], M[..., 1, 1]
+    return np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c, d)))
+
+
+def vaps_lote(M=None, a=None, b=None, c=None, d=None, bloque=1 << 20):
+    """Valores propios de un lote: M de forma (..., n, n) o los coeficientes a, b, c, d.
+
+    Devuelve un arreglo complejo (..., 2) (o (..., n) con n > 2) ordenado con la parte
+    real mayor primero en el caso 2x2."""
+    if M is not None and np.shape(M)[-2:] != (2, 2):
+        return np.linalg.eigvals(np.asarray(M, dtype=float))
+    a, b, c, d = _coeficientes(M, a, b, c, d)
+    forma = a.shape
+    a, b, c, d = (np.ravel(v) for v in (a, b, c, d))
+    lam = np.empty((a.size, 2), dtype=complex)
+    s = np.empty(min(bloque, a.size))
+    disc = np.empty_like(s)
+    raiz = np.empty(s.size, dtype=complex)
+    for i in range(0, a.size, bloque):
+        j = min(i + bloque, a.size)
+        n = j - i
+        # s = tr/2, disc = s² - det = ((a - d)/2)² + b c (sin cancelación cuando a ≈ d)
+        np.add(a[i:j], d[i:j], out=s[:n])
+        s[:n] *= 0.5
+        np.subtract(a[i:j], d[i:j], out=disc[:n])
+        disc[:n] *= 0.5
+        disc[:n] *= disc[:n]
+        disc[:n] += b[i:j]*c[i:j]
+        np.sqrt(disc[:n].astype(complex), out=raiz[:n])
+        np.add(s[:n], raiz[:n], out=lam[i:j, 0])
+        np.subtract(s[:n], raiz[:n], out=lam[i:j, 1])
+    return lam.reshape(*forma, 2)
+
+
+def clasifica_lote(M=None, a=None, b=None, c=None, d=None, tol=1e-12):
+    """Tipo (SILLA, NODO, ESPIRAL, CENTRO, DEGENERADO, NILPOTENTE) y estabilidad de un lote de sistemas.
+
+    M de forma (..., 2, 2) o los coeficientes a, b, c, d (por broadcasting). Las
+    comparaciones con cero usan tol relativa a la escala de la matriz. Devuelve
+    (tipo, estabilidad) como arreglos int8; para n > 2 el tipo es 0 y solo se da la
+    estabilidad a partir de la mayor parte real."""
+    if M is not None and np.shape(M)[-2:] != (2, 2):
+        re = vaps_lote(M).real.max(axis=-1)
+        escala = np.abs(np.asarray(M, dtype=float)).max(axis=(-2, -1))
+        estabilidad = np.where(re < -tol*escala, ESTABLE, np.where(re > tol*escala, INESTABLE, NEUTRO))
+        return np.zeros(re.shape, dtype=np.int8), estabilidad.astype(np.int8)
+    a, b, c, d = _coeficientes(M, a, b, c, d)
+    escala = np.maximum(np.maximum(np.abs(a), np.abs(b)), np.maximum(np.abs(c), np.abs(d)))
+    tr = a + d
+    det = a*d - b*c
+    disc = 0.25*(a - d)**2 + b*c
+    cero_tr = np.abs(tr) <= tol*escala
+    cero_det = np.abs(det) <= tol*escala**2
+    cero_disc = np.abs(disc) <= tol*escala**2
+
+    tipo = np.full(tr.shape, DEGENERADO, dtype=np.int8)
+    tipo[(det < 0) & ~cero_det] = SILLA
+    regular = (det > 0) & ~cero_det & ~cero_disc
+    tipo[regular & (disc > 0)] = NODO
+    tipo[regular & (disc < 0)] = ESPIRAL
+    tipo[regular & (disc < 0) & cero_tr] = CENTRO
+    # tr = det = 0 con A ≠ 0: el bloque de Jordan del cero, no un centro ni un punto fijo
+    nilpotente = cero_tr & cero_det & (escala > 0)
+    tipo[nilpotente] = NILPOTENTE
+
+    estabilidad = np.where(tr > 0, INESTABLE, ESTABLE).astype(np.int8)
+    estabilidad[cero_tr] = NEUTRO
+    estabilidad[(det < 0) & ~cero_det] = INESTABLE
+    estabilidad[cero_det & (tr < 0)] = NEUTRO
+    estabilidad[nilpotente] = INESTABLE
+    return tipo, estabilidad
+
+
+def describe(tipo, estabilidad):
+    """Nombre legible de una clasificación, por ejemplo 'espiral estable'."""
+    if tipo == SILLA or tipo == CENTRO:
+        return NOMBRES[int(tipo)]
+    return f"{NOMBRES.get(int(tipo), 'sistema')} {NOMBRES_ESTABILIDAD[int(estabilidad)]}"
+
+
+if __name__ == "__main__":
+    # el ejemplo de vaps.py
+    M = [[1, 5], [-1, -2]]
+    tipo, estabilidad = clasifica_lote(np.array([M]))
+    print(f"{M}: valores propios {vaps_lote(np.array([M]))[0]}, {describe(tipo[0], estabilidad[0])}")
+    # cero doble: nilpotente (crece linealmente) frente a la matriz nula (todo punto es de equilibrio)
+    for M in ([[0, 1], [0, 0]], [[0, 0], [0, 0]]):
+        tipo, estabilidad = clasifica_lote(np.array([M]))
+        print(f"{M}: {describe(tipo[0], estabilidad[0])}")
+
+    # Ejemplo1libropp411.py: a = -1, b = 1, d = -1 y c varía; tr = -2, det = 1 - c, disc = c
+    c = np.linspace(-20, 5, 25001)
+    tipo, estabilidad = clasifica_lote(a=-1, b=1, c=c, d=-1)
+    cambios = np.flatnonzero((tipo[1:] != tipo[:-1]) | (estabilidad[1:] != estabilidad[:-1])) + 1
+    print("Ejemplo1libropp411.py, c en [-20, 5]:")
+    print(f"  c < {c[cambios[0]]:g}: {describe(tipo[0], estabilidad[0])}")
+    for i in cambios:
+        print(f"  c = {c[i]:g}: {describe(tipo[i], estabilidad[i])}")
+
+    # lote grande contra eigvals de numpy
+    rng = np.random.default_rng(0)
+    N = 4_000_000
+    M = rng.normal(size=(N, 2, 2))
+    inicio = time.perf_counter()
+    lam = vaps_lote(M)
+    t_lote = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    tipo, estabilidad = clasifica_lote(M)
+    t_clase = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    ref = np.linalg.eigvals(M)
+    t_eig = time.perf_counter() - inicio
+    # mismo conjunto de valores propios sin importar el orden
+    ordena = lambda z: np.sort_complex(np.round(z, 10))
+    error = np.abs(ordena(lam) - ordena(ref)).max()
+    print(f"\n{N:,} matrices: vaps_lote {t_lote:.2f} s, clasifica_lote {t_clase:.2f} s, "
+          f"np.linalg.eigvals {t_eig:.2f} s; diferencia máxima {error:.1e}")
+    conteo = {describe(k, e): int(((tipo == k) & (estabilidad == e)).sum())
+              for k in NOMBRES for e in NOMBRES_ESTABILIDAD if ((tipo == k) & (estabilidad == e)).any()}
+    print(f"  {conteo}")
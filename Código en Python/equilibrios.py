@@ -0,0 +1,128 @@
+import numpy as np
+import time
+from modelo_simbolico import compila_modelo
+from clasificacion_lineal import vaps_lote, clasifica_lote, describe
+
+"""Búsqueda y clasificación automática de equilibrios de sistemas planos.
+
+En Ejemplo1NoLineal.py y EjemploNoLineal27052025 los equilibrios (-2, -2), (0, 0),
+(2, 2) se calculan a mano y se dibujan con plt.scatter. Aquí se lanza Newton desde una
+malla de semillas sobre la ventana, todas a la vez: el campo y el jacobiano vienen de
+compila_modelo (modelo_simbolico.py) y cada paso resuelve los sistemas 2x2 por la regla
+de Cramer sobre todo el lote. Las raíces que convergen se agrupan con un hash espacial
+(celdas de tamaño radio, revisando las vecinas) y cada una se clasifica con los valores
+propios de su jacobiano (clasificacion_lineal.py). Los resultados se guardan por
+(modelo, parámetros, ventana, semillas), y al cambiar los parámetros se puede volver a
+resolver solo desde las raíces anteriores (desde=...)."""
+
+# resultados por (clave del modelo, parámetros, ventana, semillas)
+_CACHE = {}
+
+
+def _newton(modelo, x, y, valores, iteraciones, tol, paso_max):
+    activos = np.ones(x.shape, dtype=bool)
+    for _ in range(iteraciones):
+        xa, ya = x[activos], y[activos]
+        F, G = modelo['campo'](xa, ya, *valores)
+        J = modelo['jacobiano'](xa, ya, *valores)
+        det = J[:, 0, 0]*J[:, 1, 1] - J[:, 0, 1]*J[:, 1, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dx = -(J[:, 1, 1]*F - J[:, 0, 1]*G)/det
+            dy = -(J[:, 0, 0]*G - J[:, 1, 0]*F)/det
+            # paso amortiguado para que las semillas lejanas no salten fuera de la ventana
+            largo = np.hypot(dx, dy)
+            factor = np.where(largo > paso_max, paso_max/largo, 1.0)
+            x[activos] = xa + factor*dx
+            y[activos] = ya + factor*dy
+        # se retiran las que ya convergieron y las que fallaron (jacobiano singular, desborde)
+        listo = (np.hypot(F, G) < tol) & (largo < 1e-12 + 1e-9*np.hypot(xa, ya)) | ~np.isfinite(largo)
+        indices = np.flatnonzero(activos)
+        activos[indices[listo]] = False
+        if not activos.any():
+            break
+    return x, y
+
+
+def _agrupa(x, y, radio):
+    # hash espacial: un representante por grupo de raíces a menos de radio
+    celdas = {}
+    representantes = []
+    for xi, yi in zip(x, y):
+        ci, cj = int(np.floor(xi/radio)), int(np.floor(yi/radio))
+        vecino = next((celdas[(ci + di, cj + dj)] for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                       if (ci + di, cj + dj) in celdas), None)
+        if vecino is None:
+            celdas[(ci, cj)] = len(representantes)
+            representantes.append((xi, yi))
+    return np.array(representantes).reshape(-1, 2)
+
+
+def busca_equilibrios(modelo, ventana, valores=None, semillas=40, iteraciones=60, tol=1e-10, radio=None,
+                      desde=None):
+    """Equilibrios del modelo (de compila_modelo) dentro de la ventana (ax, bx, ay, by).
+
+    valores: parámetros en el orden de modelo['parametros'] (por defecto modelo['valores']);
+    semillas: semillas por eje de la malla inicial; desde: un resultado anterior cuyos
+    puntos se usan como únicas semillas (continuación en parámetros). Devuelve un
+    diccionario con 'puntos' (k, 2), 'valores_propios' (k, 2), 'tipo', 'estabilidad' y
+    'descripcion' (lista de cadenas)."""
+    valores = tuple(modelo['valores'] if valores is None else valores)
+    ax, bx, ay, by = ventana
+    escala = max(bx - ax, by - ay)
+    radio = 1e-5*escala if radio is None else radio
+    clave = (modelo['clave'], valores, tuple(ventana), semillas if desde is None else None)
+    if desde is None and clave in _CACHE:
+        return _CACHE[clave]
+
+    if desde is None:
+        x, y = (m.ravel() for m in np.meshgrid(np.linspace(ax, bx, semillas), np.linspace(ay, by, semillas)))
+    else:
+        x, y = desde['puntos'][:, 0], desde['puntos'][:, 1]
+    x, y = _newton(modelo, np.array(x, dtype=float), np.array(y, dtype=float), valores, iteraciones, tol,
+                   paso_max=0.25*escala)
+
+    F, G = modelo['campo'](x, y, *valores)
+    margen = 1e-9*escala
+    ok = (np.hypot(F, G) < np.sqrt(tol)) & (x >= ax - margen) & (x <= bx + margen) & \
+         (y >= ay - margen) & (y <= by + margen)
+    puntos = _agrupa(x[ok], y[ok], radio)
+    puntos = puntos[np.lexsort((puntos[:, 1], puntos[:, 0]))]
+    J = modelo['jacobiano'](puntos[:, 0], puntos[:, 1], *valores)
+    # entradas que son solo redondeo frente a la escala del jacobiano en la ventana (raíces degeneradas)
+    escala_J = np.abs(modelo['jacobiano'](np.array([ax, bx, ax, bx]), np.array([ay, ay, by, by]), *valores)).max()
+    J[np.abs(J) < 1e-8*escala_J] = 0
+    tipo, estabilidad = clasifica_lote(J)
+    resultado = {'puntos': puntos, 'valores_propios': vaps_lote(J), 'tipo': tipo, 'estabilidad': estabilidad,
+                 'descripcion': [describe(k, e) for k, e in zip(tipo, estabilidad)]}
+    _CACHE[clave] = resultado
+    return resultado
+
+
+if __name__ == "__main__":
+    casos = {
+        'Ejemplo1NoLineal.py': (('x - y', 'x**2*y - 4*x'), (-10, 10, -10, 10)),
+        'EjemploNoLineal27052025': (('-x + x**3', '-2*y'), (-2, 2, -2, 2)),
+        'EjercicioFinal2D.py (rojo)': (('y - x**2 + 2', 'x**2 - x*y'), (-3, 3, 0, 3)),
+        'EjercicioFinal2D.py (azul)': (('y**2 - x**2', '-x*y'), (-3, 3, 1, 3)),
+    }
+    for nombre, (expresiones, ventana) in casos.items():
+        modelo = compila_modelo(expresiones)
+        inicio = time.perf_counter()
+        res = busca_equilibrios(modelo, ventana, semillas=100)
+        duracion = time.perf_counter() - inicio
+        print(f"{nombre}: {100*100} semillas en {duracion*1e3:.1f} ms")
+        for p, lam, d in zip(res['puntos'], res['valores_propios'], res['descripcion']):
+            print(f"  ({p[0]: .6f}, {p[1]: .6f})  valores propios {np.round(lam, 4)}  {d}")
+        inicio = time.perf_counter()
+        busca_equilibrios(modelo, ventana, semillas=100)
+        print(f"  otra vez (caché): {(time.perf_counter() - inicio)*1e6:.0f} µs")
+
+    # continuación: Ejemplo1NoLineal con x² y - k x; al cambiar k solo se resuelve desde las raíces anteriores
+    modelo = compila_modelo(('x - y', 'x**2*y - k*x'), parametros={'k': 4})
+    res = busca_equilibrios(modelo, (-10, 10, -10, 10), semillas=100)
+    print("\nContinuación en k (equilibrios (0, 0) y (±√k, ±√k)):")
+    for k in [4.5, 5, 6, 8]:
+        inicio = time.perf_counter()
+        res = busca_equilibrios(modelo, (-10, 10, -10, 10), valores=(k,), desde=res)
+        print(f"  k = {k}: {(time.perf_counter() - inicio)*1e3:.2f} ms, "
+              f"{[tuple(np.round(p, 6).tolist()) for p in res['puntos']]}, {res['descripcion']}")
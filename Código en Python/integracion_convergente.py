@@ -0,0 +1,225 @@
+import numpy as np
+from scipy.integrate import odeint
+import time
+
+"""odeint con parada temprana al llegar a un equilibrio o a una órbita periódica.
+
+SEDO.py integra hasta t = 200 con 5000 puntos, LeyNewton.py y los scripts del modelo
+SI también usan horizontes fijos largos, aunque la solución ya se haya asentado mucho
+antes. Aquí se llama a odeint por tramos de la misma malla de tiempos (cada tramo
+arranca con el último paso del anterior, h0) y después de cada tramo se revisa:
+
+  - equilibrio: |f(V, t)| < tol_f al final y a lo largo del tramo (en sistemas
+    autónomos |f| solo se anula en los equilibrios);
+  - órbita periódica (sistema autónomo): cruces de la trayectoria con una sección de
+    Poincaré, el hiperplano por un punto de referencia con normal f en ese punto,
+    en el mismo sentido del flujo. Si dos cruces consecutivos están a menos de
+    tol_ciclo, la órbita se cerró y el período es el tiempo entre ellos. Si pasa mucho
+    tiempo sin cruces la sección se vuelve a tomar desde el punto actual;
+  - forzamiento periódico (periodo_forzado = T): la sección es estroboscópica, el
+    estado en t0 + kT, y basta con que dos estados consecutivos coincidan.
+
+Al detectar un ciclo se integra un período más con puntos_ciclo puntos; con
+completa=True el resto de la malla se llena con el equilibrio o con esa órbita
+(interpolada según la fase), así que la salida tiene la misma forma que la de odeint."""
+
+
+def _cruces(tramo, tiempos, punto, normal, campo):
+    # cruces de la sección {V : normal·(V - punto) = 0} en el sentido de normal; entre dos
+    # puntos de la malla la trayectoria se aproxima con el polinomio cúbico de Hermite
+    # (posiciones y derivadas f en los extremos) y el cruce se corrige con Newton
+    s = (tramo - punto) @ normal
+    cruces = []
+    for k in np.flatnonzero((s[:-1] < 0) & (s[1:] >= 0)):
+        h = tiempos[k + 1] - tiempos[k]
+        p0, p1 = tramo[k], tramo[k + 1]
+        m0, m1 = h*campo(p0, tiempos[k]), h*campo(p1, tiempos[k + 1])
+        u = -s[k]/(s[k + 1] - s[k])
+        for _ in range(4):
+            H = (2*u**3 - 3*u**2 + 1)*p0 + (u**3 - 2*u**2 + u)*m0 + (-2*u**3 + 3*u**2)*p1 + (u**3 - u**2)*m1
+            dH = (6*u**2 - 6*u)*p0 + (3*u**2 - 4*u + 1)*m0 + (-6*u**2 + 6*u)*p1 + (3*u**2 - 2*u)*m1
+            u = min(max(u - (H - punto) @ normal/(dH @ normal), 0.0), 1.0)
+        H = (2*u**3 - 3*u**2 + 1)*p0 + (u**3 - 2*u**2 + u)*m0 + (-2*u**3 + 3*u**2)*p1 + (u**3 - u**2)*m1
+        cruces.append((tiempos[k] + u*h, H))
+    return cruces
+
+
+def odeint_convergente(f, V0, t, args=(), tol_f=1e-8, tol_ciclo=1e-6, periodo_forzado=None, amplitud_min=1e-3,
+                       bloque=None, completa=True, puntos_ciclo=1024, **opciones):
+    """Como odeint(f, V0, t, args), pero se detiene cuando la solución ya se asentó.
+
+    tol_f: umbral de |f| para el equilibrio (None para no buscarlo); tol_ciclo: distancia
+    entre retornos consecutivos a la sección, relativa al tamaño de la órbita (None
+    para no buscar ciclos); periodo_forzado: período del forzamiento de un sistema no
+    autónomo; amplitud_min: una "órbita" más chica que amplitud_min (1 + |V0|) es una
+    espiral que ya llegó a un foco y se reporta como equilibrio; bloque: puntos de t
+    del primer tramo (por defecto len(t)/200; cada tramo es 1.5 veces el anterior, hasta
+    len(t)/10, porque cada llamada a odeint vuelve a arrancar con orden 1); opciones:
+    se pasan a odeint. Devuelve (sol, info): sol de forma (len(t), n) como odeint
+    (completa=False la recorta a lo integrado) e info con 'tipo' ('equilibrio', 'ciclo'
+    o None), 't_parada', 'indice' (puntos de t integrados), 'atractor' (el punto, o la
+    órbita (puntos_ciclo, n)), 'periodo' y 'nfe' (evaluaciones de f)."""
+    t = np.asarray(t, dtype=float)
+    V0 = np.atleast_1d(np.asarray(V0, dtype=float))
+    n = len(V0)
+    bloque = bloque or max(2, len(t)//200)
+    bloque_max = max(bloque, len(t)//10)
+    autonomo = periodo_forzado is None
+    nfe = [0]
+
+    def campo(V, tiempo):
+        nfe[0] += 1
+        return np.atleast_1d(np.asarray(f(V, tiempo, *args), dtype=float))
+
+    sol = np.empty((len(t), n))
+    sol[0] = V0
+    info = {'tipo': None, 'atractor': None, 'periodo': None}
+    # sección de Poincaré (autónomo) o instantes estroboscópicos t0 + kT (forzado)
+    seccion = None
+    retornos = []
+    if not autonomo:
+        estrobos = t[0] + periodo_forzado*np.arange(1, int((t[-1] - t[0])/periodo_forzado) + 1)
+    espera = (t[-1] - t[0])/5
+    h0 = 0.0
+    i = 0
+    while i < len(t) - 1:
+        j = min(i + bloque, len(t) - 1)
+        bloque = min(int(1.5*bloque), bloque_max)
+        tiempos = t[i:j + 1]
+        if not autonomo:
+            tiempos = np.union1d(tiempos, estrobos[(estrobos > t[i]) & (estrobos <= t[j])])
+        tramo, salida = odeint(f, sol[i], tiempos, args=args, h0=h0, full_output=True, **opciones)
+        h0 = salida['hu'][-1]
+        nfe[0] += int(salida['nfe'][-1])
+        if not autonomo:
+            es_estrobo = np.isin(tiempos, estrobos)
+            retornos += list(zip(tiempos[es_estrobo], tramo[es_estrobo]))
+            en_malla = np.isin(tiempos, t[i:j + 1])
+            tramo, tiempos = tramo[en_malla], tiempos[en_malla]
+        sol[i:j + 1] = tramo
+        i = j
+
+        if tol_f is not None and autonomo and np.linalg.norm(campo(tramo[-1], tiempos[-1])) < tol_f:
+            # también en unos 8 puntos del tramo, para no confundir un paso lento con un equilibrio
+            salto = max(1, len(tramo)//8)
+            if max(np.linalg.norm(campo(V, tiempo)) for V, tiempo in zip(tramo[::salto], tiempos[::salto])) < tol_f:
+                info.update(tipo='equilibrio', atractor=tramo[-1].copy())
+                break
+
+        if tol_ciclo is None:
+            continue
+        if autonomo:
+            ultimo = retornos[-1][0] if retornos else (seccion[0] if seccion else -np.inf)
+            if tiempos[-1] - ultimo > espera:
+                # sin cruces desde hace rato (o todavía sin sección): se toma en el estado actual
+                normal = campo(tramo[-1], tiempos[-1])
+                if np.linalg.norm(normal) > 0:
+                    seccion = (tiempos[-1], tramo[-1].copy(), normal/np.linalg.norm(normal))
+                    retornos = []
+                continue
+            retornos += [c for c in _cruces(tramo, tiempos, seccion[1], seccion[2], campo) if c[0] > seccion[0]]
+        if len(retornos) < 2:
+            continue
+        (ta, Va), (tb, Vb) = retornos[-2], retornos[-1]
+        # tamaño de la órbita entre los dos retornos, con los puntos de la malla
+        vuelta = sol[np.searchsorted(t, ta):i + 1][:np.searchsorted(t[np.searchsorted(t, ta):], tb)]
+        amplitud = np.ptp(np.vstack([vuelta, Va, Vb]), axis=0).max()
+        if np.linalg.norm(Vb - Va) >= tol_ciclo*max(amplitud, 1e-300):
+            continue
+        if amplitud < amplitud_min*(1 + np.linalg.norm(V0)):
+            info.update(tipo='equilibrio', atractor=np.vstack([vuelta, Vb]).mean(axis=0))
+            break
+        periodo = tb - ta if autonomo else periodo_forzado
+        # una vuelta más, fina, desde el último retorno
+        orbita, salida = odeint(f, Vb, np.linspace(tb, tb + periodo, puntos_ciclo), args=args, full_output=True,
+                                **opciones)
+        nfe[0] += int(salida['nfe'][-1])
+        info.update(tipo='ciclo', atractor=orbita, periodo=periodo, t_retorno=tb)
+        break
+
+    info.update(t_parada=t[i], indice=i + 1, nfe=nfe[0])
+    if not completa:
+        return sol[:i + 1], info
+    resto = t[i + 1:]
+    if info['tipo'] == 'equilibrio':
+        sol[i + 1:] = info['atractor']
+    elif info['tipo'] == 'ciclo':
+        fase = np.mod(resto - info['t_retorno'], info['periodo'])
+        malla = np.linspace(0, info['periodo'], puntos_ciclo)
+        for k in range(n):
+            sol[i + 1:, k] = np.interp(fase, malla, info['atractor'][:, k])
+    return sol, info
+
+
+if __name__ == "__main__":
+    # SEDO.py: x' = -y + a x (x² + y²), y' = x + a y (x² + y²), con a = -5 hasta t = 200
+    def SEDO(V, t, a):
+        x, y = V
+        return [-y + a*x*(x**2 + y**2), x + a*y*(x**2 + y**2)]
+
+    t = np.linspace(0, 200, 5000)
+    inicio = time.perf_counter()
+    completa = odeint(SEDO, [3, 0.5], t, args=(-5,))
+    t_odeint = time.perf_counter() - inicio
+    # r' = a r³: el radio decae solo como 1/sqrt(2|a|t), |f| ≈ r cerca del origen
+    inicio = time.perf_counter()
+    sol, info = odeint_convergente(SEDO, [3, 0.5], t, args=(-5,), tol_f=0.05)
+    print(f"SEDO.py (a = -5): odeint hasta t = 200 en {t_odeint*1e3:.1f} ms; con parada temprana "
+          f"{(time.perf_counter() - inicio)*1e3:.1f} ms, {info['tipo']} en t = {info['t_parada']:.1f} "
+          f"({info['indice']} de {len(t)} puntos), |x(t) - odeint| máximo "
+          f"{np.abs(sol - completa).max():.3f}")
+
+    # Hopf supercrítico: x' = -y + x(mu - r²), y' = x + y(mu - r²); ciclo límite r = sqrt(mu), período 2π
+    def hopf(V, t, mu):
+        x, y = V
+        r2 = x*x + y*y
+        return [-y + x*(mu - r2), x + y*(mu - r2)]
+
+    for V0 in ([3, 0.5], [0.01, 0]):
+        inicio = time.perf_counter()
+        sol, info = odeint_convergente(hopf, V0, t, args=(1,), rtol=1e-10, atol=1e-12)
+        radio = np.hypot(*info['atractor'].T)
+        # el ángulo gira con velocidad exactamente 1 y el radio tiende a 1
+        theta = np.arctan2(V0[1], V0[0]) + 200
+        print(f"Hopf (mu = 1) desde {V0}: {info['tipo']} en t = {info['t_parada']:.1f} "
+              f"({(time.perf_counter() - inicio)*1e3:.1f} ms), período {info['periodo']:.8f} (2π = {2*np.pi:.8f}), "
+              f"radio entre {radio.min():.8f} y {radio.max():.8f}, |V(200) - (cos, sin)(θ0 + 200)| "
+              f"{np.abs(sol[-1] - [np.cos(theta), np.sin(theta)]).max():.1e}")
+
+    # LeyNewton.py con forzamiento de período 24: el estado se repite cada 24 minutos
+    def ley_newton(x, t, k, T0, T1, w):
+        return k*(x - (T0 + T1*np.cos(w*t)))
+
+    args = (-0.2, 60, 15, np.pi/12)
+    t = np.linspace(0, 720, 2000)
+    sol, info = odeint_convergente(ley_newton, 80, t, args=args, periodo_forzado=24, rtol=1e-10, atol=1e-10)
+    referencia = odeint(ley_newton, 80, t, args=args, rtol=1e-10, atol=1e-10)
+    print(f"LeyNewton.py hasta t = 720: {info['tipo']} de período {info['periodo']} en t = {info['t_parada']:.0f}, "
+          f"rango {info['atractor'].min():.3f} a {info['atractor'].max():.3f} °F, |T(t) - odeint| máximo "
+          f"{np.abs(sol - referencia).max():.1e}")
+
+    # modelo SI (Código en Python/SImodel.py): S' = -beta S I, I' = beta S I - gamma I, una recta de equilibrios I = 0
+    def SI(V, t, beta, gamma):
+        S, I = V
+        return [-beta*S*I, beta*S*I - gamma*I]
+
+    t = np.linspace(0, 600, 3000)
+    sol, info = odeint_convergente(SI, [0.9, 0.1], t, args=(0.2, 0.1), tol_f=1e-8)
+    print(f"SI hasta t = 600: {info['tipo']} (S, I) = {np.round(info['atractor'], 6)} en t = {info['t_parada']:.0f}")
+
+    # barrido: Hopf con 40 condiciones iniciales
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 200, 5000)
+    casos = [(hopf, V0, (1,)) for V0 in rng.uniform(-3, 3, (40, 2))]
+    for nombre, opciones in [('odeint completo', None), ('con parada temprana', {})]:
+        inicio = time.perf_counter()
+        puntos = 0
+        for campo, V0, p in casos:
+            if opciones is None:
+                odeint(campo, V0, t, args=p, rtol=1e-10, atol=1e-12)
+                puntos += len(t)
+            else:
+                _, info = odeint_convergente(campo, V0, t, args=p, rtol=1e-10, atol=1e-12)
+                puntos += info['indice']
+        print(f"Barrido de {len(casos)} órbitas de Hopf hasta t = 200, {nombre}: "
+              f"{time.perf_counter() - inicio:.2f} s ({puntos/len(casos)/len(t):.0%} del horizonte integrado)")
@@ -0,0 +1,185 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.ndimage import map_coordinates
+import matplotlib.pyplot as plt
+from matplotlib import colors
+import os
+import time
+
+"""Texturas LIC (line integral convolution) para campos vectoriales densos.
+
+Con h = 0.05 en EjemploNoLineal27052025, o con los campos normalizados U1/V1, U2/V2 de
+Modelo SI/SImodel.py, las flechas y las líneas de flujo se amontonan o tardan mucho.
+La LIC pinta la dirección del campo en cada píxel: se parte de una textura de ruido y
+cada píxel se reemplaza por el promedio (con ventana de Hann) del ruido a lo largo de
+su línea de flujo, longitud píxeles hacia adelante y hacia atrás. Todos los píxeles de
+un bloque de filas avanzan juntos: cada paso es una búsqueda del vecino más cercano en
+la dirección ya normalizada y en el ruido, sin bucles en Python por píxel. Los bloques
+se pueden repartir entre procesos. Con 'regiones' la convolución se corta al cambiar
+de región, así que la textura no mezcla los dos lados de la frontera de conmutación.
+La textura (en [0, 1]) se combina con un mapa de colores de la magnitud."""
+
+# estado compartido por los procesos del pool (se copia una sola vez por proceso)
+_DATOS = {}
+
+
+def remuestrea(x, y, U, V, resolucion):
+    """Interpola bilinealmente (U, V) de la malla de ejes 1-D x, y a una malla de resolucion = (nx, ny) píxeles."""
+    nx, ny = resolucion
+    gx = np.linspace(0, len(x) - 1, nx)
+    gy = np.linspace(0, len(y) - 1, ny)
+    GY, GX = np.meshgrid(gy, gx, indexing='ij')
+    return (map_coordinates(np.asarray(U, dtype=float), [GY, GX], order=1),
+            map_coordinates(np.asarray(V, dtype=float), [GY, GX], order=1))
+
+
+def _inicia(datos):
+    _DATOS.update(datos)
+
+
+def _convoluciona_filas(fila0, fila1):
+    # LIC de las filas [fila0, fila1) con los datos de _DATOS
+    ny, nx = _DATOS['ruido'].shape
+    dx, dy, ruido = _DATOS['dx'].ravel(), _DATOS['dy'].ravel(), _DATOS['ruido'].ravel()
+    regiones, longitud = _DATOS['regiones'], _DATOS['longitud']
+    j0, i0 = np.mgrid[fila0:fila1, 0:nx]
+    j0, i0 = j0.ravel().astype(np.int32), i0.ravel().astype(np.int32)
+    k0 = j0*nx + i0
+    # ventana de Hann sobre la distancia recorrida; el peso del píxel central es 1
+    pesos = (0.5 + 0.5*np.cos(np.pi*np.arange(1, longitud + 1)/(longitud + 1))).astype(np.float32)
+    suma = ruido[k0]
+    total = np.ones(k0.size, dtype=np.float32)
+    if regiones is not None:
+        regiones = regiones.ravel()
+        region0 = regiones[k0]
+    for signo in (1.0, -1.0):
+        px, py = i0.astype(np.float32), j0.astype(np.float32)
+        k = k0.copy()
+        activos = np.ones(k0.size, dtype=bool)
+        for paso in range(longitud):
+            px += signo*dx[k]
+            py += signo*dy[k]
+            # el píxel más cercano; las líneas que salen de la imagen o de su región se detienen
+            ix = (px + 0.5).astype(np.int32)
+            iy = (py + 0.5).astype(np.int32)
+            activos &= (px > -0.5) & (ix < nx) & (py > -0.5) & (iy < ny)
+            iy *= nx
+            iy += ix
+            np.copyto(k, iy, where=activos)
+            if regiones is not None:
+                activos &= regiones[k] == region0
+            w = pesos[paso]*activos
+            suma += w*ruido[k]
+            total += w
+            if not activos.any():
+                break
+    return fila0, (suma/total).reshape(fila1 - fila0, nx)
+
+
+def lic(U, V, longitud=20, ruido=None, semilla=0, regiones=None, procesos=1, filas_bloque=32, contraste=True):
+    """Textura LIC (ny, nx) en [0, 1] del campo (U, V) dado píxel a píxel (fila j = eje y).
+
+    longitud: píxeles recorridos hacia cada lado; ruido: textura (ny, nx) propia, si no
+    se genera ruido blanco con semilla; regiones: arreglo entero (ny, nx) opcional, la
+    convolución no cruza de una región a otra; procesos: número de procesos para los
+    bloques de filas_bloque filas (1 = en este proceso); contraste: estira el
+    histograma a [0, 1] (el promedio reduce mucho la varianza del ruido)."""
+    U, V = np.asarray(U, dtype=np.float32), np.asarray(V, dtype=np.float32)
+    ny, nx = U.shape
+    # dirección unitaria en píxeles; donde el campo se anula el píxel no se mueve
+    norma = np.hypot(U, V)
+    norma[norma == 0] = np.inf
+    if ruido is None:
+        ruido = np.random.default_rng(semilla).random((ny, nx), dtype=np.float32)
+    datos = {'dx': U/norma, 'dy': V/norma, 'ruido': np.asarray(ruido, dtype=np.float32),
+             'regiones': None if regiones is None else np.asarray(regiones), 'longitud': longitud}
+
+    textura = np.empty((ny, nx), dtype=np.float32)
+    bloques = [(f, min(f + filas_bloque, ny)) for f in range(0, ny, filas_bloque)]
+    if procesos == 1:
+        _inicia(datos)
+        resultados = (_convoluciona_filas(*b) for b in bloques)
+        for fila0, bloque in resultados:
+            textura[fila0:fila0 + len(bloque)] = bloque
+        _DATOS.clear()
+    else:
+        with ProcessPoolExecutor(procesos or os.cpu_count(), initializer=_inicia, initargs=(datos,)) as pool:
+            for fila0, bloque in pool.map(_convoluciona_filas, *zip(*bloques)):
+                textura[fila0:fila0 + len(bloque)] = bloque
+    if contraste:
+        bajo, alto = np.percentile(textura, [1, 99])
+        np.clip((textura - bajo)/max(alto - bajo, 1e-12), 0, 1, out=textura)
+    return textura
+
+
+def dibuja_lic(eje, textura, ventana, magnitud=None, cmap='viridis', frontera=None, escala_log=False, mezcla=0.7):
+    """Dibuja la textura en el eje sobre la ventana (ax, bx, ay, by).
+
+    magnitud: arreglo (ny, nx) que colorea la textura con cmap (escala_log para campos
+    con magnitudes muy dispares); frontera: función h(X, Y) cuya curva de nivel cero
+    (la línea de conmutación) se dibuja encima; mezcla: peso de la textura frente al
+    color. Devuelve la imagen (para plt.colorbar)."""
+    ax, bx, ay, by = ventana
+    ny, nx = textura.shape
+    if magnitud is None:
+        imagen = eje.imshow(textura, origin='lower', extent=(ax, bx, ay, by), cmap='gray', aspect='auto')
+    else:
+        norma = colors.LogNorm() if escala_log else colors.Normalize()
+        valores = np.where(magnitud > 0, magnitud, np.nan) if escala_log else magnitud
+        norma.autoscale_None(valores[np.isfinite(valores)])
+        rgb = plt.get_cmap(cmap)(norma(valores))[..., :3]
+        rgb *= (1 - mezcla + mezcla*textura)[..., np.newaxis]
+        eje.imshow(rgb, origin='lower', extent=(ax, bx, ay, by), aspect='auto')
+        # imagen invisible solo para la barra de colores de la magnitud
+        imagen = plt.cm.ScalarMappable(norm=norma, cmap=cmap)
+    if frontera is not None:
+        xs, ys = np.linspace(ax, bx, nx), np.linspace(ay, by, ny)
+        eje.contour(xs, ys, frontera(xs[np.newaxis, :], ys[:, np.newaxis]), levels=[0], colors='black',
+                    linestyles='--', linewidths=1.5)
+    eje.set_xlim(ax, bx)
+    eje.set_ylim(ay, by)
+    return imagen
+
+
+if __name__ == "__main__":
+    n = 2048
+
+    # EjemploNoLineal27052025: x' = -x + x³, y' = -2y en [-2, 2]² con h = 0.05 (81 x 81 vectores)
+    ventana = (-2, 2, -2, 2)
+    h = 0.05
+    xs, ys = np.arange(-2, 2 + h, h), np.arange(-2, 2 + h, h)
+    X, Y = np.meshgrid(xs, ys)
+    U, V = remuestrea(xs, ys, -X + X**3, -2*Y, (n, n))
+    inicio = time.perf_counter()
+    textura = lic(U, V, longitud=20)
+    print(f"EjemploNoLineal27052025: LIC de {n} x {n} en {time.perf_counter() - inicio:.2f} s")
+    for procesos in (2, 4):
+        inicio = time.perf_counter()
+        otra = lic(U, V, longitud=20, procesos=procesos)
+        print(f"  con {procesos} procesos: {time.perf_counter() - inicio:.2f} s "
+              f"({os.cpu_count()} núcleos), igual: {np.array_equal(textura, otra)}")
+
+    fig, ejes = plt.subplots(1, 2, figsize=(16, 7))
+    imagen = dibuja_lic(ejes[0], textura, ventana, magnitud=np.hypot(U, V), escala_log=True)
+    fig.colorbar(imagen, ax=ejes[0], label='|f|')
+    ejes[0].scatter([-1, 0, 1], [0, 0, 0], color='red', zorder=3)
+    ejes[0].set_title('EjemploNoLineal27052025')
+
+    # Modelo SI: campo 1 para y < w y campo 2 (con el control u) para y > w, evaluados píxel a píxel
+    w, R0, mu, theta, u = 0.3, 1.5, 0.2, 0.15, 0.1
+    ventana = (0, 1, 0, 1)
+    x = np.linspace(0, 1, n)[np.newaxis, :]
+    y = np.linspace(0, 1, n)[:, np.newaxis]
+    regiones = np.broadcast_to(y > w, (n, n)).astype(np.int8)
+    U = mu*(1 - x) - (mu + theta)*R0*x*y
+    V = (mu + theta)*y*(R0*x - 1) - u*regiones
+    inicio = time.perf_counter()
+    textura = lic(U, V, longitud=20, regiones=regiones)
+    print(f"Modelo SI (dos regiones): LIC de {n} x {n} en {time.perf_counter() - inicio:.2f} s")
+    imagen = dibuja_lic(ejes[1], textura, ventana, magnitud=np.hypot(U, V), cmap='magma',
+                        frontera=lambda X, Y: Y - w + 0*X)
+    fig.colorbar(imagen, ax=ejes[1], label='|f|')
+    ejes[1].plot([0, 1], [1, 0], color='black', linewidth=2)
+    ejes[1].set_title(f'Modelo SI, frontera y = {w}')
+    plt.tight_layout()
+    plt.show()
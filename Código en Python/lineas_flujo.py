@@ -0,0 +1,243 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+import time
+
+"""Líneas de flujo vectorizadas en NumPy, para reemplazar plt.streamplot en mallas grandes.
+
+plt.streamplot domina el tiempo de CampoVectoria2D.py (malla de 501 x 501) y de los
+scripts de Filippov, que lo llaman dos veces (una por región). Además traza cada línea
+por separado en Python. Aquí se siguen las mismas reglas: una máscara de ocupación de
+30*densidad celdas por eje, semillas en las celdas libres desde el borde hacia adentro,
+paso en unidades de la máscara, y una línea se corta al entrar en una celda ocupada por
+otra. La diferencia es que las semillas se procesan por lotes y todas las líneas activas
+de un lote (hacia adelante y hacia atrás) avanzan juntas con RK4 sobre el campo
+interpolado bilinealmente; después se registran una por una en el orden de las
+semillas, así que el resultado es el de trazarlas de a una. Con 'regiones' (un arreglo entero sobre la malla) una línea
+también se corta al cambiar de región, así que el campo por partes de un sistema de
+Filippov (y < w con un campo, y > w con el otro) se traza en una sola pasada. El
+resultado se dibuja como una sola LineCollection."""
+
+
+def _bilineal(campo, gx, gy):
+    # interpolación bilineal de campo (ny, nx, 2) en coordenadas de malla (gx, gy), ya dentro de la malla
+    ny, nx = campo.shape[:2]
+    i = np.minimum(gx.astype(np.intp), nx - 2)
+    j = np.minimum(gy.astype(np.intp), ny - 2)
+    fx, fy = (gx - i)[:, np.newaxis], (gy - j)[:, np.newaxis]
+    abajo = campo[j, i] + (campo[j, i + 1] - campo[j, i])*fx
+    arriba = campo[j + 1, i] + (campo[j + 1, i + 1] - campo[j + 1, i])*fx
+    return abajo + (arriba - abajo)*fy
+
+
+def _orden_semillas(nmx, nmy):
+    # de afuera hacia adentro, como la espiral de streamplot
+    j, i = np.mgrid[0:nmy, 0:nmx]
+    anillo = np.minimum(np.minimum(i, nmx - 1 - i), np.minimum(j, nmy - 1 - j))
+    orden = np.lexsort((i.ravel(), j.ravel(), anillo.ravel()))
+    return i.ravel()[orden], j.ravel()[orden]
+
+
+def lineas_flujo(x, y, U, V, densidad=1.0, regiones=None, paso=0.5, longitud_min=0.1, lote=64, separacion=3,
+                 max_pasos=None):
+    """Líneas de flujo de (U, V) sobre la malla regular de ejes 1-D x, y (como streamplot).
+
+    densidad: escalar o (dx, dy); regiones: arreglo entero (ny, nx) opcional, las líneas
+    no cruzan de una región a otra; longitud_min: longitud mínima como fracción del ancho
+    de los ejes; lote: semillas que avanzan juntas, a no menos de separacion celdas de la
+    máscara entre sí. Devuelve una lista de polilíneas (k, 2) en coordenadas físicas."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    U, V = np.asarray(U, dtype=float), np.asarray(V, dtype=float)
+    nx, ny = len(x), len(y)
+    dens_x, dens_y = np.broadcast_to(densidad, 2)
+    nmx, nmy = max(2, int(30*dens_x)), max(2, int(30*dens_y))
+    # velocidad en unidades de celdas de la máscara por unidad de tiempo
+    sx, sy = (nmx - 1)/(nx - 1), (nmy - 1)/(ny - 1)
+    campo = np.stack([U/(x[1] - x[0])*sx, V/(y[1] - y[0])*sy], axis=-1)
+    max_pasos = max_pasos or int(4*(nmx + nmy)/paso)
+
+    def velocidad(P, signo):
+        # las etapas intermedias de RK4 pueden salir un poco de la malla
+        gx = np.minimum(np.maximum(P[:, 0], 0), nmx - 1)/sx
+        gy = np.minimum(np.maximum(P[:, 1], 0), nmy - 1)/sy
+        uv = _bilineal(campo, gx, gy)
+        rapidez = np.sqrt((uv*uv).sum(axis=1))
+        # con rapidez 0 la dirección queda en 0 y la línea se corta después del paso
+        return uv*(signo/np.where(rapidez > 0, rapidez, np.inf))[:, np.newaxis], rapidez
+
+    def region(P):
+        if regiones is None:
+            return np.zeros(len(P), dtype=int)
+        gi = np.clip(np.rint(P[:, 0]/sx).astype(int), 0, nx - 1)
+        gj = np.clip(np.rint(P[:, 1]/sy).astype(int), 0, ny - 1)
+        return regiones[gj, gi]
+
+    ocupacion = np.full((nmy, nmx), -1, dtype=np.int64)
+    semillas_i, semillas_j = _orden_semillas(nmx, nmy)
+    lineas = []
+    siguiente_id = 0
+    # una semilla ya probada no se repite: con más celdas ocupadas su línea solo puede salir más corta
+    probada = np.zeros(len(semillas_i), dtype=bool)
+    for pasada in range(3):
+        # cada pasada vuelve a recorrer las celdas que liberaron las líneas cortas
+        lineas_antes = len(lineas)
+        puntero = 0
+        while puntero < len(semillas_i):
+            # siguiente lote de celdas libres, separadas entre sí para que no se corten de inmediato;
+            # las que se saltan por la separación quedan para el lote siguiente, que empieza en la primera
+            libres = []
+            saltada = None
+            reservado = np.zeros((nmy, nmx), dtype=bool)
+            candidatas = puntero + np.flatnonzero(~probada[puntero:] &
+                                                  (ocupacion[semillas_j[puntero:], semillas_i[puntero:]] == -1))
+            puntero = len(semillas_i)
+            for c in candidatas:
+                i, j = semillas_i[c], semillas_j[c]
+                if not reservado[j, i]:
+                    libres.append(c)
+                    probada[c] = True
+                    reservado[max(0, j - separacion):j + separacion + 1,
+                              max(0, i - separacion):i + separacion + 1] = True
+                    if len(libres) == lote:
+                        puntero = c + 1
+                        break
+                elif saltada is None:
+                    saltada = c
+            if saltada is not None:
+                puntero = saltada
+            if not libres:
+                continue
+            k = len(libres)
+            ids = siguiente_id + np.arange(k)
+            siguiente_id += k
+            inicio = np.column_stack([semillas_i[libres], semillas_j[libres]]).astype(float)
+
+            # 2k medias líneas: hacia adelante y hacia atrás desde cada semilla. Aquí solo las
+            # cortan las líneas de lotes anteriores; el cruce entre líneas del mismo lote se
+            # resuelve abajo, al registrarlas una por una
+            P = np.concatenate([inicio, inicio])
+            signo = np.concatenate([np.ones(k), -np.ones(k)])
+            region0 = region(P)
+            vivas = np.arange(2*k)
+            tray = np.full((max_pasos + 1, 2*k, 2), np.nan)
+            tray[0] = P
+            for n in range(1, max_pasos + 1):
+                Pa = P[vivas]
+                s = signo[vivas]
+                k1, r1 = velocidad(Pa, s)
+                k2, r2 = velocidad(Pa + 0.5*paso*k1, s)
+                k3, r3 = velocidad(Pa + 0.5*paso*k2, s)
+                k4, r4 = velocidad(Pa + paso*k3, s)
+                nuevo = Pa + paso/6*(k1 + 2*k2 + 2*k3 + k4)
+                ok = np.minimum(np.minimum(r1, r2), np.minimum(r3, r4)) > 1e-12
+                ok &= (nuevo[:, 0] >= 0) & (nuevo[:, 0] <= nmx - 1) & (nuevo[:, 1] >= 0) & (nuevo[:, 1] <= nmy - 1)
+                indices = vivas[ok]
+                nuevo = nuevo[ok]
+                # se corta al entrar en una celda de la máscara ya ocupada
+                ci = (nuevo[:, 0] + 0.5).astype(np.intp)
+                cj = (nuevo[:, 1] + 0.5).astype(np.intp)
+                sigue = ocupacion[cj, ci] == -1
+                if regiones is not None:
+                    sigue &= region(nuevo) == region0[indices]
+                vivas = indices[sigue]
+                P[vivas] = nuevo[sigue]
+                tray[n, vivas] = P[vivas]
+                if vivas.size == 0:
+                    break
+            tray = tray[:n + 1]
+
+            # registrar las líneas en el orden de las semillas, como streamplot: una semilla que
+            # ya cubrió otra línea del lote se descarta, y cada media línea se corta en la
+            # primera celda de otra línea. La media línea hacia atrás va invertida y luego la de adelante
+            validos = np.isfinite(tray[:, :, 0]).sum(axis=0)
+            for m in range(k):
+                if ocupacion[semillas_j[libres[m]], semillas_i[libres[m]]] != -1:
+                    continue
+                medias = []
+                for columna in (k + m, m):
+                    puntos = tray[:validos[columna], columna]
+                    ci = (puntos[:, 0] + 0.5).astype(np.intp)
+                    cj = (puntos[:, 1] + 0.5).astype(np.intp)
+                    duenos = ocupacion[cj, ci]
+                    cortes = np.flatnonzero((duenos != -1) & (duenos != ids[m]))
+                    fin = cortes[0] if cortes.size else len(puntos)
+                    ocupacion[cj[:fin], ci[:fin]] = ids[m]
+                    medias.append(puntos[:fin])
+                linea = np.concatenate([medias[0][::-1], medias[1][1:]])
+                largo = np.hypot(*np.diff(linea, axis=0).T).sum()/(nmx - 1)
+                if largo < longitud_min:
+                    # las líneas demasiado cortas liberan sus celdas de inmediato
+                    ocupacion[ocupacion == ids[m]] = -1
+                    continue
+                lineas.append(np.column_stack([x[0] + linea[:, 0]/sx*(x[1] - x[0]),
+                                               y[0] + linea[:, 1]/sy*(y[1] - y[0])]))
+        if len(lineas) == lineas_antes:
+            break
+    return lineas
+
+
+def dibuja_lineas_flujo(eje, lineas, color=(0/255, 180/255, 250/255), linewidth=0.6, flechas=True):
+    """Agrega las líneas al eje como una LineCollection, con una flecha a la mitad de cada una."""
+    eje.add_collection(LineCollection(lineas, colors=[color], linewidths=linewidth))
+    if flechas and lineas:
+        medios = np.array([l[len(l)//2] for l in lineas])
+        direcciones = np.array([l[min(len(l) - 1, len(l)//2 + 1)] - l[len(l)//2] for l in lineas])
+        direcciones /= np.maximum(np.hypot(*direcciones.T), 1e-300)[:, np.newaxis]
+        eje.quiver(medios[:, 0], medios[:, 1], direcciones[:, 0], direcciones[:, 1], color=color,
+                   angles='xy', pivot='mid', headwidth=6, headlength=7, width=0.003, scale=60)
+    eje.autoscale_view()
+
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    # tiempos de cálculo de las líneas y de agregarlas a los ejes (el dibujo final cuesta lo mismo)
+    fig, ejes = plt.subplots(2, 2, figsize=(12, 11))
+
+    # CampoVectoria2D.py: malla de 501 x 501
+    h = 1
+    x = np.arange(0, 500 + h, h)
+    X, Y = np.meshgrid(x, x)
+    dXdt, dYdt = 2*X - Y, X + 4*Y
+    inicio = time.perf_counter()
+    ejes[0, 0].streamplot(X, Y, dXdt, dYdt, color=(0/255, 180/255, 250/255), linewidth=0.6)
+    t_streamplot = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    lineas = lineas_flujo(x, x, dXdt, dYdt)
+    dibuja_lineas_flujo(ejes[0, 1], lineas)
+    t_propio = time.perf_counter() - inicio
+    print(f"CampoVectoria2D.py (501 x 501): streamplot {t_streamplot:.2f} s, lineas_flujo {t_propio:.2f} s "
+          f"({len(lineas)} líneas), {t_streamplot/t_propio:.1f}x")
+    for eje in ejes[0]:
+        eje.set_xlim(0, 500)
+        eje.set_ylim(0, 500)
+    ejes[0, 0].set_title('plt.streamplot')
+    ejes[0, 1].set_title('lineas_flujo')
+
+    # sistemaFilippov.py: las dos regiones de y = 3 en una sola pasada
+    w = 3
+    xs, ys = np.arange(-15, 20 + 0.05, 0.05), np.arange(0, 6 + 0.05, 0.05)
+    X, Y = np.meshgrid(xs, ys)
+    abajo = Y < w
+    U = np.where(abajo, 2*X - Y, X + 2*Y)
+    V = np.where(abajo, X + 4*Y, -X + Y)
+    inicio = time.perf_counter()
+    X1, Y1 = np.meshgrid(xs, ys[ys <= w])
+    X2, Y2 = np.meshgrid(xs, ys[ys >= w])
+    ejes[1, 0].streamplot(X1, Y1, 2*X1 - Y1, X1 + 4*Y1, color='red', linewidth=0.6, density=1.2)
+    ejes[1, 0].streamplot(X2, Y2, X2 + 2*Y2, -X2 + Y2, color='green', linewidth=0.6, density=1.2)
+    t_streamplot = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    lineas = lineas_flujo(xs, ys, U, V, densidad=1.2, regiones=(~abajo).astype(int))
+    rojas = [l for l in lineas if l[:, 1].mean() < w]
+    verdes = [l for l in lineas if l[:, 1].mean() >= w]
+    dibuja_lineas_flujo(ejes[1, 1], rojas, color='red')
+    dibuja_lineas_flujo(ejes[1, 1], verdes, color='green')
+    t_propio = time.perf_counter() - inicio
+    print(f"sistemaFilippov.py (dos regiones): 2 x streamplot {t_streamplot:.2f} s, lineas_flujo en una pasada "
+          f"{t_propio:.2f} s ({len(lineas)} líneas), {t_streamplot/t_propio:.1f}x")
+    for eje in ejes[1]:
+        eje.axhline(y=w, color='black', linestyle='--', linewidth=2)
+        eje.set_xlim(-15, 20)
+        eje.set_ylim(0, 6)
+    plt.tight_layout()
+    plt.show()
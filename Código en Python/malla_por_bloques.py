@@ -0,0 +1,187 @@
+import numpy as np
+import os
+import time
+import tracemalloc
+
+"""Evaluación del campo sobre mallas enormes por bloques de filas, con memoria acotada.
+
+Los scripts arman X, Y = np.meshgrid(...) completos en float64, y después dXdt, dYdt,
+N1 = np.sqrt(U1**2 + V1**2), np.where(...) y U1/N1 crean más copias del mismo tamaño.
+Con h = 0.01 sobre [0, 500]² (CampoVectoria2D.py) son 2.5e9 puntos, decenas de GB.
+Aquí no hay meshgrid: x es un eje 1-D de forma (1, nx) y cada bloque de filas de y es
+de forma (filas, 1), así que el campo se evalúa por broadcasting. Los ejes quedan en
+float64 (en float32 el espaciado deja de ser uniforme y streamplot los rechaza); solo
+U y V van en el dtype pedido. El número de filas por bloque sale del presupuesto de
+memoria, que cubre los búferes del bloque, los temporales de campo(x, y) (en float64)
+y los ejes. Los búferes del bloque se reutilizan y la normalización se hace en el
+lugar (operaciones con out). Los bloques se entregan uno a uno, se copian a un .npy
+mapeado en memoria o se promedian por celdas de reduccion x reduccion píxeles para el
+dibujo (streamplot, lic.py)."""
+
+# arreglos del tamaño de un bloque que se cuentan en el presupuesto: U, V y dos búferes
+# para la norma (en dtype), más los temporales que campo(x, y) puede tener vivos a la vez
+# (la primera componente ya calculada y dos intermedios de la segunda, en float64 como los ejes)
+ARREGLOS_POR_BLOQUE = 4
+TEMPORALES_CAMPO = 3
+
+
+def ejes_malla(ventana, h):
+    """Ejes 1-D de la malla (float64), los mismos puntos que np.arange(ax, bx + h, h) de los scripts."""
+    ax, bx, ay, by = ventana
+    # la longitud de np.arange(a, b + h, h) sin construirlo
+    nx = int(np.ceil((bx + h - ax)/h))
+    ny = int(np.ceil((by + h - ay)/h))
+    return ax + h*np.arange(nx), ay + h*np.arange(ny)
+
+
+def filas_por_bloque(nx, presupuesto_mb, dtype=np.float32, multiplo=1, reservado=0):
+    """Filas por bloque para que los búferes y temporales de (filas, nx) quepan en el presupuesto.
+
+    reservado: bytes del presupuesto que ya ocupan otros arreglos (ejes, etc.)."""
+    por_fila = nx*(ARREGLOS_POR_BLOQUE*np.dtype(dtype).itemsize + TEMPORALES_CAMPO*8)
+    filas = int((presupuesto_mb*2**20 - reservado)//por_fila)//multiplo*multiplo
+    if filas < multiplo:
+        raise ValueError(f"presupuesto de {presupuesto_mb} MB insuficiente: una fila de la malla ocupa "
+                         f"{por_fila*multiplo/2**20:.1f} MB")
+    return filas
+
+
+def bloques_campo(campo, ventana, h, presupuesto_mb=256, dtype=np.float32, normaliza=False, multiplo=1):
+    """Recorre la malla por bloques de filas: produce (fila0, x, y_bloque, U, V).
+
+    campo(X, Y) -> (U, V) vectorizado con broadcasting (X de forma (1, nx), Y de forma
+    (filas, 1)); normaliza: divide por la norma en el lugar (donde la norma es 0 el
+    vector queda en 0, como con np.where(N == 0, 1, N) en los scripts). U y V son búferes que se reutilizan:
+    hay que copiarlos antes de pedir el siguiente bloque."""
+    x, y = ejes_malla(ventana, h)
+    nx, ny = len(x), len(y)
+    # ejes de aquí y de campo_por_bloques, y los temporales de una fila o columna de campo(x, y)
+    reservado = (nx + ny)*(2 + 4)*8
+    filas = min(filas_por_bloque(nx, presupuesto_mb, dtype, multiplo, reservado), ny)
+    U = np.empty((filas, nx), dtype=dtype)
+    V = np.empty((filas, nx), dtype=dtype)
+    N = np.empty((filas, nx), dtype=dtype)
+    W = np.empty((filas, nx), dtype=dtype)
+    fila_x = x[np.newaxis, :]
+    for fila0 in range(0, ny, filas):
+        fila1 = min(fila0 + filas, ny)
+        u, v, n, w = U[:fila1 - fila0], V[:fila1 - fila0], N[:fila1 - fila0], W[:fila1 - fila0]
+        y_bloque = y[fila0:fila1, np.newaxis]
+        cu, cv = campo(fila_x, y_bloque)
+        np.copyto(u, cu, casting='same_kind')
+        del cu
+        np.copyto(v, cv, casting='same_kind')
+        del cv
+        if normaliza:
+            # sqrt(u² + v²) con los dos búferes (np.hypot es varias veces más lento);
+            # donde la norma es 0 también u = v = 0 y el cociente queda en 0
+            np.multiply(u, u, out=n)
+            np.multiply(v, v, out=w)
+            n += w
+            np.sqrt(n, out=n)
+            np.maximum(n, np.finfo(dtype).tiny, out=n)
+            np.divide(u, n, out=u)
+            np.divide(v, n, out=v)
+        yield fila0, x, y_bloque[:, 0], u, v
+
+
+def campo_por_bloques(campo, ventana, h, destino=None, reduccion=1, presupuesto_mb=256, dtype=np.float32,
+                      normaliza=False):
+    """Campo (U, V) sobre toda la malla, evaluado por bloques: devuelve (x, y, U, V).
+
+    destino: None para arreglos en memoria, o la ruta de un .npy que se crea mapeado en
+    memoria con forma (2, ny, nx) (U y V son vistas de ese archivo); reduccion: promedia
+    celdas de reduccion x reduccion puntos (las filas y columnas sobrantes del borde se
+    descartan) y devuelve también los ejes promediados, útil para dibujar una malla que
+    no cabe en memoria."""
+    x, y = ejes_malla(ventana, h)
+    r = reduccion
+    nx, ny = len(x)//r, len(y)//r
+    if destino is None:
+        salida = np.empty((2, ny, nx), dtype=dtype)
+    else:
+        salida = np.lib.format.open_memmap(destino, mode='w+', dtype=dtype, shape=(2, ny, nx))
+    for fila0, _, _, U, V in bloques_campo(campo, ventana, h, presupuesto_mb, dtype, normaliza, multiplo=r):
+        filas = min(len(U), ny*r - fila0)//r
+        if filas <= 0:
+            break
+        for k, C in enumerate((U, V)):
+            if r == 1:
+                salida[k, fila0:fila0 + filas] = C[:filas]
+            else:
+                # suma por celdas escrita directo en la salida, sin temporales del tamaño del bloque
+                celdas = C[:filas*r, :nx*r].reshape(filas, r, nx, r)
+                destino_celdas = salida[k, fila0//r:fila0//r + filas]
+                np.sum(celdas, axis=(1, 3), out=destino_celdas)
+                destino_celdas /= r*r
+    if destino is not None:
+        salida.flush()
+    if r > 1:
+        x = x[:nx*r].reshape(nx, r).mean(axis=1)
+        y = y[:ny*r].reshape(ny, r).mean(axis=1)
+    return x, y, salida[0], salida[1]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import matplotlib.pyplot as plt
+    from lic import lic, dibuja_lic
+
+    # CampoVectoria2D.py (depredador-presa) en [0, 500]²
+    a, b, c, d = 2, -1, 1, 4
+    ventana = (0, 500, 0, 500)
+
+    def campo(X, Y):
+        return a*X + b*Y, c*X + d*Y
+
+    # malla completa como en los scripts (float64, meshgrid, norma con np.where) contra los bloques
+    h = 0.5
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    X, Y = np.meshgrid(np.arange(0, 500 + h, h), np.arange(0, 500 + h, h))
+    U1, V1 = campo(X, Y)
+    N1 = np.sqrt(U1**2 + V1**2)
+    N1 = np.where(N1 == 0, 1, N1)
+    U1, V1 = U1/N1, V1/N1
+    duracion = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    del X, Y, N1
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    x, y, U, V = campo_por_bloques(campo, ventana, h, presupuesto_mb=16, normaliza=True)
+    print(f"h = {h} ({U.size:.2e} puntos): meshgrid float64 {duracion:.2f} s con pico de {pico/2**20:.0f} MB; "
+          f"por bloques float32 {time.perf_counter() - inicio:.2f} s con pico de "
+          f"{(tracemalloc.get_traced_memory()[1] - base - U.nbytes - V.nbytes)/2**20:.1f} MB además del "
+          f"resultado ({(U.nbytes + V.nbytes)/2**20:.0f} MB); diferencia máxima {np.abs(U - U1).max():.1e}")
+    del U1, V1, U, V
+
+    # h = 0.1 directo a un .npy mapeado en memoria
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, 'campo.npy')
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        x, y, U, V = campo_por_bloques(campo, ventana, 0.1, destino=ruta, presupuesto_mb=64, normaliza=True)
+        print(f"h = 0.1 ({U.size:.2e} puntos) a {os.path.basename(ruta)}: {time.perf_counter() - inicio:.2f} s, "
+              f"{os.path.getsize(ruta)/2**20:.0f} MB en disco, pico de memoria "
+              f"{(tracemalloc.get_traced_memory()[1] - base)/2**20:.1f} MB (presupuesto 64 MB)")
+        del U, V
+
+    # h = 0.01 (2.5e9 puntos, unos 50 GB en float64 con meshgrid): promedio por celdas de 25 x 25
+    # puntos directo a una malla de 2000 x 2000 para la LIC
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    x, y, U, V = campo_por_bloques(campo, ventana, 0.01, reduccion=25, presupuesto_mb=128, normaliza=True)
+    print(f"h = 0.01 ({len(np.arange(0, 500.01, 0.01))**2:.2e} puntos) reducido a {U.shape}: "
+          f"{time.perf_counter() - inicio:.1f} s, pico de memoria "
+          f"{(tracemalloc.get_traced_memory()[1] - base - U.nbytes - V.nbytes)/2**20:.1f} MB además del resultado "
+          f"(presupuesto 128 MB)")
+    tracemalloc.stop()
+
+    fig, eje = plt.subplots(figsize=(8, 7))
+    imagen = dibuja_lic(eje, lic(U, V), ventana, magnitud=np.hypot(*campo(x[np.newaxis, :], y[:, np.newaxis])))
+    fig.colorbar(imagen, ax=eje, label='|f|')
+    eje.set_title('CampoVectoria2D.py, h = 0.01 por bloques')
+    plt.show()
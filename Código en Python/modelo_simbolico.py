@@ -0,0 +1,166 @@
+import numpy as np
+import hashlib
+import importlib.util
+import os
+import time
+
+"""Modelos declarados una sola vez: lado derecho, campo sobre la malla y jacobiano generados.
+
+Cada script define el campo dos veces, como lineal/NoLineal/rojo/azul para odeint y de
+nuevo a mano para la malla (dXdt = X - Y; dYdt = X**2*Y - 4*X), y las dos copias se
+desincronizan. Aquí el modelo se declara con cadenas (expresiones de SymPy) y nombres
+de parámetros, y se genera código Python con subexpresiones comunes (cse) para:
+
+    rhs(V, t, *p)              lado derecho para odeint (con math, escalar)
+    rhs_ivp(t, V, *p)          el mismo con el orden de solve_ivp
+    jacobiano_rhs(V, t, *p)    jacobiano escalar (Dfun de odeint)
+    jacobiano_ivp(t, V, *p)    el mismo con el orden de solve_ivp (jac de Radau, BDF, LSODA)
+    campo(x, y, *p, out=None)  campo sobre arreglos con broadcasting; escribe en out si se da
+    jacobiano(x, y, *p)        jacobiano sobre arreglos, de forma (..., n, n)
+
+El código generado se guarda en __pycache__/modelos con el hash de las expresiones
+(y de VERSION_GENERADOR) como nombre. Si ya existe, se importa directamente, sin cargar SymPy."""
+
+CARPETA_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__', 'modelos')
+
+# versión del código generado: entra en el hash, así un cambio en _genera_codigo no
+# reutiliza los modelos viejos de la caché en disco
+VERSION_GENERADOR = 2
+
+# modelos ya cargados en esta sesión
+_MODELOS = {}
+
+
+def _genera_codigo(expresiones, variables, parametros):
+    import sympy as sp
+    from sympy.printing.pycode import PythonCodePrinter
+    from sympy.printing.numpy import NumPyPrinter
+
+    simbolos = {nombre: sp.Symbol(nombre) for nombre in (*variables, *parametros)}
+    f = [sp.sympify(e, locals=simbolos) for e in expresiones]
+    vs = [simbolos[v] for v in variables]
+    J = [[sp.diff(fi, v) for v in vs] for fi in f]
+    n = len(variables)
+    args = ', '.join(parametros)
+    coma = ', ' if parametros else ''
+    escalar, vectorial = PythonCodePrinter(), NumPyPrinter()
+
+    def cuerpo(exprs, impresora, sangria='    '):
+        reemplazos, reducidas = sp.cse(exprs, symbols=sp.numbered_symbols('_c'))
+        lineas = [f"{sangria}{s} = {impresora.doprint(e)}" for s, e in reemplazos]
+        return lineas, [impresora.doprint(e) for e in reducidas]
+
+    desempaque = f"    {', '.join(variables)}{',' if n == 1 else ''} = V"
+    codigo = ["import math", "import numpy", "",
+              f"# modelo: {list(expresiones)}; variables {list(variables)}; parámetros {list(parametros)}", ""]
+
+    lineas, res = cuerpo(f, escalar)
+    codigo += [f"def rhs(V, t{coma}{args}):", desempaque, *lineas, f"    return [{', '.join(res)}]", ""]
+    codigo += [f"def rhs_ivp(t, V{coma}{args}):", f"    return rhs(V, t{coma}{args})", ""]
+
+    lineas, res = cuerpo([J[i][j] for i in range(n) for j in range(n)], escalar)
+    filas = ', '.join('[' + ', '.join(res[i*n:(i + 1)*n]) + ']' for i in range(n))
+    codigo += [f"def jacobiano_rhs(V, t{coma}{args}):", desempaque, *lineas, f"    return [{filas}]", ""]
+    codigo += [f"def jacobiano_ivp(t, V{coma}{args}):", f"    return jacobiano_rhs(V, t{coma}{args})", ""]
+
+    lineas, res = cuerpo(f, vectorial)
+    codigo += [f"def campo({', '.join(variables)}{coma}{args}, out=None):",
+               "    if out is None:",
+               f"        forma = numpy.broadcast({', '.join((*variables, *parametros))}).shape",
+               f"        out = tuple(numpy.empty(forma) for _ in range({n}))",
+               *lineas, *[f"    out[{i}][...] = {r}" for i, r in enumerate(res)], "    return out", ""]
+
+    lineas, res = cuerpo([J[i][j] for i in range(n) for j in range(n)], vectorial)
+    codigo += [f"def jacobiano({', '.join(variables)}{coma}{args}):",
+               f"    forma = numpy.broadcast({', '.join((*variables, *parametros))}).shape",
+               f"    J = numpy.empty(forma + ({n}, {n}))",
+               *lineas, *[f"    J[..., {k // n}, {k % n}] = {r}" for k, r in enumerate(res)], "    return J", ""]
+    return "\n".join(codigo)
+
+
+def compila_modelo(expresiones, variables=('x', 'y'), parametros=None):
+    """Genera (o carga de la caché en disco) las funciones de un modelo.
+
+    expresiones: cadenas con el lado derecho de cada variable, por ejemplo
+    ('x - y', 'x**2*y - 4*x'); parametros: diccionario nombre -> valor por defecto
+    (el orden es el de los argumentos *p). Devuelve un diccionario con 'rhs', 'rhs_ivp',
+    'jacobiano_rhs', 'jacobiano_ivp', 'campo', 'jacobiano', 'variables', 'parametros' (nombres),
+    'valores' (los valores por defecto en orden), 'clave' y 'ruta' del código generado."""
+    parametros = dict(parametros or {})
+    expresiones, variables = tuple(expresiones), tuple(variables)
+    clave = hashlib.sha256(repr((VERSION_GENERADOR, expresiones, variables, tuple(parametros))).encode()).hexdigest()[:16]
+    if clave not in _MODELOS:
+        ruta = os.path.join(CARPETA_CACHE, f"modelo_{clave}.py")
+        if not os.path.exists(ruta):
+            os.makedirs(CARPETA_CACHE, exist_ok=True)
+            codigo = _genera_codigo(expresiones, variables, tuple(parametros))
+            # escritura atómica: otro proceso puede estar generando el mismo modelo
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            with open(temporal, 'w') as archivo:
+                archivo.write(codigo)
+            os.replace(temporal, ruta)
+        spec = importlib.util.spec_from_file_location(f"modelo_{clave}", ruta)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        _MODELOS[clave] = {'rhs': modulo.rhs, 'rhs_ivp': modulo.rhs_ivp, 'jacobiano_rhs': modulo.jacobiano_rhs,
+                           'jacobiano_ivp': modulo.jacobiano_ivp, 'campo': modulo.campo,
+                           'jacobiano': modulo.jacobiano, 'variables': variables,
+                           'parametros': tuple(parametros), 'clave': clave, 'ruta': ruta}
+    return dict(_MODELOS[clave], valores=tuple(parametros.values()))
+
+
+if __name__ == "__main__":
+    from scipy.integrate import odeint
+
+    # Ejemplo1NoLineal.py declarado una sola vez
+    inicio = time.perf_counter()
+    modelo = compila_modelo(('x - y', 'x**2*y - 4*x'))
+    t_primera = time.perf_counter() - inicio
+    _MODELOS.clear()
+    inicio = time.perf_counter()
+    modelo = compila_modelo(('x - y', 'x**2*y - 4*x'))
+    t_cache = time.perf_counter() - inicio
+    print(f"Ejemplo1NoLineal.py: compilación {t_primera*1e3:.1f} ms, desde la caché en disco {t_cache*1e3:.1f} ms "
+          f"({os.path.basename(modelo['ruta'])})")
+
+    # el campo sobre la malla contra el escrito a mano, reutilizando los búferes
+    h = 0.2
+    X, Y = np.meshgrid(np.arange(-10, 10 + h, h), np.arange(-10, 10 + h, h))
+    buferes = (np.empty_like(X), np.empty_like(X))
+    dXdt, dYdt = modelo['campo'](X, Y, out=buferes)
+    print(f"  campo igual al escrito a mano: {np.allclose(dXdt, X - Y) and np.allclose(dYdt, X**2*Y - 4*X)}, "
+          f"escrito en los búferes: {dXdt is buferes[0]}")
+
+    # jacobiano contra diferencias centradas
+    J = modelo['jacobiano'](X, Y)
+    e = 1e-6
+    Jx = (np.stack(modelo['campo'](X + e, Y), -1) - np.stack(modelo['campo'](X - e, Y), -1))/(2*e)
+    Jy = (np.stack(modelo['campo'](X, Y + e), -1) - np.stack(modelo['campo'](X, Y - e), -1))/(2*e)
+    print(f"  jacobiano: diferencia relativa con diferencias centradas "
+          f"{np.abs(J - np.stack([Jx, Jy], -1)).max()/np.abs(J).max():.1e}")
+
+    # odeint con y sin el jacobiano generado, en un sistema rígido (Van der Pol con mu grande)
+    van_der_pol = compila_modelo(('y', 'mu*(1 - x**2)*y - x'), parametros={'mu': 1000})
+    t = np.linspace(0, 3000, 2000)
+    for nombre, Dfun in [('sin jacobiano', None), ('con jacobiano', van_der_pol['jacobiano_rhs'])]:
+        inicio = time.perf_counter()
+        sol, info = odeint(van_der_pol['rhs'], [2, 0], t, args=van_der_pol['valores'], Dfun=Dfun,
+                           full_output=True)
+        print(f"  Van der Pol (mu = 1000), odeint {nombre}: {(time.perf_counter() - inicio)*1e3:.1f} ms, "
+              f"{info['nfe'][-1]} evaluaciones del lado derecho, {info['nje'][-1]} del jacobiano, "
+              f"x(3000) = {sol[-1, 0]:.6f}")
+
+    # solve_ivp implícito con el jacobiano en su orden (t, V)
+    from scipy.integrate import solve_ivp
+    for nombre, jac in [('sin jacobiano', None), ('con jacobiano', van_der_pol['jacobiano_ivp'])]:
+        inicio = time.perf_counter()
+        sol = solve_ivp(van_der_pol['rhs_ivp'], [0, 3000], [2, 0], method='Radau', args=van_der_pol['valores'],
+                        jac=jac, rtol=1e-6, atol=1e-9)
+        print(f"  Van der Pol (mu = 1000), Radau {nombre}: {(time.perf_counter() - inicio)*1e3:.1f} ms, "
+              f"{sol.nfev} evaluaciones del lado derecho, {sol.njev} del jacobiano, x(3000) = {sol.y[0, -1]:.6f}")
+
+    # modelo con parámetros: la función lineal de SYSLINEAL2X2.py
+    lineal = compila_modelo(('a*x + b*y', 'c*x + d*y'), parametros={'a': -1, 'b': -2, 'c': 1, 'd': -1})
+    sol = odeint(lineal['rhs'], [10, -30], np.linspace(0, 8, 2000), args=lineal['valores'])
+    print(f"SYSLINEAL2X2.py con parámetros {dict(zip(lineal['parametros'], lineal['valores']))}: "
+          f"X(8) = {sol[-1]}, jacobiano {lineal['jacobiano'](0.0, 0.0, *lineal['valores']).tolist()}")
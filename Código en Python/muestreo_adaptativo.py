@@ -0,0 +1,135 @@
+import numpy as np
+from scipy.interpolate import LinearNDInterpolator
+import matplotlib.pyplot as plt
+import time
+
+"""Muestreo adaptativo de campos vectoriales con un árbol cuaternario (quadtree).
+
+CampoVectoria2D.py arma una malla con h = 1 sobre [0, 500]² (unos 250 mil puntos) y
+EjemploNoLineal27052025 usa h = 0.05, sin importar dónde cambia el campo. Aquí se
+empieza con celdas grandes y solo se dividen en cuatro las celdas donde la dirección
+del campo gira más de tol_angulo entre el centro y las esquinas, donde la magnitud
+varía mucho en términos relativos, donde las dos componentes cambian de signo (posible
+equilibrio) o donde cruza una frontera de conmutación. Todo un nivel del árbol se
+procesa con operaciones de arreglos. Las esquinas se comparten entre celdas vecinas
+porque viven en una red entera de 2^nivel_max divisiones, así que cada punto se evalúa
+una sola vez. El resultado es una muestra irregular (x, y, u, v) para quiver o para
+interpolar, y las hojas del árbol."""
+
+
+def muestreo_adaptativo(campo, ventana, nivel_min=2, nivel_max=8, tol_angulo=0.25, tol_magnitud=0.5,
+                        frontera=None):
+    """Muestra el campo (U, V) = campo(X, Y) (vectorizado) en la ventana (ax, bx, ay, by).
+
+    frontera: función opcional h(X, Y) cuyo cambio de signo marca una línea de conmutación
+    que se refina hasta nivel_max (por ejemplo lambda X, Y: Y - w). Devuelve un
+    diccionario con los puntos evaluados 'x', 'y', 'u', 'v', las hojas 'celdas' como
+    arreglo (x0, y0, ancho, alto) y el número de 'evaluaciones'."""
+    ax, bx, ay, by = ventana
+    N = 2**nivel_max
+    hx, hy = (bx - ax)/N, (by - ay)/N
+    # caché de evaluaciones indexada por la clave entera i*(N + 1) + j de la red
+    claves = np.empty(0, dtype=np.int64)
+    U = np.empty(0)
+    V = np.empty(0)
+
+    def evalua(i, j):
+        nonlocal claves, U, V
+        k = i*(N + 1) + j
+        nuevas = np.setdiff1d(k, claves)
+        if nuevas.size:
+            ii, jj = np.divmod(nuevas, N + 1)
+            u, v = campo(ax + ii*hx, ay + jj*hy)
+            claves = np.concatenate([claves, nuevas])
+            orden = np.argsort(claves, kind='stable')
+            claves = claves[orden]
+            U = np.concatenate([U, np.broadcast_to(u, nuevas.shape)])[orden]
+            V = np.concatenate([V, np.broadcast_to(v, nuevas.shape)])[orden]
+        pos = np.searchsorted(claves, k)
+        return U[pos], V[pos]
+
+    lado = N >> nivel_min
+    i, j = (m.ravel() for m in np.meshgrid(np.arange(0, N, lado), np.arange(0, N, lado)))
+    hojas = []
+    for nivel in range(nivel_min, nivel_max + 1):
+        medio = lado//2
+        ei = np.stack([i, i + lado, i, i + lado, i + medio])
+        ej = np.stack([j, j, j + lado, j + lado, j + medio])
+        u, v = evalua(ei, ej)
+        if nivel == nivel_max or lado == 1:
+            hojas.append((i, j, np.full(i.shape, lado)))
+            break
+        mag = np.hypot(u, v)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            coseno = (u[:4]*u[4] + v[:4]*v[4])/(mag[:4]*mag[4])
+            angulo = np.arccos(np.clip(np.nan_to_num(coseno, nan=-1.0), -1, 1)).max(axis=0)
+            variacion = (mag.max(axis=0) - mag.min(axis=0))/mag.max(axis=0)
+        refina = (angulo > tol_angulo) | (np.nan_to_num(variacion, nan=1.0) > tol_magnitud)
+        # posible equilibrio: las dos componentes cambian de signo en la celda
+        refina |= (u.min(axis=0) <= 0) & (u.max(axis=0) >= 0) & (v.min(axis=0) <= 0) & (v.max(axis=0) >= 0)
+        if frontera is not None:
+            f = frontera(ax + ei*hx, ay + ej*hy)
+            refina |= (f.min(axis=0) <= 0) & (f.max(axis=0) >= 0)
+        hojas.append((i[~refina], j[~refina], np.full((~refina).sum(), lado)))
+        # cuatro hijas por cada celda refinada
+        i, j = i[refina], j[refina]
+        i = np.concatenate([i, i + medio, i, i + medio])
+        j = np.concatenate([j, j, j + medio, j + medio])
+        lado = medio
+        if i.size == 0:
+            break
+
+    ci, cj, cl = (np.concatenate(c) for c in zip(*hojas))
+    x, y = np.divmod(claves, N + 1)
+    return {'x': ax + x*hx, 'y': ay + y*hy, 'u': U, 'v': V,
+            'celdas': np.column_stack([ax + ci*hx, ay + cj*hy, cl*hx, cl*hy]), 'evaluaciones': claves.size}
+
+
+def interpola(muestra, X, Y):
+    """Campo de la muestra interpolado linealmente en los puntos (X, Y), por ejemplo una malla para streamplot."""
+    interp = LinearNDInterpolator(np.column_stack([muestra['x'], muestra['y']]),
+                                  np.column_stack([muestra['u'], muestra['v']]))
+    UV = interp(X, Y)
+    return UV[..., 0], UV[..., 1]
+
+
+if __name__ == "__main__":
+    casos = {
+        # CampoVectoria2D.py (depredador-presa): h = 1 en [0, 500]²
+        'CampoVectoria2D.py': (lambda X, Y: (2*X - Y, X + 4*Y), (0, 500, 0, 500), 1, None),
+        # EjemploNoLineal27052025: h = 0.05 en [-2, 2]²
+        'EjemploNoLineal27052025': (lambda X, Y: (-X + X**3, -2*Y), (-2, 2, -2, 2), 0.05, None),
+        # campo rojo de EjercicioFinal2D.py con la frontera y = 1
+        'EjercicioFinal2D.py (rojo)': (lambda X, Y: (Y - X**2 + 2, X**2 - X*Y), (-3, 3, 0, 3), 0.01,
+                                       lambda X, Y: Y - 1),
+    }
+    fig, ejes = plt.subplots(1, len(casos), figsize=(16, 5))
+    for eje, (nombre, (campo, ventana, h, frontera)) in zip(ejes, casos.items()):
+        ax, bx, ay, by = ventana
+        inicio = time.perf_counter()
+        muestra = muestreo_adaptativo(campo, ventana, frontera=frontera)
+        duracion = time.perf_counter() - inicio
+        n_malla = len(np.arange(ax, bx + h, h))*len(np.arange(ay, by + h, h))
+
+        # error de dirección de la interpolación contra el campo exacto en una malla fina
+        X, Y = np.meshgrid(np.linspace(ax, bx, 301), np.linspace(ay, by, 301))
+        Ui, Vi = interpola(muestra, X, Y)
+        U, V = campo(X, Y)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            angulo = np.abs(np.angle((Ui + 1j*Vi)/(U + 1j*V)))
+        print(f"{nombre}: {muestra['evaluaciones']} evaluaciones ({len(muestra['celdas'])} hojas) en "
+              f"{duracion*1e3:.1f} ms contra {n_malla} de la malla uniforme; error de dirección "
+              f"interpolado: mediana {np.degrees(np.nanmedian(angulo)):.2f}°, "
+              f"percentil 99 {np.degrees(np.nanpercentile(angulo, 99)):.2f}°")
+
+        norma = np.hypot(muestra['u'], muestra['v'])
+        norma[norma == 0] = 1
+        eje.quiver(muestra['x'], muestra['y'], muestra['u']/norma, muestra['v']/norma,
+                   color=(0/255, 180/255, 250/255), scale=60, width=0.002)
+        for x0, y0, ancho, alto in muestra['celdas']:
+            eje.add_patch(plt.Rectangle((x0, y0), ancho, alto, fill=False, linewidth=0.2, color='gray'))
+        eje.set_xlim(ax, bx)
+        eje.set_ylim(ay, by)
+        eje.set_title(f"{nombre}\n{muestra['evaluaciones']} puntos")
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,110 @@
+import numpy as np
+import contourpy
+from matplotlib.collections import LineCollection
+import time
+from modelo_simbolico import compila_modelo
+
+"""Nulclinas con caché para los scripts de plano de fase.
+
+Las nulclinas son los conjuntos de nivel cero de cada componente del campo (x' = 0 e
+y' = 0). Se extraen con marching squares (contourpy, el mismo que usa matplotlib para
+contour) directamente sobre los arreglos dXdt y dYdt que el script ya evaluó en su
+malla. Después cada vértice se corrige con unos pasos de Newton sobre la componente,
+p <- p - f(p) ∇f(p)/|∇f(p)|², usando el jacobiano de compila_modelo, así que las
+polilíneas quedan sobre la curva exacta y no sobre la interpolación lineal de la
+malla. Los resultados se guardan por (modelo, parámetros, ventana, resolución), de
+modo que volver a dibujar la figura no vuelve a evaluar ni a recorrer la malla."""
+
+# nulclinas por (clave del modelo, parámetros, ventana, h)
+_CACHE = {}
+
+
+def _refina(modelo, valores, componente, puntos, pasos):
+    x, y = puntos[:, 0].copy(), puntos[:, 1].copy()
+    for _ in range(pasos):
+        f = modelo['campo'](x, y, *valores)[componente]
+        J = modelo['jacobiano'](x, y, *valores)
+        gx, gy = J[:, componente, 0], J[:, componente, 1]
+        g2 = gx*gx + gy*gy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            paso = np.where(g2 > 0, f/g2, 0.0)
+        x -= paso*gx
+        y -= paso*gy
+    return np.column_stack([x, y])
+
+
+def nulclinas(modelo, ventana, h, valores=None, campos=None, pasos_newton=3):
+    """Nulclinas x' = 0 ('x') e y' = 0 ('y') como listas de polilíneas (k, 2).
+
+    modelo: de compila_modelo; ventana (ax, bx, ay, by) y h como en los scripts;
+    campos: (dXdt, dYdt) ya evaluados sobre np.meshgrid(np.arange(ax, bx + h, h),
+    np.arange(ay, by + h, h)); si no se dan, se evalúan aquí."""
+    valores = tuple(modelo['valores'] if valores is None else valores)
+    clave = (modelo['clave'], valores, tuple(ventana), h)
+    if clave in _CACHE:
+        return _CACHE[clave]
+    ax, bx, ay, by = ventana
+    xs, ys = np.arange(ax, bx + h, h), np.arange(ay, by + h, h)
+    if campos is None:
+        X, Y = np.meshgrid(xs, ys)
+        campos = modelo['campo'](X, Y, *valores)
+    resultado = {}
+    for componente, nombre in enumerate(('x', 'y')):
+        Z = np.asarray(campos[componente], dtype=float)
+        if np.ptp(Z) == 0:
+            # componente constante: nulclina vacía o toda la ventana, no hay curva que dibujar
+            resultado[nombre] = []
+            continue
+        generador = contourpy.contour_generator(xs, ys, Z, line_type=contourpy.LineType.Separate)
+        lineas = generador.lines(0.0)
+        resultado[nombre] = [_refina(modelo, valores, componente, linea, pasos_newton) for linea in lineas
+                             if len(linea) > 1]
+    _CACHE[clave] = resultado
+    return resultado
+
+
+def dibuja_nulclinas(eje, resultado, colores=('orange', 'green'), linewidth=1.5):
+    """Agrega las nulclinas al eje como dos LineCollection (x' = 0 e y' = 0)."""
+    for nombre, color in zip(('x', 'y'), colores):
+        if resultado[nombre]:
+            eje.add_collection(LineCollection(resultado[nombre], colors=color, linewidths=linewidth,
+                                              label=f"{nombre}' = 0"))
+
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    casos = {
+        'Ejemplo1NoLineal.py': (('x - y', 'x**2*y - 4*x'), (-10, 10, -10, 10), 0.2),
+        'EjemploNoLineal27052025': (('-x + x**3', '-2*y'), (-2, 2, -2, 2), 0.05),
+        'modCampoVectorial.py (A1)': (('2*x - y', 'x + 4*y'), (-5, 5, -5, 5), 0.1),
+    }
+    fig, ejes = plt.subplots(1, len(casos), figsize=(16, 5))
+    for eje, (nombre, (expresiones, ventana, h)) in zip(ejes, casos.items()):
+        modelo = compila_modelo(expresiones)
+        ax, bx, ay, by = ventana
+        X, Y = np.meshgrid(np.arange(ax, bx + h, h), np.arange(ay, by + h, h))
+        dXdt, dYdt = modelo['campo'](X, Y)
+        inicio = time.perf_counter()
+        res = nulclinas(modelo, ventana, h, campos=(dXdt, dYdt))
+        t_primera = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        nulclinas(modelo, ventana, h, campos=(dXdt, dYdt))
+        t_cache = time.perf_counter() - inicio
+        # residuo sobre las curvas: marching squares solo contra después de Newton
+        lineas = contourpy.contour_generator(X[0], Y[:, 0], dYdt,
+                                             line_type=contourpy.LineType.Separate).lines(0.0)
+        residuo_ms = max(np.abs(modelo['campo'](l[:, 0], l[:, 1])[1]).max() for l in lineas)
+        residuo = max(np.abs(modelo['campo'](l[:, 0], l[:, 1])[1]).max() for l in res['y'])
+        print(f"{nombre}: {len(res['x'])} + {len(res['y'])} polilíneas en {t_primera*1e3:.1f} ms, "
+              f"desde la caché {t_cache*1e6:.0f} µs; |y'| máximo sobre y' = 0: marching squares "
+              f"{residuo_ms:.1e}, con Newton {residuo:.1e}")
+
+        eje.streamplot(X, Y, dXdt, dYdt, color=(0/255, 180/255, 250/255), linewidth=0.6)
+        dibuja_nulclinas(eje, res)
+        eje.set_xlim(ax, bx)
+        eje.set_ylim(ay, by)
+        eje.set_title(nombre)
+        eje.legend(loc='upper right')
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,151 @@
+import numpy as np
+from scipy.linalg import expm
+from scipy.integrate import odeint
+import time
+
+"""Solución exacta de x' = a x + b y, y' = c x + d y (la función lineal de los scripts).
+
+SYSLINEAL2X2.py y CampoVectoria2D.py resuelven el sistema lineal con odeint sobre
+np.linspace(0, tf, 2000), con miles de llamadas a lineal(V, t, a, b, c, d) en Python,
+aunque la solución es X(t) = expm(A t) V0. Aquí se evalúa en toda la malla de tiempos
+y para un lote de condiciones iniciales a la vez:
+
+  - 2x2: con s = tr/2 y q² = s² - det, expm(A t) = e^(st)[C(t) I + S(t)(A - sI)] con
+    C, S = cosh, sinh/q (q² > 0), cos, sin/ω (q² = -ω²) o 1, t (valor propio doble),
+    que vale también para matrices no diagonalizables como a, b, c, d = 2, -1, 1, 4
+    de CampoVectoria2D.py;
+  - n x n diagonalizable: A = P diag(λ) P⁻¹ y X(t) = P diag(e^(λ t)) P⁻¹ V0;
+  - n x n no diagonalizable: en una malla uniforme se reutiliza el propagador de un
+    paso Φ = expm(A dt), con Φ^k = (Φ^m)^(k // m) Φ^(k % m) y m ≈ √len(t) (unas
+    2√len(t) multiplicaciones en vez de una por paso); en una malla cualquiera, expm
+    sobre el lote."""
+
+
+def _es_uniforme(t):
+    if len(t) < 3:
+        return True
+    paso = np.diff(t)
+    return np.allclose(paso, paso[0], rtol=1e-9, atol=0)
+
+
+def forma_espectral(A):
+    """(A, s, q²) de una matriz 2x2: s = tr(A)/2, q² = s² - det(A); los valores propios son s ± q."""
+    A = np.asarray(A, dtype=float)
+    s = np.trace(A)/2
+    q2 = s*s - np.linalg.det(A)
+    # det() redondea: un valor propio doble exacto puede salir con q² ~ 1e-15
+    if abs(q2) <= 1e-12*max(1.0, s*s):
+        q2 = 0.0
+    return A, s, q2
+
+
+def funciones_C_S(t, q2):
+    """C(t), S(t) de expm(A t) = e^(st)[C I + S (A - sI)] según el signo de q²."""
+    if q2 > 0:
+        q = np.sqrt(q2)
+        return np.cosh(q*t), np.sinh(q*t)/q
+    if q2 < 0:
+        om = np.sqrt(-q2)
+        return np.cos(om*t), np.sin(om*t)/om
+    return np.ones_like(t), t
+
+
+def expm_2x2(A, tau):
+    """expm(A τ) en forma cerrada para una matriz 2x2 y un arreglo de tiempos: forma tau.shape + (2, 2)."""
+    A, s, q2 = forma_espectral(A)
+    tau = np.asarray(tau, dtype=float)
+    C, S = funciones_C_S(tau, q2)
+    e = np.exp(s*tau)[..., np.newaxis, np.newaxis]
+    return e*(C[..., np.newaxis, np.newaxis]*np.eye(2) + S[..., np.newaxis, np.newaxis]*(A - s*np.eye(2)))
+
+
+def _potencias(Phi, K):
+    # Φ^0 ... Φ^(K-1) por bloques: (Φ^m)^j Φ^i
+    m = max(1, int(np.ceil(np.sqrt(K))))
+    interiores = np.empty((m, *Phi.shape))
+    interiores[0] = np.eye(len(Phi))
+    for i in range(1, m):
+        interiores[i] = Phi @ interiores[i - 1]
+    Psi = Phi @ interiores[-1]
+    exteriores = np.empty((int(np.ceil(K/m)), *Phi.shape))
+    exteriores[0] = np.eye(len(Phi))
+    for j in range(1, len(exteriores)):
+        exteriores[j] = Psi @ exteriores[j - 1]
+    return (exteriores[:, np.newaxis] @ interiores[np.newaxis]).reshape(-1, *Phi.shape)[:K]
+
+
+def solucion_lineal(A, V0, t, metodo='auto'):
+    """X(t) = expm(A t) V0 en cada tiempo de t (que empieza en t[0], donde X = V0).
+
+    V0 de forma (n,) devuelve (len(t), n) como odeint; V0 de forma (N, n) devuelve
+    (N, len(t), n). metodo: 'auto', 'cerrada' (2x2), 'diagonal', 'propagador' (malla
+    uniforme) o 'expm'."""
+    A = np.asarray(A, dtype=float)
+    V0 = np.asarray(V0, dtype=float)
+    t = np.asarray(t, dtype=float)
+    lote = V0.ndim == 2
+    V0 = np.atleast_2d(V0)
+    tau = t - t[0]
+
+    if metodo == 'auto':
+        if A.shape == (2, 2):
+            metodo = 'cerrada'
+        elif np.linalg.cond(np.linalg.eig(A)[1]) < 1e8:
+            metodo = 'diagonal'
+        else:
+            metodo = 'propagador' if _es_uniforme(t) else 'expm'
+
+    if metodo == 'diagonal':
+        lam, P = np.linalg.eig(A)
+        coef = np.linalg.solve(P, V0.T)                  # (n, N)
+        X = np.einsum('ij,tj,jn->nti', P, np.exp(np.outer(tau, lam)), coef).real
+    else:
+        if metodo == 'cerrada':
+            E = expm_2x2(A, tau)
+        elif metodo == 'propagador':
+            Phi = expm(A*(tau[1] - tau[0])) if len(t) > 1 else np.eye(len(A))
+            E = _potencias(Phi, len(t))
+        else:
+            E = expm(A*tau[:, np.newaxis, np.newaxis])
+        # X[n, k] = E[k] @ V0[n]
+        X = np.tensordot(V0, E, axes=([1], [2]))
+    return X if lote else X[0]
+
+
+def lineal_exacta(V0, t, a, b, c, d, metodo='auto'):
+    """Reemplazo de odeint(lineal, V0, t, args=(a, b, c, d)) con la solución exacta."""
+    return solucion_lineal([[a, b], [c, d]], V0, t, metodo)
+
+
+if __name__ == "__main__":
+    def lineal(V, t, a, b, c, d):
+        x, y = V
+        return [a*x + b*y, c*x + d*y]
+
+    casos = {'SYSLINEAL2X2.py': ((-1, -2, 1, -1), [10, -30], 8),
+             'CampoVectoria2D.py': ((2, -1, 1, 4), [500, 100], 5/6)}
+    for nombre, (param, V0, tf) in casos.items():
+        t = np.linspace(0, tf, 2000)
+        inicio = time.perf_counter()
+        sol_odeint = odeint(lineal, V0, t, args=param)
+        t_odeint = time.perf_counter() - inicio
+        ref = odeint(lineal, V0, t, args=param, rtol=1e-13, atol=1e-13)
+        inicio = time.perf_counter()
+        sol = lineal_exacta(V0, t, *param)
+        t_exacta = time.perf_counter() - inicio
+        escala = np.abs(ref).max()
+        print(f"{nombre} (a, b, c, d) = {param}: odeint {t_odeint*1e3:.2f} ms (error relativo "
+              f"{np.abs(sol_odeint - ref).max()/escala:.1e}), exacta {t_exacta*1e3:.2f} ms "
+              f"(diferencia {np.abs(sol - ref).max()/escala:.1e}), {t_odeint/t_exacta:.0f}x")
+
+        # lote de condiciones iniciales
+        rng = np.random.default_rng(0)
+        V0s = rng.uniform(-50, 50, (1000, 2))
+        inicio = time.perf_counter()
+        lote = lineal_exacta(V0s, t, *param)
+        t_lote = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for v in V0s[:50]:
+            odeint(lineal, v, t, args=param)
+        t_odeint_lote = (time.perf_counter() - inicio)*len(V0s)/50
+        print(f"  {len(V0s)} condiciones iniciales: exacta {t_lote*1e3:.1f} ms, odeint ~{t_odeint_lote:.1f} s")
@@ -1,6 +1,14 @@
 import numpy as np
 from scipy.integrate import odeint
 import matplotlib.pyplot as plt
+import sys
+import os
+
+# dibujar las nulclinas x' = 0 e y' = 0 (nulclinas.py) sobre el campo ya evaluado
+dibujar_nulclinas = False
+# True: los equilibrios se buscan y clasifican con equilibrios.py (Newton desde una
+# malla de semillas) en vez de dibujar los tres puntos escritos a mano
+buscar_equilibrios = False
 
 # Definir la función del SEDO como una función en Python
 def lineal(V, t): #V es el vector de variables dependientes
@@ -9,6 +17,16 @@ def lineal(V, t): #V es el vector de variables dependientes
     dydt = x**2*y - 4*x
     return [dxdt, dydt]
 
+if dibujar_nulclinas or buscar_equilibrios:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Código en Python'))
+    from modelo_simbolico import compila_modelo
+    from nulclinas import nulclinas, dibuja_nulclinas
+    from equilibrios import busca_equilibrios
+    # el SEDO declarado una sola vez: de aquí salen lineal (para odeint), el campo en la
+    # malla, las nulclinas y los equilibrios
+    modelo = compila_modelo(('x - y', 'x**2*y - 4*x'))
+    lineal = modelo['rhs']
+
 #ventana
 ax=-10
 bx=10
@@ -19,14 +37,25 @@ by=10
 # Campo vectorial
 h=0.2 #cantidad de vectores (horizontal como vertical)
 X, Y = np.meshgrid(np.arange(ax, bx + h, h), np.arange(ay, by + h, h))
-dXdt = X - Y
-dYdt = X**2*Y - 4*X
+if dibujar_nulclinas or buscar_equilibrios:
+    dXdt, dYdt = modelo['campo'](X, Y)
+else:
+    dXdt = X - Y
+    dYdt = X**2*Y - 4*X
 
 #plt.streamplot(X, Y, dXdt, dYdt, color=(0/255, 180/255, 250/255),linewidth=0.6)
 plt.streamplot(X, Y, dXdt, dYdt, color=(0/255, 180/255, 250/255),linewidth=0.6)
-plt.scatter(-2,-2) #Punto de equilibrio 1
-plt.scatter(0,0) #Punto de equilibrio 2
-plt.scatter(2,2) #Punto de equilibrio 3
+if dibujar_nulclinas:
+    dibuja_nulclinas(plt.gca(), nulclinas(modelo, (ax, bx, ay, by), h, campos=(dXdt, dYdt)))
+if buscar_equilibrios:
+    equilibrios = busca_equilibrios(modelo, (ax, bx, ay, by))
+    for (xe, ye), tipo in zip(equilibrios['puntos'], equilibrios['descripcion']):
+        plt.scatter(xe, ye, label=f'({xe:.3g}, {ye:.3g}) {tipo}')
+    plt.legend()
+else:
+    plt.scatter(-2,-2) #Punto de equilibrio 1
+    plt.scatter(0,0) #Punto de equilibrio 2
+    plt.scatter(2,2) #Punto de equilibrio 3
 plt.xlim([ax,bx])
 plt.ylim([ay,by])
 plt.xlabel('x(t)')
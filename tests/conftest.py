@@ -0,0 +1,9 @@
+import os
+import sys
+
+# los módulos viven en carpetas de scripts sin paquete: se agregan al path como hacen los scripts
+os.environ.setdefault('MPLBACKEND', 'Agg')
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for carpeta in ('Código en Python', 'Actividades semillero', os.path.join('Actividades semillero', 'Dylber'),
+                os.path.join('Actividades semillero', 'Modelo SI')):
+    sys.path.insert(0, os.path.join(RAIZ, carpeta))
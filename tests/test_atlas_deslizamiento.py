@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from atlas_deslizamiento import atlas_plano, atlas_pp, atlas_si
+
+FIJOS_PP = {'b': 0.33, 'd': 0.0444, 'w': 1.625}
+FIJOS_SI = {'mu': 0.2, 'theta': 0.15, 'w': 0.3}
+
+
+def test_un_punto_como_los_scripts():
+    si = atlas_si(1.5, 0.2, 0.15, 0.1, 0.3)
+    assert si['pseudo_x'].shape == (1,)
+    assert float(si['t1x']) == pytest.approx(1/1.5)
+    pp = atlas_pp(0.3556, 0.33, 0.0444, 0.2067, 1.625)
+    assert pp['pseudo_x'].shape == (3,)
+    assert pp['pseudo_estable'].shape == (3,)
+
+
+@pytest.mark.parametrize('valores_E', [np.linspace(0.0, 0.6, 7), np.full(7, 0.0)])
+def test_capas_fijas_en_atlas_pp(valores_E):
+    # con o sin pseudo-equilibrios en el plano, siempre tres capas
+    valores_a = np.linspace(0.05, 1.0, 5)
+    res = atlas_pp(valores_a[np.newaxis, :], 0.33, 0.0444, valores_E[:, np.newaxis], 1.625)
+    assert res['pseudo_x'].shape == (3, 7, 5)
+    assert res['pseudo_estable'].shape == (3, 7, 5)
+    assert res['t1x'].shape == (7, 5)
+    # nan donde no hay pseudo-equilibrio, y nunca estable ahí
+    assert not res['pseudo_estable'][np.isnan(res['pseudo_x'])].any()
+
+
+@pytest.mark.parametrize('filas_por_bloque', [1, 3, 256])
+def test_atlas_plano_igual_a_evaluar_todo(filas_por_bloque):
+    valores_a = np.linspace(0.05, 1.0, 6)
+    valores_E = np.linspace(0.0, 0.6, 10)
+    plano = atlas_plano(atlas_pp, FIJOS_PP, 'a', valores_a, 'E', valores_E, filas_por_bloque=filas_por_bloque)
+    directo = atlas_pp(valores_a[np.newaxis, :], E=valores_E[:, np.newaxis], **FIJOS_PP)
+    assert set(plano) == set(directo)
+    for clave, valor in directo.items():
+        assert plano[clave].shape == valor.shape
+        np.testing.assert_array_equal(plano[clave], valor)
+
+
+def test_atlas_plano_si_con_claves():
+    valores_R0 = np.linspace(0.5, 4.0, 8)
+    valores_u = np.linspace(0.0, 0.3, 4)
+    plano = atlas_plano(atlas_si, FIJOS_SI, 'R0', valores_R0, 'u', valores_u, claves=['deslizante', 'pseudo_x'],
+                        filas_por_bloque=3)
+    assert set(plano) == {'deslizante', 'pseudo_x'}
+    assert plano['deslizante'].shape == (4, 8)
+    assert plano['pseudo_x'].shape == (1, 4, 8)
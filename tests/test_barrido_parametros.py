@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from barrido_parametros import clasifica, equilibrios, pseudo_equilibrio
+from filippov_lotes import PARAMETROS, simula_lote
+
+PUNTOS = [(0.55, 0.4), (0.3, 0.4), (0.1, 0.5), (0.95, 0.28), (0.8, 0.1), (0.2, 0.05)]
+
+
+def etiquetas(**cambios):
+    p = dict(PARAMETROS, **cambios)
+    eq = equilibrios(p)
+    return [clasifica(res, p, eq) for res in simula_lote(PUNTOS, p, guardar=False)]
+
+
+def test_pseudo_equilibrio_antes_que_max_switches():
+    # con R0 = 3 y u pequeño todas llegan al pseudo-equilibrio sobre y = w
+    p = dict(PARAMETROS, R0=3.0, u=0.02)
+    assert not np.isnan(pseudo_equilibrio(p))
+    assert etiquetas(R0=3.0, u=0.02) == ['pseudo']*len(PUNTOS)
+
+
+def test_convergencia_lenta_a_eq1():
+    # cerca de R0 = 1 el horizonte fijo corta antes de llegar: la prueba de asentamiento lo acepta
+    assert etiquetas(R0=1.1, u=0.02) == ['eq1']*len(PUNTOS)
+
+
+def test_fuera_de_ventana():
+    assert clasifica({'motivo': 'fuera_ventana'}, dict(PARAMETROS), equilibrios(PARAMETROS)) == 'fuera'
+
+
+@pytest.mark.parametrize('tiempo_max', [20, 50])
+def test_etiqueta_no_depende_del_horizonte(tiempo_max):
+    p = dict(PARAMETROS, R0=1.1, u=0.02)
+    eq = equilibrios(p)
+    resultados = simula_lote(PUNTOS, p, tiempo_max=tiempo_max, guardar=False)
+    assert [clasifica(res, p, eq) for res in resultados] == ['eq1']*len(PUNTOS)
+
+
+def test_sin_pseudo_equilibrio_no_hay_etiqueta_pseudo():
+    # con R0 = 2 el pseudo-equilibrio cae fuera del segmento deslizante (xp es nan); con
+    # tiempo_deslizamiento corto la trayectoria desde (0.996, 0.243) termina en max_switches
+    # con un deslizamiento sin evento, y debe quedar como ciclo igual que las demás
+    p = dict(PARAMETROS, R0=2.0)
+    assert np.isnan(pseudo_equilibrio(p))
+    eq = equilibrios(p)
+    resultados = simula_lote([(0.996, 0.243), (0.95, 0.28)], p, tiempo_deslizamiento=1, guardar=False)
+    assert [res['motivo'] for res in resultados] == ['max_switches']*2
+    assert [clasifica(res, p, eq) for res in resultados] == ['ciclo']*2
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from clasificacion_lineal import (CENTRO, DEGENERADO, ESPIRAL, ESTABLE, INESTABLE, NEUTRO, NILPOTENTE, NODO,
+                                  SILLA, clasifica_lote, describe, vaps_lote)
+
+CASOS = [
+    ([[1, 5], [-1, -2]], ESPIRAL, ESTABLE),       # vaps.py
+    ([[1, 2], [-1, 1]], ESPIRAL, INESTABLE),      # A2 de sistemaFilippov.py
+    ([[0, 1], [-4, 0]], CENTRO, NEUTRO),
+    ([[-1, -2], [1, -1]], ESPIRAL, ESTABLE),      # SYSLINEAL2X2.py
+    ([[-3, 0], [0, -1]], NODO, ESTABLE),
+    ([[3, 1], [0, 1]], NODO, INESTABLE),
+    ([[1, 0], [0, -2]], SILLA, INESTABLE),
+    ([[2, -1], [1, 4]], DEGENERADO, INESTABLE),   # CampoVectoria2D.py: valor propio doble 3
+    ([[-2, 0], [0, -2]], DEGENERADO, ESTABLE),
+    ([[-1, 0], [0, 0]], DEGENERADO, NEUTRO),      # recta de equilibrios que atrae
+    ([[1, 0], [0, 0]], DEGENERADO, INESTABLE),
+    ([[0, 0], [0, 0]], DEGENERADO, NEUTRO),
+    ([[0, 1], [0, 0]], NILPOTENTE, INESTABLE),    # crece como t
+    ([[2, -4], [1, -2]], NILPOTENTE, INESTABLE),
+]
+
+
+@pytest.mark.parametrize('M, tipo, estabilidad', CASOS)
+def test_clasificacion(M, tipo, estabilidad):
+    t, e = clasifica_lote(np.array([M], dtype=float))
+    assert (t[0], e[0]) == (tipo, estabilidad), describe(t[0], e[0])
+
+
+def test_lote_por_coeficientes_igual_que_por_matrices():
+    M = np.array([m for m, _, _ in CASOS], dtype=float)
+    por_matrices = clasifica_lote(M)
+    por_coeficientes = clasifica_lote(a=M[:, 0, 0], b=M[:, 0, 1], c=M[:, 1, 0], d=M[:, 1, 1])
+    np.testing.assert_array_equal(por_matrices, por_coeficientes)
+
+
+def test_valores_propios_contra_eigvals():
+    M = np.random.default_rng(0).normal(size=(1000, 2, 2))
+    lam = vaps_lote(M, bloque=64)
+    ref = np.linalg.eigvals(M)
+    ordena = lambda z: np.sort_complex(np.round(z, 10))
+    np.testing.assert_allclose(ordena(lam), ordena(ref), atol=1e-9)
+
+
+def test_estabilidad_contra_parte_real():
+    M = np.random.default_rng(1).normal(size=(10000, 2, 2))
+    _, estabilidad = clasifica_lote(M)
+    re = np.linalg.eigvals(M).real.max(axis=1)
+    assert np.all(estabilidad[re < -1e-9] == ESTABLE)
+    assert np.all(estabilidad[re > 1e-9] == INESTABLE)
+
+
+def test_describe():
+    assert describe(SILLA, INESTABLE) == 'silla'
+    assert describe(NILPOTENTE, INESTABLE) == 'nilpotente inestable'
+    assert describe(ESPIRAL, ESTABLE) == 'espiral estable'
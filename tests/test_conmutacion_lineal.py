@@ -0,0 +1,28 @@
+import numpy as np
+
+from conmutacion_lineal import solucion_exacta
+
+A1 = np.array([[2, -1], [1, 4]])    # modCampoVectorial.py, inestable
+A2 = np.array([[-1, -2], [1, -1]])  # estable
+
+
+def test_sin_pasar_el_limite_todas_las_filas_son_validas():
+    t = np.arange(0, 10, 0.01)
+    sol, validas = solucion_exacta(A1, A2, [1, 1], t)
+    assert sol.shape == (len(t), 2)
+    assert validas == len(t)
+    assert np.isfinite(sol).all()
+
+
+def test_salida_alineada_con_t_salida_al_pasar_el_limite():
+    t = np.linspace(0, 1000, 101)
+    sol, validas = solucion_exacta(A1, A2, [1, 1], t)
+    assert sol.shape == (len(t), 2)
+    assert 0 < validas < len(t)
+    assert np.isfinite(sol[:validas]).all()
+    assert np.abs(sol[:validas]).max() <= 1e150
+    assert np.isnan(sol[validas:]).all()
+    # cada fila válida es la misma que se obtiene pidiendo solo ese tiempo
+    for k in (0, validas // 2, validas - 1):
+        sola, _ = solucion_exacta(A1, A2, [1, 1], t[k:k + 1])
+        np.testing.assert_allclose(sol[k], sola[0], rtol=1e-10)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from filippov_lineal import primer_cruce, segmento_lineal, trayectoria_lineal
+
+MATRICES = {
+    'valor propio doble': np.array([[2.0, -1.0], [1.0, 4.0]]),   # A1 de sistemaFilippov.py
+    'complejos': np.array([[1.0, 2.0], [-1.0, 1.0]]),            # A2 de sistemaFilippov.py
+    'reales distintos': np.array([[1.0, 0.5], [0.3, -0.4]]),
+    'foco estable': np.array([[-0.1, 1.0], [-10.0, -0.1]]),
+}
+# debajo de y = w (cruzan subiendo) y encima (cruzan bajando)
+DEBAJO = np.array([(0.5, 0.5), (-1.0, 2.0), (2.0, -0.5), (0.1, 2.9), (-3.0, -1.0), (1.5, 1.0)])
+ENCIMA = np.array([(0.5, 4.0), (-2.0, 5.0), (3.0, 3.1), (-0.5, 6.0)])
+W = 3.0
+TIEMPO_MAX = 5.0
+
+
+def cruce_solve_ivp(A, v0, direccion):
+    evento = lambda t, V: V[1] - W
+    evento.terminal = True
+    evento.direction = direccion
+    sol = solve_ivp(lambda t, V: A @ V, [0, TIEMPO_MAX], v0, events=evento, rtol=1e-12, atol=1e-12)
+    return sol.t_events[0][0] if sol.t_events[0].size else np.nan
+
+
+@pytest.mark.parametrize('nombre', MATRICES)
+def test_trayectoria_cerrada_contra_solve_ivp(nombre):
+    A = MATRICES[nombre]
+    t = np.linspace(0, 2, 50)
+    x, y = trayectoria_lineal(A, (0.5, -0.3), t)
+    ref = solve_ivp(lambda _, V: A @ V, [0, 2], [0.5, -0.3], t_eval=t, rtol=1e-12, atol=1e-12).y
+    np.testing.assert_allclose(np.vstack([x, y]), ref, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('direccion', [1, -1])
+@pytest.mark.parametrize('nombre', MATRICES)
+def test_tiempos_de_cruce_contra_solve_ivp(nombre, direccion):
+    A = MATRICES[nombre]
+    puntos = DEBAJO if direccion > 0 else ENCIMA
+    t_cruce, xc, yc = primer_cruce(A, puntos[:, 0], puntos[:, 1], W, direccion, TIEMPO_MAX)
+    referencia = np.array([cruce_solve_ivp(A, v0, direccion) for v0 in puntos])
+    np.testing.assert_array_equal(np.isnan(t_cruce), np.isnan(referencia))
+    hay = ~np.isnan(referencia)
+    np.testing.assert_allclose(t_cruce[hay], referencia[hay], rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(yc[hay], W)
+
+
+def test_segmento_con_formato_de_solve_ivp():
+    A = MATRICES['valor propio doble']
+    seg = segmento_lineal(A, (0.5, 0.5), W, 1, TIEMPO_MAX)
+    assert seg.y.shape == (2, 500)
+    assert seg.t_events[0].size == 1
+    assert seg.t[-1] == seg.t_events[0][0]
+    assert seg.y[1, -1] == W
+    assert seg.t_events[0][0] == pytest.approx(cruce_solve_ivp(A, [0.5, 0.5], 1), rel=1e-8)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+
+from integracion_convergente import odeint_convergente
+
+TOL = {'rtol': 1e-10, 'atol': 1e-12}
+
+
+def hopf(V, t, mu):
+    x, y = V
+    r2 = x*x + y*y
+    return [-y + x*(mu - r2), x + y*(mu - r2)]
+
+
+def foco(V, t):
+    x, y = V
+    return [-0.5*x - y, x - 0.5*y]
+
+
+def ley_newton(x, t, k, T0, T1, w):
+    return k*(x - (T0 + T1*np.cos(w*t)))
+
+
+def SI(V, t, beta, gamma):
+    S, I = V
+    return [-beta*S*I, beta*S*I - gamma*I]
+
+
+@pytest.mark.parametrize('V0', [[3, 0.5], [0.01, 0], [-1.5, 2.0]])
+def test_ciclo_de_hopf_igual_a_odeint(V0):
+    t = np.linspace(0, 200, 5000)
+    sol, info = odeint_convergente(hopf, V0, t, args=(1,), **TOL)
+    referencia = odeint(hopf, V0, t, args=(1,), **TOL)
+    assert info['tipo'] == 'ciclo'
+    assert info['t_parada'] < 100
+    assert info['periodo'] == pytest.approx(2*np.pi, rel=1e-6)
+    np.testing.assert_allclose(np.hypot(*info['atractor'].T), 1, atol=1e-6)
+    assert sol.shape == referencia.shape
+    np.testing.assert_allclose(sol, referencia, atol=1e-4)
+
+
+def test_equilibrio_igual_a_odeint():
+    t = np.linspace(0, 100, 2000)
+    sol, info = odeint_convergente(foco, [2, 1], t, **TOL)
+    referencia = odeint(foco, [2, 1], t, **TOL)
+    assert info['tipo'] == 'equilibrio'
+    assert info['t_parada'] < t[-1]
+    np.testing.assert_allclose(info['atractor'], 0, atol=1e-6)
+    np.testing.assert_allclose(sol, referencia, atol=1e-6)
+
+
+def test_forzamiento_periodico_igual_a_odeint():
+    args = (-0.2, 60, 15, np.pi/12)
+    t = np.linspace(0, 720, 2000)
+    sol, info = odeint_convergente(ley_newton, 80, t, args=args, periodo_forzado=24, **TOL)
+    referencia = odeint(ley_newton, 80, t, args=args, **TOL)
+    assert info['tipo'] == 'ciclo'
+    assert info['periodo'] == 24
+    assert info['t_parada'] < 360
+    # el ciclo se acepta con tol_ciclo = 1e-6 relativa al tamaño de la órbita (unos 30 °F)
+    np.testing.assert_allclose(sol, referencia, rtol=1e-6)
+
+
+def test_recta_de_equilibrios_del_modelo_SI():
+    t = np.linspace(0, 600, 3000)
+    sol, info = odeint_convergente(SI, [0.9, 0.1], t, args=(0.2, 0.1), tol_f=1e-8)
+    referencia = odeint(SI, [0.9, 0.1], t, args=(0.2, 0.1))
+    assert info['tipo'] == 'equilibrio'
+    assert info['atractor'][1] == pytest.approx(0, abs=1e-6)
+    np.testing.assert_allclose(sol, referencia, atol=1e-6)
+
+
+def test_sin_asentarse_es_odeint():
+    # el horizonte termina antes de que el foco se asiente: la salida es la de odeint salvo
+    # por el error de reiniciar odeint en cada tramo
+    t = np.linspace(0, 2, 200)
+    sol, info = odeint_convergente(foco, [2, 1], t, **TOL)
+    assert info['tipo'] is None
+    np.testing.assert_allclose(sol, odeint(foco, [2, 1], t, **TOL), atol=1e-8)
+
+
+def test_completa_false_recorta():
+    t = np.linspace(0, 100, 2000)
+    sol, info = odeint_convergente(foco, [2, 1], t, completa=False, **TOL)
+    assert sol.shape == (info['indice'], 2)
+    np.testing.assert_allclose(sol, odeint(foco, [2, 1], t, **TOL)[:info['indice']], atol=1e-8)
@@ -0,0 +1,43 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from lineas_flujo import lineas_flujo
+
+EJE = np.linspace(0, 1, 101)
+
+
+@pytest.mark.parametrize('lote', [1, 64])
+def test_campo_uniforme_da_lineas_completas(lote):
+    # U = 1, V = 0: cada semilla del borde izquierdo recorre todo el ancho, las del borde de
+    # abajo caen sobre esas mismas líneas y no deben dejar fragmentos
+    X, Y = np.meshgrid(EJE, EJE)
+    lineas = lineas_flujo(EJE, EJE, np.ones_like(X), np.zeros_like(X), lote=lote)
+    fig, eje = plt.subplots()
+    referencia = len(eje.streamplot(X, Y, np.ones_like(X), np.zeros_like(X)).lines.get_segments())
+    plt.close(fig)
+    assert abs(len(lineas) - referencia) <= 3
+    for linea in lineas:
+        assert np.ptp(linea[:, 0]) == pytest.approx(1.0)
+        assert np.ptp(linea[:, 1]) < 1e-12
+    alturas = np.sort([linea[0, 1] for linea in lineas])
+    assert alturas[0] == 0 and alturas[-1] == 1 and np.diff(alturas).max() < 0.1
+
+
+def test_lotes_como_trazo_de_a_una():
+    X, Y = np.meshgrid(EJE, EJE)
+    U, V = 2*X - Y, X + 4*Y
+    una = lineas_flujo(EJE, EJE, U, V, lote=1)
+    lotes = lineas_flujo(EJE, EJE, U, V)
+    assert len(lotes) >= 0.85*len(una)
+
+
+def test_regiones_no_se_cruzan():
+    w = 0.5
+    X, Y = np.meshgrid(EJE, EJE)
+    abajo = Y < w
+    lineas = lineas_flujo(EJE, EJE, np.where(abajo, 1.0, -1.0), np.where(abajo, 1.0, -0.5),
+                          regiones=(~abajo).astype(int))
+    assert lineas
+    for linea in lineas:
+        assert linea[:, 1].max() <= w + 0.01 or linea[:, 1].min() >= w - 0.01
@@ -0,0 +1,39 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from malla_por_bloques import campo_por_bloques, ejes_malla
+
+
+def campo(X, Y):
+    # CampoVectoria2D.py (depredador-presa)
+    return 2*X - Y, X + 4*Y
+
+
+def test_ejes_como_arange():
+    x, y = ejes_malla((0, 500, 0, 5), 0.1)
+    assert x.dtype == y.dtype == np.float64
+    np.testing.assert_allclose(x, np.arange(0, 500 + 0.1, 0.1), atol=1e-9)
+    np.testing.assert_allclose(y, np.arange(0, 5 + 0.1, 0.1), atol=1e-12)
+
+
+@pytest.mark.parametrize('h, reduccion', [(0.1, 1), (0.1, 5), (0.5, 1), (0.01, 25)])
+def test_ejes_devueltos_sirven_para_streamplot(h, reduccion):
+    # franja delgada de [0, 500]²: el eje x es el de CampoVectoria2D.py, en float32 no es equiespaciado
+    ventana = (0, 500, 0, 20*h*reduccion)
+    x, y, U, V = campo_por_bloques(campo, ventana, h, reduccion=reduccion, presupuesto_mb=128, normaliza=True)
+    assert U.dtype == V.dtype == np.float32
+    assert U.shape == V.shape == (len(y), len(x))
+    fig, eje = plt.subplots()
+    try:
+        eje.streamplot(x, y, U, V, density=0.5)
+    finally:
+        plt.close(fig)
+    # el campo por bloques coincide con la malla completa (y promediada cuando reduccion > 1)
+    X, Y = np.meshgrid(*ejes_malla(ventana, h))
+    Uc, Vc = campo(X, Y)
+    N = np.hypot(Uc, Vc)
+    Uc = Uc/np.where(N == 0, 1, N)
+    r = reduccion
+    Uc = Uc[:len(y)*r, :len(x)*r].reshape(len(y), r, len(x), r).mean(axis=(1, 3))
+    np.testing.assert_allclose(U, Uc, atol=1e-5)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+import modelo_simbolico
+from modelo_simbolico import compila_modelo
+
+VAN_DER_POL = (('y', 'mu*(1 - x**2)*y - x'), {'mu': 100})
+
+
+def test_lados_derechos_en_ambos_ordenes():
+    m = compila_modelo(('x - y', 'x**2*y - 4*x'))
+    V = [1.5, -0.5]
+    assert m['rhs'](V, 0.0) == m['rhs_ivp'](0.0, V) == [2.0, -0.5*2.25 - 6.0]
+    assert m['jacobiano_rhs'](V, 0.0) == m['jacobiano_ivp'](0.0, V)
+    np.testing.assert_allclose(m['jacobiano'](1.5, -0.5), m['jacobiano_rhs'](V, 0.0))
+
+
+@pytest.mark.parametrize('metodo', ['Radau', 'BDF', 'LSODA'])
+def test_jacobiano_ivp_en_solve_ivp(metodo):
+    m = compila_modelo(VAN_DER_POL[0], parametros=VAN_DER_POL[1])
+    llamadas = []
+
+    def jac(t, V, *p):
+        llamadas.append(t)
+        return m['jacobiano_ivp'](t, V, *p)
+
+    sol = solve_ivp(m['rhs_ivp'], [0, 20], [2.0, 0.0], method=metodo, args=m['valores'], jac=jac,
+                    rtol=1e-8, atol=1e-10)
+    assert sol.success and llamadas
+    ref = solve_ivp(m['rhs_ivp'], [0, 20], [2.0, 0.0], method='Radau', args=m['valores'], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(sol.y[:, -1], ref.y[:, -1], rtol=1e-4, atol=1e-6)
+
+
+def test_la_version_del_generador_entra_en_la_clave(monkeypatch, tmp_path):
+    monkeypatch.setattr(modelo_simbolico, 'CARPETA_CACHE', str(tmp_path))
+    monkeypatch.setattr(modelo_simbolico, '_MODELOS', {})
+    antes = compila_modelo(('x - y', 'x*y'))
+    monkeypatch.setattr(modelo_simbolico, 'VERSION_GENERADOR', modelo_simbolico.VERSION_GENERADOR + 1)
+    despues = compila_modelo(('x - y', 'x*y'))
+    assert antes['clave'] != despues['clave']
+    assert antes['ruta'] != despues['ruta']
@@ -0,0 +1,65 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from radio_conjunto import crecimiento_conmutado, radio_conjunto
+
+OPCIONES = {'procesos': 1, 'tiempo_total': 2.0, 'longitud_max': 16}
+
+
+def fuerza_bruta(matrices, longitud):
+    # max ρ(P)^(1/k) sobre todos los productos de longitud k <= longitud: una cota inferior del JSR
+    mejor = 0.0
+    for k in range(1, longitud + 1):
+        for secuencia in product(range(len(matrices)), repeat=k):
+            P = np.eye(len(matrices[0]))
+            for i in secuencia:
+                P = matrices[i] @ P
+            mejor = max(mejor, np.abs(np.linalg.eigvals(P)).max()**(1/k))
+    return mejor
+
+
+def test_valor_conocido_razon_aurea():
+    res = radio_conjunto([[[1, 1], [0, 1]], [[1, 0], [1, 1]]], eps=1e-4, **OPCIONES)
+    phi = (1 + 5**0.5)/2
+    assert res['inferior'] <= phi + 1e-12
+    assert res['superior'] >= phi - 1e-12
+    assert res['inferior'] == pytest.approx(phi, abs=1e-9)
+
+
+def test_una_matriz_es_su_radio_espectral():
+    M = np.array([[0.5, 2.0], [-0.3, 0.9]])
+    rho = np.abs(np.linalg.eigvals(M)).max()
+    res = radio_conjunto([M], **OPCIONES)
+    assert res['inferior'] == pytest.approx(rho, rel=1e-12)
+    assert res['superior'] >= rho
+
+
+@pytest.mark.parametrize('semilla', range(4))
+def test_cotas_contra_fuerza_bruta(semilla):
+    matrices = np.random.default_rng(semilla).normal(size=(2, 2, 2))
+    eps = 1e-3
+    res = radio_conjunto(matrices, eps=eps, **OPCIONES)
+    bruto = fuerza_bruta(matrices, 8)
+    assert res['inferior'] >= bruto - eps
+    assert res['superior'] >= bruto
+    assert res['inferior'] <= res['superior']
+    # la norma espectral de cada matriz es una cota superior trivial del JSR
+    assert res['superior'] <= np.linalg.norm(matrices, ord=2, axis=(1, 2)).max() + eps
+    # la secuencia reportada realiza la cota inferior
+    P = np.eye(2)
+    for i in res['secuencia']:
+        P = matrices[i] @ P
+    crecimiento = np.abs(np.linalg.eigvals(P)).max()**(1/len(res['secuencia']))
+    assert crecimiento == pytest.approx(res['inferior'], rel=1e-8)
+
+
+def test_veredictos_de_conmutacion_continua():
+    estable = crecimiento_conmutado([-np.eye(2), np.array([[-1.0, 0.2], [0.0, -2.0]])], 0.5, **OPCIONES)
+    assert estable['veredicto'] == 'estable'
+    assert estable['tasa_superior'] < 0
+    # A1 de modCampoVectorial.py es inestable por sí sola
+    diverge = crecimiento_conmutado([np.array([[2, -1], [1, 4]]), np.array([[-1, -2], [1, -1]])], 0.5, **OPCIONES)
+    assert diverge['veredicto'] == 'diverge'
+    assert diverge['tasa_inferior'] >= 3.0 - 1e-9
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+from scipy.linalg import expm
+
+from monodromia import expm_lote, monodromia
+from solucion_lineal import expm_2x2, forma_espectral, solucion_lineal
+
+MATRICES = {
+    'reales distintos': [[1.0, 0.5], [0.3, -0.4]],
+    'complejos': [[-1.0, -2.0], [1.0, -1.0]],          # SYSLINEAL2X2.py
+    'doble no diagonalizable': [[2.0, -1.0], [1.0, 4.0]],  # CampoVectoria2D.py
+    'doble diagonal': [[-2.0, 0.0], [0.0, -2.0]],
+    'nilpotente': [[0.0, 1.0], [0.0, 0.0]],
+    'centro': [[0.0, 1.0], [-4.0, 0.0]],
+    'nula': [[0.0, 0.0], [0.0, 0.0]],
+}
+TAU = np.linspace(0, 3, 31)
+
+
+@pytest.mark.parametrize('nombre', MATRICES)
+def test_expm_2x2_contra_scipy(nombre):
+    A = np.array(MATRICES[nombre])
+    E = expm_2x2(A, TAU)
+    assert E.shape == (len(TAU), 2, 2)
+    for k, tau in enumerate(TAU):
+        # tolerancia absoluta relativa al tamaño: expm de scipy redondea entradas que son 0 exacto
+        ref = expm(A*tau)
+        np.testing.assert_allclose(E[k], ref, rtol=1e-10, atol=1e-12*np.abs(ref).max())
+
+
+def test_expm_2x2_con_tau_de_cualquier_forma():
+    A = np.array(MATRICES['complejos'])
+    tau = np.linspace(0, 1, 12).reshape(3, 4)
+    E = expm_2x2(A, tau)
+    assert E.shape == (3, 4, 2, 2)
+    np.testing.assert_allclose(E[2, 1], expm(A*tau[2, 1]), rtol=1e-12)
+    assert expm_2x2(A, 0.5).shape == (2, 2)
+
+
+def test_valor_propio_doble_redondeado():
+    # det() deja q² ~ 1e-15 en un valor propio doble exacto: se lleva a 0
+    _, s, q2 = forma_espectral(MATRICES['doble no diagonalizable'])
+    assert s == 3.0 and q2 == 0.0
+
+
+@pytest.mark.parametrize('nombre', MATRICES)
+def test_monodromia_usa_la_misma_exponencial(nombre):
+    A = np.array(MATRICES[nombre])
+    np.testing.assert_array_equal(expm_lote(A, TAU), expm_2x2(A, TAU))
+    B = np.array(MATRICES['complejos'])
+    np.testing.assert_allclose(monodromia(A, B, 0.7, 1.3), expm(B*1.3) @ expm(A*0.7), rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize('metodo', ['cerrada', 'diagonal', 'propagador', 'expm'])
+def test_solucion_lineal_contra_odeint(metodo):
+    A = np.array(MATRICES['reales distintos'])
+    t = np.linspace(0, 5, 400)
+    X = solucion_lineal(A, [1.0, -0.5], t, metodo=metodo)
+    ref = odeint(lambda V, _: A @ V, [1.0, -0.5], t, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(X, ref, rtol=1e-8, atol=1e-10)
+
+
+def test_solucion_lineal_en_lote():
+    A = np.array(MATRICES['doble no diagonalizable'])
+    t = np.linspace(0, 1, 50)
+    V0 = np.random.default_rng(0).normal(size=(7, 2))
+    X = solucion_lineal(A, V0, t)
+    assert X.shape == (7, 50, 2)
+    np.testing.assert_allclose(X[3], (expm_2x2(A, t) @ V0[3]), rtol=1e-12)